@@ -0,0 +1,181 @@
+"""
+피처 엔지니어링 벤치마크 - 기존 (X_tr, X_te) 쌍 함수 체인 vs FeaturePipeline 단일 패스 엔진
+
+원본 test CSV 의 행을 시드 고정으로 복원 추출해 지정한 행 수의 Parquet 파일을 만들고,
+방법별로 별도 프로세스에서 80:20 으로 나눈 두 프레임의 피처 행렬을 만들면서
+소요 시간과 최대 메모리(RSS, 입력 로드 후 기준 증가분)를 잰다.
+
+    cd ML
+    python benchmarks/bench_features.py --rows 1000000 10000000 --output bench_features.json
+
+legacy : fill_missing_values → add_* / process_* / map_hotel_type → drop_original_columns → one_hot_encode_and_align
+engine : FeaturePipeline.fit(X_tr) → transform(X_tr), transform(X_te) (float32 행렬)
+
+메모리가 부족해 프로세스가 종료되면 해당 항목은 error 로 기록된다.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ML_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ML_DIR))
+
+from service.preprocessing.cleansing import fill_missing_values  # noqa: E402
+from service.preprocessing.encoding import drop_original_columns, one_hot_encode_and_align  # noqa: E402
+from service.preprocessing.featureExtraction import (  # noqa: E402
+    add_has_company,
+    add_is_FB_meal,
+    add_total_guests_and_is_alone,
+    add_total_stay,
+    map_hotel_type,
+    process_adr_iqr,
+    process_lead_time,
+)
+from service.preprocessing.pipeline import FeaturePipeline  # noqa: E402
+
+METHODS = ('legacy', 'engine')
+CHUNK_ROWS = 1_000_000
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+
+def write_sample(source: str, rows: int, path: str, seed: int) -> None:
+    """source 행을 복원 추출한 rows 행 Parquet (청크 단위로 써서 생성 메모리를 제한)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    base = pd.read_csv(source)
+    rng = np.random.default_rng(seed)
+    writer = None
+    try:
+        for start in range(0, rows, CHUNK_ROWS):
+            size = min(CHUNK_ROWS, rows - start)
+            chunk = base.iloc[rng.integers(0, len(base), size)].reset_index(drop=True)
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def current_rss() -> int:
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * PAGE_SIZE
+
+
+class PeakRss:
+    """with 블록 동안 RSS 를 주기적으로 읽어 최댓값 기록"""
+
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.peak = current_rss()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+
+def run_legacy(X_tr: pd.DataFrame, X_te: pd.DataFrame):
+    X_tr, X_te = fill_missing_values(X_tr), fill_missing_values(X_te)
+    for step in (add_total_guests_and_is_alone, add_has_company, add_is_FB_meal, process_adr_iqr,
+                 add_total_stay, process_lead_time, map_hotel_type):
+        X_tr, X_te = step(X_tr, X_te)
+    X_tr, X_te = drop_original_columns(X_tr, X_te)
+    return one_hot_encode_and_align(X_tr, X_te)
+
+
+def run_engine(X_tr: pd.DataFrame, X_te: pd.DataFrame):
+    pipeline = FeaturePipeline().fit(X_tr)
+    return pipeline.transform(X_tr), pipeline.transform(X_te)
+
+
+def worker(method: str, path: str) -> dict:
+    X = pd.read_parquet(path)
+    split = int(len(X) * 0.8)
+    X_tr, X_te = X.iloc[:split], X.iloc[split:]
+    base = current_rss()
+    run = run_legacy if method == 'legacy' else run_engine
+    with PeakRss() as peak:
+        started = time.perf_counter()
+        F_tr, F_te = run(X_tr, X_te)
+        seconds = time.perf_counter() - started
+    return {
+        'seconds': round(seconds, 3),
+        'input_mb': round(X.memory_usage(deep=True).sum() / 2 ** 20, 1),
+        'output_mb': round((F_tr.memory_usage().sum() + F_te.memory_usage().sum()) / 2 ** 20, 1),
+        'peak_extra_mb': round((peak.peak - base) / 2 ** 20, 1),
+        'features': F_tr.shape[1],
+    }
+
+
+def run_method(method: str, path: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, __file__, '--worker', method, path], capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        tail = (proc.stderr.strip().splitlines() or [f'exit code {proc.returncode}'])[-1]
+        return {'error': tail if proc.returncode > 0 else f'killed by signal {-proc.returncode} (out of memory?)'}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--methods', nargs='+', choices=METHODS, default=list(METHODS))
+    parser.add_argument('--source', default=str(ML_DIR / 'data' / 'hotel_bookings_test.csv'))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--worker', nargs=2, metavar=('METHOD', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(*args.worker)))
+        return 0
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, f'bookings_{rows}.parquet')
+            write_sample(args.source, rows, path, args.seed)
+            for method in args.methods:
+                result = {'rows': rows, 'method': method, **run_method(method, path)}
+                results.append(result)
+                print(json.dumps(result), flush=True)
+            os.remove(path)
+
+    if args.output:
+        report = {
+            'python': platform.python_version(), 'pandas': pd.__version__, 'numpy': np.__version__,
+            'machine': platform.machine(), 'cpus': os.cpu_count(), 'seed': args.seed, 'results': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""
+예측 결과 CSV를 연-월 파티션 Parquet 데이터셋으로 변환
+data/results/hotel_booking_predictions.csv → data/results/hotel_booking_predictions/
+"""
+import os
+import pandas as pd
+from service.data_setup import save_prediction_results
+
+
+def convert_predictions_to_parquet() -> bool:
+    """기존 예측 결과 CSV를 백엔드가 읽는 Parquet 데이터셋으로 변환"""
+    results_dir = os.path.join("data", "results")
+    csv_path = os.path.join(results_dir, "hotel_booking_predictions.csv")
+    
+    if not os.path.exists(csv_path):
+        print(f"❌ 예측 결과 파일이 없습니다: {csv_path}")
+        print("💡 먼저 main.py를 실행하여 예측 결과를 생성하세요.")
+        return False
+    
+    try:
+        print(f"📥 예측 결과 CSV 로드 중: {csv_path}")
+        df = pd.read_csv(csv_path)
+        dataset_path = save_prediction_results(df, results_dir, export_csv=False)
+        print(f"✅ Parquet 데이터셋 저장 완료: {dataset_path}")
+        print(f"   - 행 수: {df.shape[0]}")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Parquet 변환 실패: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    convert_predictions_to_parquet()
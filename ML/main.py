@@ -24,19 +24,18 @@ sys.path.insert(0, os.getcwd())
 
 from service.data_setup import load_train_csv, load_test_csv, split_train_validation
 from service.data_setup import load_train_csv, load_test_csv, split_train_validation
+from service.data_setup import save_prediction_results
 from service.preprocessing.cleansing import fill_missing_values
-from service.preprocessing.featureExtraction import (
-    add_total_guests_and_is_alone,
-    add_has_company,
-    add_is_FB_meal,
-    process_adr_iqr,
-    add_total_stay,
-    process_lead_time,
-    map_hotel_type,
-)
-from service.preprocessing.encoding import one_hot_encode_and_align, drop_original_columns
+from service.preprocessing.pipeline import FeaturePipeline
 from service.modeling.metrics import evaluate_binary, format_metrics
+from service.modeling.model import save_model_bundle, load_model_bundle
 from service.modeling.training import train_xgb_classifier
+from service.modeling.search import successive_halving_search
+
+# 학습된 모델 + 피처 파이프라인 저장 위치
+MODEL_BUNDLE_PATH = os.getenv('MODEL_BUNDLE_PATH', os.path.join('models', 'xgb_cancellation.joblib'))
+# 하이퍼파라미터 탐색 기록 (중단 후 재실행하면 이어서 진행)
+SEARCH_TRIALS_PATH = os.getenv('SEARCH_TRIALS_PATH', os.path.join('models', 'search_trials.jsonl'))
 
 
 def main() -> None:
@@ -56,9 +55,8 @@ def main() -> None:
     X, y = load_train_csv(train_path)
     print(f"전체 데이터 형태: {X.shape}, 타겟 분포: {y.value_counts().to_dict()}")
     
-    # 2. 결측치 처리
-    print("결측치 처리 중...")
-    X = fill_missing_values(X)
+    # 2. 결측치 처리 - 피처에 쓰는 children/company 결측은 FeaturePipeline 이 0 으로 처리
+    #    (fill_missing_values 로 전체 프레임을 복사하지 않음)
     
     # 3. Train/Validation 분할
     print("Train/Validation 분할 (80:20)...")
@@ -69,19 +67,11 @@ def main() -> None:
     print("피처 엔지니어링 수행 중... 🔧")
     
     # Suppress all output during feature engineering
+    # 통계(adr IQR, lead_time 중앙값, 원-핫 컬럼)는 train 에서 한 번만 fit 하고 validation 은 transform
     with contextlib.redirect_stdout(StringIO()):
-        X_tr, X_val = add_total_guests_and_is_alone(X_tr, X_val)
-        X_tr, X_val = add_has_company(X_tr, X_val)
-        X_tr, X_val = add_is_FB_meal(X_tr, X_val)
-        X_tr, X_val = process_adr_iqr(X_tr, X_val)
-        X_tr, X_val = add_total_stay(X_tr, X_val)
-        X_tr, X_val = process_lead_time(X_tr, X_val)
-        X_tr, X_val = map_hotel_type(X_tr, X_val)
-
-        # 5. 불필요한 컬럼 먼저 드롭 (인코딩 전에!)
-        X_tr, X_val = drop_original_columns(X_tr, X_val)
-        # 6. 원-핫 인코딩 (드롭 후에!)
-        X_tr, X_val = one_hot_encode_and_align(X_tr, X_val)
+        pipeline = FeaturePipeline()
+        X_tr = pipeline.fit_transform(X_tr)
+        X_val = pipeline.transform(X_val)
     
     print(f"✅ 피처 엔지니어링 완료! 최종 피처 수: {X_tr.shape[1]}")
 
@@ -92,6 +82,10 @@ def main() -> None:
     
     print("🌳 XGBoost 최적화 모델 학습 중...")
     model = train_xgb_classifier(X_tr, y_tr, random_state=42)
+
+    # 모델과 피처 파이프라인을 함께 저장 (python main.py predict 로 재사용)
+    bundle_path = save_model_bundle(MODEL_BUNDLE_PATH, model, pipeline)
+    print(f"💾 모델 저장: {bundle_path}")
     
     # 예측 수행
     y_tr_pred = model.predict(X_tr)
@@ -112,23 +106,23 @@ def main() -> None:
     val_metrics = evaluate_binary(y_val, y_val_pred, y_val_proba)
     if val_metrics.f1 > 0.68 and val_metrics.auc > 0.70:
         print("✅ 모델 성능이 우수합니다! Test 데이터 예측을 수행합니다.")
-        predict_test_data(model, X_tr, X_val)
+        predict_test_data(model, pipeline)
     else:
         print("⚠️  모델 성능을 더 개선할 필요가 있을 수 있습니다.")
         print(f"   현재 F1-Score: {val_metrics.f1:.3f}, AUC-ROC: {val_metrics.auc:.3f}")
         
         user_input = input("그래도 Test 데이터 예측을 수행하시겠습니까? (y/n): ")
         if user_input.lower() == 'y':
-            predict_test_data(model, X_tr, X_val)
+            predict_test_data(model, pipeline)
         else:
             print("예측을 건너뜁니다. 모델을 개선한 후 다시 실행해주세요.")
     
     return model
 
 
-def predict_test_data(model, X_tr_processed, X_val_processed):
+def predict_test_data(model, pipeline):
     """
-    검증된 모델로 test 데이터 예측 수행
+    검증된 모델로 test 데이터 예측 수행 (train 에서 fit 한 피처 파이프라인 사용)
     """
     print("\n" + "="*50)
     print("Test 데이터 예측 수행")
@@ -146,38 +140,15 @@ def predict_test_data(model, X_tr_processed, X_val_processed):
     X_test = load_test_csv(test_path)
     print(f"Test 데이터 형태: {X_test.shape}")
     
-    # 결측치 처리
+    # 결측치 처리 (결과 파일에 채운 값으로 저장)
     X_test = fill_missing_values(X_test)
     
-    # Train 데이터와 동일한 피처 엔지니어링 적용 (더미 train 데이터 사용)
-    print("피처 엔지니어링 적용...")
-    dummy_X_tr = X_tr_processed.iloc[:100].copy()  # 작은 더미 데이터
+    # 예측 결과 CSV용 데이터 저장 (원본 test.csv의 모든 컬럼 보존, transform 은 X_test 를 바꾸지 않음)
+    result_data = X_test
     
-    # 원래 컬럼들로 되돌리기 위해 역변환 (복잡하므로 다른 방법 사용)
-    # 대신 처음부터 다시 피처 엔지니어링 적용
-    
-    # 다시 train 데이터 로드 (피처 엔지니어링용)
-    train_path = os.path.join(data_dir, 'hotel_bookings_train.csv')
-    X_train_for_fe, _ = load_train_csv(train_path)
-    X_train_for_fe = fill_missing_values(X_train_for_fe)
-    
-    # 피처 엔지니어링 다시 적용
-    X_train_fe, X_test_fe = add_total_guests_and_is_alone(X_train_for_fe, X_test)
-    X_train_fe, X_test_fe = add_has_company(X_train_fe, X_test_fe)
-    X_train_fe, X_test_fe = add_is_FB_meal(X_train_fe, X_test_fe)
-    X_train_fe, X_test_fe = process_adr_iqr(X_train_fe, X_test_fe)
-    X_train_fe, X_test_fe = add_total_stay(X_train_fe, X_test_fe)
-    X_train_fe, X_test_fe = process_lead_time(X_train_fe, X_test_fe)
-    X_train_fe, X_test_fe = map_hotel_type(X_train_fe, X_test_fe)
-    
-    # 예측 결과 CSV용 데이터 저장 (원본 test.csv의 모든 컬럼 보존)
-    # 피처 엔지니어링 전의 원본 test 데이터 사용
-    result_data = X_test.copy()  # 원본 test 데이터의 모든 컬럼 보존
-    
-    # 불필요한 컬럼 먼저 드롭 (인코딩 전에!)
-    X_train_final, X_test_final = drop_original_columns(X_train_fe, X_test_fe)
-    # 원-핫 인코딩 (드롭 후에!)
-    X_train_final, X_test_final = one_hot_encode_and_align(X_train_final, X_test_final)
+    # Train 데이터에서 fit 한 통계로 피처 엔지니어링 + 인코딩 (train CSV 재로드 불필요)
+    print("피처 엔지니어링 적용...")
+    X_test_final = pipeline.transform(X_test)
     
     # 예측 수행
     print("예측 수행 중...")
@@ -194,10 +165,11 @@ def predict_test_data(model, X_tr_processed, X_val_processed):
     result_data['predicted_is_canceled'] = y_pred
     result_data['predicted_probability'] = y_pred_proba
     
-    result_path = os.path.join(results_dir, 'hotel_booking_predictions.csv')
-    result_data.to_csv(result_path, index=False)
+    # 연-월 파티션 Parquet 저장 (CSV 는 EXPORT_PREDICTIONS_CSV=0 이면 생략)
+    export_csv = os.getenv('EXPORT_PREDICTIONS_CSV', '1') == '1'
+    result_path = save_prediction_results(result_data, results_dir, export_csv=export_csv)
     
-    print(f"📁 예측 결과 저장: {result_path}")
+    print(f"📁 예측 결과 저장: {result_path}" + (" (+ CSV)" if export_csv else ""))
     print(f"📊 저장된 데이터 형태: {result_data.shape}")
     
     # 결과 미리보기
@@ -207,7 +179,49 @@ def predict_test_data(model, X_tr_processed, X_val_processed):
     print("="*50)
 
 
+def predict_with_saved_model(bundle_path: str = MODEL_BUNDLE_PATH) -> None:
+    """
+    저장된 모델 + 피처 파이프라인으로 test 데이터 예측만 수행 (재학습 없음)
+    """
+    if not os.path.exists(bundle_path):
+        raise FileNotFoundError(f"저장된 모델이 없습니다: {bundle_path} (먼저 python main.py 로 학습)")
+    print(f"저장된 모델 로드: {bundle_path}")
+    model, pipeline = load_model_bundle(bundle_path)
+    predict_test_data(model, pipeline)
+
+
+def search_hyperparameters() -> None:
+    """
+    train 데이터로 build_xgb_classifier 하이퍼파라미터 탐색 (successive halving, 프로세스 병렬)
+    """
+    print("=== XGBoost 하이퍼파라미터 탐색 ===")
+    train_path = os.path.join('data', 'hotel_bookings_train.csv')
+    if not os.path.exists(train_path):
+        raise FileNotFoundError(f"Train 데이터 파일이 없습니다: {train_path}")
+    X, y = load_train_csv(train_path)
+    X_tr, X_val, y_tr, y_val = split_train_validation(X, y, random_state=42)
+
+    pipeline = FeaturePipeline().fit(X_tr)
+    n_workers = os.getenv('SEARCH_WORKERS')
+    result = successive_halving_search(
+        pipeline.transform_array(X_tr), y_tr, pipeline.transform_array(X_val), y_val,
+        store_path=SEARCH_TRIALS_PATH,
+        n_trials=int(os.getenv('SEARCH_TRIALS', '27')),
+        n_workers=int(n_workers) if n_workers else None,
+        threads_per_trial=int(os.getenv('SEARCH_THREADS_PER_TRIAL', '1')),
+    )
+    print(f"🏆 최적 검증 F1: {result.score:.4f} (임계값 {result.threshold:.3f}, 트리 {result.n_estimators}개)")
+    print(f"   새로 학습한 평가: {result.evaluations}개, 기록: {SEARCH_TRIALS_PATH}")
+    for name, value in result.params.items():
+        print(f"   {name}={value:.4g}" if isinstance(value, float) else f"   {name}={value}")
+
+
 if __name__ == '__main__':
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == 'predict':
+        predict_with_saved_model()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'search':
+        search_hyperparameters()
+    else:
+        main()
 
 
@@ -1,6 +1,8 @@
 import os
+import shutil
 from typing import Tuple
 
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 
@@ -22,6 +24,65 @@ def load_test_csv(csv_path: str) -> pd.DataFrame:
     return pd.read_csv(csv_path)
 
 
+# 예측 결과 Parquet 데이터셋의 파티션 컬럼 ('YYYY-MM') 과 원본 행 번호 컬럼
+PREDICTION_PARTITION_COLUMN = 'arrival_year_month'
+PREDICTION_ROW_ID_COLUMN = 'row_id'
+
+MONTH_NUMBERS = {
+    'January': 1, 'February': 2, 'March': 3, 'April': 4, 'May': 5, 'June': 6,
+    'July': 7, 'August': 8, 'September': 9, 'October': 10, 'November': 11, 'December': 12
+}
+
+
+def arrival_year_month_keys(df: pd.DataFrame) -> pd.Series:
+    """
+    도착 연-월 파티션 키 ('YYYY-MM') - 정수 연도와 월 번호로 만든다
+
+    연도가 없거나 정수가 아닌 행, 월 이름을 알 수 없는 행이 있으면 읽기 시 월 범위 필터에서 빠지는
+    파티션이 생기므로 ValueError 를 낸다.
+    """
+    year = pd.to_numeric(df['arrival_date_year'].astype(object), errors='coerce')
+    month = df['arrival_date_month'].astype(str).map(MONTH_NUMBERS)
+    invalid = year.isna() | (year % 1 != 0) | month.isna()
+    if invalid.any():
+        examples = (df.loc[invalid, ['arrival_date_year', 'arrival_date_month']]
+                    .astype(str).drop_duplicates().head(5).to_dict('records'))
+        raise ValueError(f"{int(invalid.sum())} rows have an unknown arrival year/month: {examples}")
+    return (year.astype(np.int64).map('{:04d}'.format) + '-'
+            + month.astype(np.int64).map('{:02d}'.format))
+
+
+def save_prediction_results(result_data: pd.DataFrame, results_dir: str, export_csv: bool = True) -> str:
+    """
+    예측 결과를 도착 연-월 단위로 파티션된 Parquet 데이터셋으로 저장
+
+    문자열 컬럼은 dictionary(카테고리) 타입, 정수 컬럼은 값 범위에 맞는 정수형으로 저장하고, 파티션 후에도 예약 번호가
+    유지되도록 원본 행 번호를 row_id 컬럼으로 남긴다. export_csv 이면 기존 CSV 도 함께 저장한다.
+    """
+    dataset = result_data.copy()
+    dataset[PREDICTION_ROW_ID_COLUMN] = np.arange(len(dataset), dtype=np.int64)
+    for col in dataset.columns:
+        if dataset[col].dtype == object or pd.api.types.is_string_dtype(dataset[col]):
+            dataset[col] = dataset[col].astype('category')
+        elif pd.api.types.is_integer_dtype(dataset[col]):
+            dataset[col] = pd.to_numeric(dataset[col], downcast='integer')
+    dataset[PREDICTION_PARTITION_COLUMN] = arrival_year_month_keys(dataset)
+
+    # 파티션별로 모아서 써야 파티션당 큰 row group 하나로 저장됨 (작은 row group 은 읽기가 느림)
+    dataset = dataset.sort_values(PREDICTION_PARTITION_COLUMN, kind='stable')
+
+    # 파티션 디렉터리에는 파일이 누적되므로 이전 결과를 지우고 새로 쓴다
+    dataset_path = os.path.join(results_dir, 'hotel_booking_predictions')
+    if os.path.exists(dataset_path):
+        shutil.rmtree(dataset_path)
+    dataset.to_parquet(dataset_path, partition_cols=[PREDICTION_PARTITION_COLUMN], index=False)
+
+    if export_csv:
+        result_data.to_csv(os.path.join(results_dir, 'hotel_booking_predictions.csv'), index=False)
+
+    return dataset_path
+
+
 def split_train_validation(X: pd.DataFrame, y: pd.Series, random_state: int = 42) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
     """Train 데이터를 train/validation으로 분할"""
     X_tr, X_val, y_tr, y_val = train_test_split(
@@ -1,35 +1,169 @@
-from typing import Dict, Any
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
 
 import numpy as np
-from sklearn.model_selection import StratifiedKFold, cross_validate
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
 
+from .fingerprint import data_digest, model_digest
+from .metrics import optimize_threshold
 from .model import build_xgb_classifier
 
+# out-of-fold 확률 캐시 위치 (데이터 + 모델 설정/xgboost 버전 + 분할 설정 해시별 파일 하나)
+CV_CACHE_DIR = os.path.join('models', 'cv_cache')
+
+
+@dataclass
+class CVResult:
+    oof_proba: np.ndarray        # 각 행이 검증 fold 일 때의 양성 확률
+    fold: np.ndarray             # 각 행의 검증 fold 번호
+    best_iterations: List[int]   # fold 별 내부 조기 종료 시점
+    cache_path: Optional[str]    # 읽거나 쓴 캐시 파일 (캐시를 쓰지 않으면 None)
+    from_cache: bool
+
+
+# 워커 프로세스별 전체 데이터 (풀 생성 시 한 번만 전달)
+_worker_data: Dict[str, Any] = {}
+
+
+def _init_worker(X, y, n_jobs):
+    _worker_data.update(X=X, y=y, n_jobs=n_jobs)
+
+
+def _fit_fold(train_idx: np.ndarray, test_idx: np.ndarray, params: Dict[str, Any],
+              inner_val_size: float, random_state: int):
+    """fold 학습 데이터를 다시 나눈 내부 검증 세트로 조기 종료하고, 검증 fold 확률 반환"""
+    X, y = _worker_data['X'], _worker_data['y']
+    fit_idx, stop_idx = train_test_split(
+        train_idx, test_size=inner_val_size, random_state=random_state, stratify=y[train_idx]
+    )
+    model = build_xgb_classifier(random_state=random_state, n_jobs=_worker_data['n_jobs'], **params)
+    model.fit(X[fit_idx], y[fit_idx], eval_set=[(X[stop_idx], y[stop_idx])], verbose=False)
+    best_iteration = getattr(model, 'best_iteration', None)
+    return model.predict_proba(X[test_idx])[:, 1], best_iteration
+
+
+def cv_cache_key(X: np.ndarray, y: np.ndarray, params: Dict[str, Any], n_splits: int,
+                 random_state: int, inner_val_size: float) -> str:
+    """
+    캐시 키 - 데이터, 실제 모델 설정 (build_xgb_classifier 기본값 포함) + xgboost 버전, 분할 설정의 해시
+
+    기본값이나 xgboost 버전이 바뀌면 키가 바뀌므로 이전 설정으로 학습한 캐시를 읽지 않는다.
+    """
+    key = json.dumps({
+        'data': data_digest(X, y), 'model': model_digest(random_state=random_state, **params),
+        'n_splits': n_splits, 'random_state': random_state, 'inner_val_size': inner_val_size,
+    }, sort_keys=True)
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def cross_validate_oof(
+    X, y, params: Optional[Dict[str, Any]] = None, n_splits: int = 5, random_state: int = 42,
+    inner_val_size: float = 0.1, n_workers: Optional[int] = None, threads_per_fold: int = 1,
+    cache_dir: Optional[str] = CV_CACHE_DIR,
+) -> CVResult:
+    """
+    층화 K-fold out-of-fold 확률 계산 (fold 병렬, fold 별 내부 조기 종료, 디스크 캐시)
+
+    params 는 build_xgb_classifier 인자. 같은 데이터/파라미터/분할 설정의 캐시가 있으면 학습하지 않고
+    읽으므로 임계값이나 지표를 바꿔 cv_metrics 로 다시 평가할 때 재학습이 필요 없다 (cache_dir=None 이면 캐시 안 씀).
+    """
+    params = params or {}
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y).astype(np.int64)
+
+    cache_path = None
+    if cache_dir:
+        key = cv_cache_key(X, y, params, n_splits, random_state, inner_val_size)
+        cache_path = os.path.join(cache_dir, f'oof_{key}.npz')
+        if os.path.exists(cache_path):
+            with np.load(cache_path) as cached:
+                return CVResult(
+                    oof_proba=cached['oof_proba'], fold=cached['fold'],
+                    best_iterations=[int(i) for i in cached['best_iterations']],
+                    cache_path=cache_path, from_cache=True,
+                )
+
+    splits = list(StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state).split(X, y))
+    oof_proba = np.zeros(len(y), dtype=np.float64)
+    fold = np.zeros(len(y), dtype=np.int64)
+    n_workers = n_workers or max(1, min(n_splits, (os.cpu_count() or 1) // threads_per_fold))
+    with ProcessPoolExecutor(
+        max_workers=n_workers, initializer=_init_worker, initargs=(X, y, threads_per_fold)
+    ) as pool:
+        futures = [
+            pool.submit(_fit_fold, train_idx, test_idx, params, inner_val_size, random_state)
+            for train_idx, test_idx in splits
+        ]
+        best_iterations = []
+        for i, ((_, test_idx), future) in enumerate(zip(splits, futures)):
+            proba, best_iteration = future.result()
+            oof_proba[test_idx] = proba
+            fold[test_idx] = i
+            best_iterations.append(-1 if best_iteration is None else int(best_iteration))
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        # 쓰다 중단된 파일을 캐시로 읽지 않도록 임시 파일에 쓴 뒤 이름 변경
+        tmp_path = cache_path + '.tmp.npz'
+        np.savez(tmp_path, oof_proba=oof_proba, fold=fold, best_iterations=np.asarray(best_iterations))
+        os.replace(tmp_path, cache_path)
+    return CVResult(oof_proba=oof_proba, fold=fold, best_iterations=best_iterations,
+                    cache_path=cache_path, from_cache=False)
+
+
+def cv_metrics(y, result: CVResult, threshold: Optional[float] = 0.5) -> Dict[str, Any]:
+    """
+    out-of-fold 확률로 fold 별 지표 평균 계산 (재학습 없음)
+
+    threshold=None 이면 fold 마다 나머지 fold 의 out-of-fold 확률에서 F1 최적 임계값을 찾아 그 fold 를
+    평가한다 (평가하는 fold 는 임계값 선택에 쓰지 않음). 반환값의 'threshold' 는 고정 임계값이거나,
+    None 일 때 fold 별 임계값의 평균이다.
+    """
+    y = np.asarray(y)
+    scores = {'accuracy': [], 'precision': [], 'recall': [], 'f1': [], 'roc_auc': []}
+    thresholds = []
+    for i in np.unique(result.fold):
+        mask = result.fold == i
+        y_true, proba = y[mask], result.oof_proba[mask]
+        fold_threshold = threshold
+        if fold_threshold is None:
+            fold_threshold = optimize_threshold(y[~mask], result.oof_proba[~mask], 'f1').threshold
+        thresholds.append(fold_threshold)
+        y_pred = (proba > fold_threshold).astype(int)
+        scores['accuracy'].append(accuracy_score(y_true, y_pred))
+        scores['precision'].append(precision_score(y_true, y_pred, zero_division=0))
+        scores['recall'].append(recall_score(y_true, y_pred, zero_division=0))
+        scores['f1'].append(f1_score(y_true, y_pred, zero_division=0))
+        scores['roc_auc'].append(roc_auc_score(y_true, proba))
+    summary = {f'test_{metric}': float(np.mean(vals)) for metric, vals in scores.items()}
+    summary['threshold'] = float(np.mean(thresholds))
+    return summary
+
 
 def stratified_cv_scores(
     X, y, random_state: int = 42, n_splits: int = 5,
     max_depth: int = 5, learning_rate: float = 0.1, n_estimators: int = 200,
-    subsample: float = 0.8, colsample_bytree: float = 0.8, scale_pos_weight: float = 1.0
+    subsample: float = 0.8, colsample_bytree: float = 0.8, scale_pos_weight: float = 1.0,
+    n_workers: Optional[int] = None, threads_per_fold: int = 1, cache_dir: Optional[str] = CV_CACHE_DIR,
+    threshold: float = 0.5,
 ) -> Dict[str, Any]:
-    cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
-    model = build_xgb_classifier(
-        random_state=random_state,
-        max_depth=max_depth,
-        learning_rate=learning_rate,
-        n_estimators=n_estimators,
-        subsample=subsample,
-        colsample_bytree=colsample_bytree,
-        scale_pos_weight=scale_pos_weight
-    )
-    scoring = {
-        'accuracy': 'accuracy',
-        'precision': 'precision',
-        'recall': 'recall',
-        'f1': 'f1',
-        'roc_auc': 'roc_auc',
+    """fold 별 test_* 지표 평균 (고정 임계값 threshold 기준, 기본 0.5)"""
+    params = {
+        'max_depth': max_depth,
+        'learning_rate': learning_rate,
+        'n_estimators': n_estimators,
+        'subsample': subsample,
+        'colsample_bytree': colsample_bytree,
+        'scale_pos_weight': scale_pos_weight,
     }
-    results = cross_validate(model, X, y, cv=cv, scoring=scoring, return_train_score=False)
-    summary = {metric: float(np.mean(vals)) for metric, vals in results.items() if metric.startswith('test_')}
-    return summary
-
-
+    result = cross_validate_oof(
+        X, y, params, n_splits=n_splits, random_state=random_state,
+        n_workers=n_workers, threads_per_fold=threads_per_fold, cache_dir=cache_dir,
+    )
+    summary = cv_metrics(y, result, threshold=threshold)
+    return {metric: value for metric, value in summary.items() if metric.startswith('test_')}
@@ -0,0 +1,35 @@
+import hashlib
+import json
+from typing import Any
+
+import numpy as np
+
+from .model import build_xgb_classifier
+
+# 학습 결과에 영향이 없는 인자 (스레드 수) - 캐시/탐색 기록 키에서 제외
+IGNORED_MODEL_PARAMS = ('n_jobs',)
+
+
+def data_digest(*arrays: Any) -> str:
+    """배열들의 shape/dtype/값 해시 (같은 데이터면 같은 값)"""
+    digest = hashlib.sha1()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f'{array.shape}{array.dtype.str}'.encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def model_digest(**build_kwargs: Any) -> str:
+    """
+    build_xgb_classifier(**build_kwargs) 로 실제 만들어지는 모델 설정 + xgboost 버전 해시
+
+    호출자가 넘긴 인자만이 아니라 build_xgb_classifier 기본값까지 포함하므로, 기본값을 바꾸면 키도 바뀐다.
+    """
+    import xgboost
+
+    params = build_xgb_classifier(**build_kwargs).get_params()
+    for name in IGNORED_MODEL_PARAMS:
+        params.pop(name, None)
+    key = json.dumps({'params': params, 'xgboost': xgboost.__version__}, sort_keys=True, default=repr)
+    return hashlib.sha1(key.encode()).hexdigest()
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Callable, Union
 
 import numpy as np
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
@@ -34,3 +35,74 @@ def format_metrics(title: str, m: Metrics) -> str:
     )
 
 
+# 임계값 최적화 - 혼동 행렬 개수 배열 (tp, fp, fn, tn) 을 받아 점수 배열을 돌려주는 목적 함수 (클수록 좋음)
+ThresholdObjective = Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+
+
+@dataclass
+class ThresholdResult:
+    threshold: float  # proba > threshold 이면 양성
+    score: float
+
+
+def _safe_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """0/0 은 0 (sklearn zero_division=0 과 같음)"""
+    return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
+
+
+def fbeta_objective(beta: float = 1.0) -> ThresholdObjective:
+    b2 = beta * beta
+
+    def objective(tp, fp, fn, tn):
+        return _safe_ratio((1 + b2) * tp, (1 + b2) * tp + b2 * fn + fp)
+    return objective
+
+
+def cost_objective(fp_cost: float = 1.0, fn_cost: float = 1.0) -> ThresholdObjective:
+    """오분류 비용 합계 최소화 (점수 = -비용)"""
+    def objective(tp, fp, fn, tn):
+        return -(fp_cost * fp + fn_cost * fn)
+    return objective
+
+
+def optimize_threshold(
+    y_true: np.ndarray, y_proba: np.ndarray, objective: Union[str, ThresholdObjective] = 'f1', **kwargs
+) -> ThresholdResult:
+    """
+    목적 함수를 최대로 하는 분류 임계값을 정확히 탐색
+
+    확률을 한 번 정렬하고 서로 다른 확률 값마다의 누적 TP/FP 로 모든 분할점의 점수를 한 번에 계산한다
+    (O(n log n)). objective 는 'f1', 'fbeta' (beta=), 'cost' (fp_cost=, fn_cost=) 또는 ThresholdObjective.
+    임계값은 양성으로 예측하지 않는 가장 큰 확률 값 자체라 (float32 확률에서도) proba > threshold 비교가
+    정확히 같은 분할을 재현한다. 점수가 같으면 더 높은 임계값을 고른다.
+    """
+    if objective == 'f1':
+        objective = fbeta_objective(1.0)
+    elif objective == 'fbeta':
+        objective = fbeta_objective(**kwargs)
+    elif objective == 'cost':
+        objective = cost_objective(**kwargs)
+    elif isinstance(objective, str):
+        raise ValueError(f"Unknown threshold objective: {objective}")
+
+    y_true = np.asarray(y_true).astype(bool)
+    y_proba = np.asarray(y_proba)
+    if not np.issubdtype(y_proba.dtype, np.floating):
+        y_proba = y_proba.astype(np.float64)
+    if len(y_proba) == 0:
+        raise ValueError("optimize_threshold needs at least one sample")
+    order = np.argsort(-y_proba, kind='stable')
+    proba_desc = y_proba[order]
+
+    # 같은 확률 값 묶음의 마지막 위치 - 분할점 k 는 위에서 k 개 묶음을 양성으로 예측
+    group_end = np.r_[np.flatnonzero(np.diff(proba_desc)), len(proba_desc) - 1]
+    tp = np.r_[0, np.cumsum(y_true[order])[group_end]]
+    fp = np.r_[0, group_end + 1 - tp[1:]]
+    positives, negatives = tp[-1], fp[-1]
+    scores = objective(tp, fp, positives - tp, negatives - fp)
+
+    values = proba_desc[group_end]
+    thresholds = np.r_[values, np.nextafter(values[-1], values.dtype.type(-np.inf))]
+    best = int(np.argmax(scores))
+    return ThresholdResult(threshold=float(thresholds[best]), score=float(scores[best]))
+
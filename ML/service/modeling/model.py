@@ -1,3 +1,6 @@
+import os
+
+import joblib
 import xgboost as xgb
 
 
@@ -16,7 +19,8 @@ def build_xgb_classifier(
     min_child_weight=1,  # F1 최적화: 유지 (세밀한 분할)
     gamma=0.0,  # F1 최적화: 유지 (분할 제한 제거)
     early_stopping_rounds=150,  # F1 최적화: 120→150 (더 많은 학습 허용)
-    eval_metric='logloss'  # F1-score 최적화를 위해 logloss 사용
+    eval_metric='logloss',  # F1-score 최적화를 위해 logloss 사용
+    n_jobs=None  # 학습 스레드 수 (None: XGBoost 기본값, 병렬 탐색에서는 작업당 제한)
 ):
     from xgboost import XGBClassifier
     return XGBClassifier(
@@ -60,9 +64,19 @@ def build_xgb_classifier(
         refresh_leaf=1,  # 추가: 리프 갱신 빈도
         process_type='default',  # 추가: 처리 타입
         debug_verbose=0,  # 추가: 디버그 출력 레벨
-        verbosity=0  # 추가: 출력 억제
+        verbosity=0,  # 추가: 출력 억제
+        n_jobs=n_jobs
     )
 
 
+def save_model_bundle(path: str, model, pipeline) -> str:
+    """학습된 모델과 피처 파이프라인을 한 파일로 저장 (예측 시 같은 변환을 재사용)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    joblib.dump({'model': model, 'pipeline': pipeline}, path)
+    return path
 
 
+def load_model_bundle(path: str):
+    """save_model_bundle 로 저장한 (model, pipeline) 로드"""
+    bundle = joblib.load(path)
+    return bundle['model'], bundle['pipeline']
@@ -0,0 +1,233 @@
+"""
+build_xgb_classifier 하이퍼파라미터 탐색 - successive halving + 프로세스 풀 + JSONL 시도 저장소
+
+무작위로 뽑은 설정들을 적은 트리 수/데이터 비율(첫 단계)에서 먼저 평가하고, 단계마다 상위 1/eta 만
+더 많은 트리와 데이터로 다시 평가한다. 조기 종료와 임계값 선택은 학습 데이터에서 떼어 낸 내부 검증 세트로 하고,
+설정 순위를 매기는 점수는 그 임계값으로 계산한 검증 세트 F1 이라 검증 세트는 점수 계산에만 쓰인다.
+각 평가는 끝나는 즉시 저장소 파일에 한 줄씩 기록되므로, 중단된 탐색을 같은 설정/데이터로 다시 실행하면
+기록된 평가는 건너뛰고 이어서 진행한다.
+"""
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.metrics import f1_score
+from sklearn.model_selection import train_test_split
+
+from .fingerprint import data_digest, model_digest
+from .metrics import optimize_threshold
+from .model import build_xgb_classifier
+
+# 탐색 공간: 파라미터 → (분포, 최솟값, 최댓값) - int: 정수 균등, float: 균등, log: 로그 균등
+SEARCH_SPACE: Dict[str, Tuple[str, float, float]] = {
+    'max_depth': ('int', 4, 10),
+    'learning_rate': ('log', 0.01, 0.3),
+    'subsample': ('float', 0.6, 1.0),
+    'colsample_bytree': ('float', 0.6, 1.0),
+    'scale_pos_weight': ('float', 1.0, 4.0),
+    'reg_lambda': ('log', 0.1, 10.0),
+    'reg_alpha': ('log', 1e-3, 1.0),
+    'min_child_weight': ('int', 1, 10),
+    'gamma': ('float', 0.0, 2.0),
+}
+
+
+@dataclass
+class SearchResult:
+    params: Dict[str, Any]
+    score: float      # 마지막 단계 검증 F1 (내부 검증 세트에서 고른 임계값 기준)
+    threshold: float  # 내부 검증 세트의 F1 최적 임계값
+    n_estimators: int
+    evaluations: int  # 이번 실행에서 새로 학습한 횟수 (저장소에서 읽은 평가 제외)
+
+
+def sample_params(space: Dict[str, Tuple[str, float, float]], seed: int, trial_id: int) -> Dict[str, Any]:
+    """trial_id 별로 고정된 설정 (시도 수를 늘려도 기존 시도의 설정은 같음)"""
+    rng = np.random.default_rng([seed, trial_id])
+    params = {}
+    for name, (kind, low, high) in space.items():
+        if kind == 'int':
+            params[name] = int(rng.integers(low, high + 1))
+        elif kind == 'log':
+            params[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+        elif kind == 'float':
+            params[name] = float(rng.uniform(low, high))
+        else:
+            raise ValueError(f"Unknown search space kind for {name}: {kind}")
+    return params
+
+
+def halving_rungs(max_trees: int = 2000, eta: int = 3, n_rungs: int = 3,
+                  min_data_fraction: float = 0.2) -> List[Tuple[int, float]]:
+    """단계별 (트리 수, 학습 데이터 비율) - 마지막 단계가 max_trees / 전체 데이터, 앞 단계는 1/eta 씩"""
+    rungs = []
+    for r in range(n_rungs):
+        budget = float(eta) ** (r - n_rungs + 1)
+        rungs.append((max(1, int(round(max_trees * budget))), max(min_data_fraction, budget)))
+    return rungs
+
+
+class TrialStore:
+    """
+    평가 결과 JSONL 저장소 - 한 줄이 (search_id, trial_id, rung) 평가 하나
+
+    search_id 는 탐색 공간/시드/단계 설정, 데이터, 모델 기본 설정의 해시라 어느 하나라도 다른 탐색의 기록은
+    재사용하지 않는다.
+    마지막 줄이 쓰다 만 줄이면 (중단) 무시한다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self, search_id: str) -> Dict[Tuple[int, int], Dict[str, Any]]:
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get('search_id') == search_id:
+                    records[(record['trial_id'], record['rung'])] = record
+        return records
+
+    def append(self, record: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        line = (json.dumps(record) + '\n').encode()
+        with open(self.path, 'ab+') as f:
+            # 중단으로 줄바꿈 없이 끝난 줄이 있으면 새 줄에서 시작
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    line = b'\n' + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+# 워커 프로세스별 학습/검증 데이터 (풀 생성 시 한 번만 전달)
+_worker_data: Dict[str, Any] = {}
+
+
+def _init_worker(X_tr, y_tr, X_val, y_val, row_order, stop_rows, n_jobs):
+    _worker_data.update(X_tr=X_tr, y_tr=y_tr, X_val=X_val, y_val=y_val, row_order=row_order,
+                        stop_rows=stop_rows, n_jobs=n_jobs)
+
+
+def evaluate_trial(params: Dict[str, Any], n_estimators: int, data_fraction: float,
+                   random_state: int) -> Dict[str, Any]:
+    """
+    워커에서 한 설정을 학습 행 앞쪽 data_fraction 만큼으로 학습하고 검증 F1 계산
+
+    조기 종료와 F1 최적 임계값은 내부 검증 행(stop_rows)으로 정하고, 검증 세트는 점수 계산에만 쓴다.
+    """
+    d = _worker_data
+    rows = d['row_order'][:max(1, int(len(d['row_order']) * data_fraction))]
+    X_stop, y_stop = d['X_tr'][d['stop_rows']], d['y_tr'][d['stop_rows']]
+    started = time.perf_counter()
+    model = build_xgb_classifier(
+        random_state=random_state, n_estimators=n_estimators, n_jobs=d['n_jobs'], **params
+    )
+    model.fit(d['X_tr'][rows], d['y_tr'][rows], eval_set=[(X_stop, y_stop)], verbose=False)
+    threshold = optimize_threshold(y_stop, model.predict_proba(X_stop)[:, 1], 'f1').threshold
+    y_val_pred = (model.predict_proba(d['X_val'])[:, 1] > threshold).astype(int)
+    return {
+        'score': float(f1_score(d['y_val'], y_val_pred, zero_division=0)),
+        'threshold': threshold,
+        'best_iteration': getattr(model, 'best_iteration', None),
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def search_id_for(space, seed: int, rungs, eta: int, inner_val_size: float, data: str, model: str) -> str:
+    key = json.dumps({'space': space, 'seed': seed, 'rungs': rungs, 'eta': eta, 'inner_val_size': inner_val_size,
+                      'data': data, 'model': model}, sort_keys=True)
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def successive_halving_search(
+    X_tr, y_tr, X_val, y_val,
+    store_path: str,
+    n_trials: int = 27,
+    eta: int = 3,
+    n_rungs: int = 3,
+    max_trees: int = 2000,
+    min_data_fraction: float = 0.2,
+    inner_val_size: float = 0.1,
+    n_workers: Optional[int] = None,
+    threads_per_trial: int = 1,
+    space: Optional[Dict[str, Tuple[str, float, float]]] = None,
+    seed: int = 42,
+) -> SearchResult:
+    """
+    successive halving 탐색 실행 (저장소에 기록된 평가는 다시 학습하지 않음)
+
+    X_tr/X_val 은 피처 행렬 (FeaturePipeline.transform_array 결과 등), y 는 0/1 배열.
+    X_tr 의 inner_val_size 비율은 조기 종료/임계값 선택용 내부 검증 행으로 떼어 두고 나머지로 학습한다.
+    n_workers 개 프로세스가 각각 XGBoost 스레드 threads_per_trial 개로 설정 하나씩 학습한다.
+    """
+    if n_trials < 1:
+        raise ValueError(f"n_trials must be at least 1, got {n_trials}")
+    space = space or SEARCH_SPACE
+    rungs = halving_rungs(max_trees, eta, n_rungs, min_data_fraction)
+    if not rungs:
+        raise ValueError(f"n_rungs must be at least 1, got {n_rungs}")
+    n_workers = n_workers or max(1, (os.cpu_count() or 1) // threads_per_trial)
+
+    X_tr, X_val = np.asarray(X_tr, dtype=np.float32), np.asarray(X_val, dtype=np.float32)
+    y_tr, y_val = np.asarray(y_tr), np.asarray(y_val)
+    # 데이터/모델 기본 설정이 바뀌면 다른 탐색 (이전 기록을 재사용하지 않음)
+    search_id = search_id_for(space, seed, rungs, eta, inner_val_size,
+                              data_digest(X_tr, y_tr, X_val, y_val), model_digest(random_state=seed))
+    store = TrialStore(store_path)
+    records = store.load(search_id)
+
+    fit_rows, stop_rows = train_test_split(
+        np.arange(len(X_tr)), test_size=inner_val_size, random_state=seed, stratify=y_tr
+    )
+    # 데이터 비율 단계는 같은 무작위 순서의 앞부분 (작은 단계의 행은 큰 단계에 모두 포함)
+    row_order = np.random.default_rng(seed).permutation(fit_rows)
+
+    configs = {trial_id: sample_params(space, seed, trial_id) for trial_id in range(n_trials)}
+    alive = list(configs)
+    evaluations = 0
+    with ProcessPoolExecutor(
+        max_workers=n_workers, initializer=_init_worker,
+        initargs=(X_tr, y_tr, X_val, y_val, row_order, stop_rows, threads_per_trial),
+    ) as pool:
+        for rung, (n_estimators, data_fraction) in enumerate(rungs):
+            pending = {
+                pool.submit(evaluate_trial, configs[trial_id], n_estimators, data_fraction, seed): trial_id
+                for trial_id in alive if (trial_id, rung) not in records
+            }
+            for future in as_completed(pending):
+                trial_id = pending[future]
+                record = {
+                    'search_id': search_id, 'trial_id': trial_id, 'rung': rung,
+                    'n_estimators': n_estimators, 'data_fraction': data_fraction,
+                    'params': configs[trial_id], **future.result(),
+                }
+                store.append(record)
+                records[(trial_id, rung)] = record
+                evaluations += 1
+            print(f"  rung {rung}: {len(alive)} configs, {n_estimators} trees, "
+                  f"{data_fraction:.0%} data, best F1 {max(records[(t, rung)]['score'] for t in alive):.4f}")
+
+            # 다음 단계로 상위 1/eta 만 (점수가 같으면 먼저 뽑힌 설정)
+            ranked = sorted(alive, key=lambda t: (-records[(t, rung)]['score'], t))
+            if rung < len(rungs) - 1:
+                alive = ranked[:max(1, math.ceil(len(alive) / eta))]
+
+    best = records[(ranked[0], len(rungs) - 1)]
+    return SearchResult(
+        params=best['params'], score=best['score'], threshold=best['threshold'],
+        n_estimators=best['n_estimators'], evaluations=evaluations,
+    )
@@ -1,5 +1,7 @@
 from typing import Any
 
+from .metrics import optimize_threshold
+
 
 def train_xgb_classifier(
     X, y, random_state=42,
@@ -37,16 +39,8 @@ def train_xgb_classifier(
         eval_metric=eval_metric
     )
     
-    # F1-score 최적화를 위한 커스텀 메트릭과 조기 종료
+    # 조기 종료 + F1-score 임계값 최적화용 검증 세트
     from sklearn.model_selection import train_test_split
-    from sklearn.metrics import f1_score
-    import numpy as np
-    
-    # 커스텀 F1-score 메트릭 함수
-    def f1_eval(y_pred, y_true):
-        y_pred_binary = (y_pred > 0.5).astype(int)
-        f1 = f1_score(y_true, y_pred_binary)
-        return 'f1', f1, True  # True는 높을수록 좋음을 의미
     
     # 검증 세트 분할 (F1-score 최적화용)
     X_train, X_val, y_train, y_val = train_test_split(
@@ -60,44 +54,10 @@ def train_xgb_classifier(
         verbose=False
     )
     
-    # F1-score 최적화를 위한 임계값 찾기
+    # F1-score 최적화를 위한 임계값 찾기 (정렬 한 번으로 모든 분할점의 F1 을 계산하는 정확한 탐색)
     y_val_proba = model.predict_proba(X_val)[:, 1]
-    best_f1 = 0
-    best_threshold = 0.5
-    
-    # F1-score 0.7 달성을 위한 고급 임계값 탐색
-    # 1단계: 넓은 범위에서 대략적인 최적값 찾기
-    for threshold in np.arange(0.15, 0.85, 0.01):
-        y_val_pred = (y_val_proba > threshold).astype(int)
-        f1 = f1_score(y_val, y_val_pred)
-        
-        if f1 > best_f1:
-            best_f1 = f1
-            best_threshold = threshold
-    
-    # 2단계: 최적값 주변에서 정밀한 탐색 (0.7 달성용)
-    if best_threshold > 0.1:
-        start_range = max(0.1, best_threshold - 0.03)
-        end_range = min(0.9, best_threshold + 0.03)
-        
-        for threshold in np.arange(start_range, end_range, 0.0005):
-            y_val_pred = (y_val_proba > threshold).astype(int)
-            f1 = f1_score(y_val, y_val_pred)
-            
-            if f1 > best_f1:
-                best_f1 = f1
-                best_threshold = threshold
-    
-    # 3단계: F1-score 0.7 달성을 위한 추가 최적화
-    if best_f1 < 0.7:
-        # 0.7 달성을 위한 특별 탐색
-        for threshold in np.arange(0.2, 0.6, 0.002):
-            y_val_pred = (y_val_proba > threshold).astype(int)
-            f1 = f1_score(y_val, y_val_pred)
-            
-            if f1 > best_f1:
-                best_f1 = f1
-                best_threshold = threshold
+    best = optimize_threshold(y_val, y_val_proba, 'f1')
+    best_threshold, best_f1 = best.threshold, best.score
     
     # 최적 임계값을 모델에 저장 (커스텀 속성으로)
     model.best_threshold_ = best_threshold
@@ -1,36 +1,48 @@
-from typing import Tuple
+from typing import List, Tuple
 
 import pandas as pd
 
+ORIGINAL_COLUMNS_TO_DROP = [
+    'hotel', 'lead_time', 'adr', 'stays_in_weekend_nights',
+    'stays_in_week_nights', 'total_guests', 'reserved_room_type',
+    'assigned_room_type', 'customer_type',
+    'reservation_status',       # 예약 상태 (Check-Out, Canceled, No-Show)
+    'reservation_status_date',  # 수천 개의 날짜 컬럼 생성 방지
+    'arrival_date_full',        # 수천 개의 날짜 컬럼 생성 방지
+    'deposit_type',             # 보증금 타입
+    'agent',                    # 에이전트 ID (너무 많은 카테고리)
+    'company',                  # 회사 ID (너무 많은 카테고리)
+    'country',                  # 국가 (너무 많은 카테고리)
+]
 
-def one_hot_encode_and_align(X_tr: pd.DataFrame, X_te: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    X_tr = X_tr.copy()
-    X_te = X_te.copy()
-    cat_cols = X_tr.select_dtypes(include='object').columns.tolist()
-    if len(cat_cols) > 0:
-        X_tr = pd.get_dummies(X_tr, columns=cat_cols, drop_first=True)
-        X_te = pd.get_dummies(X_te, columns=cat_cols, drop_first=True)
-        X_te = X_te.reindex(columns=X_tr.columns, fill_value=0)
-    return X_tr, X_te
 
+def apply_drop_original_columns(X: pd.DataFrame) -> pd.DataFrame:
+    return X.drop(columns=ORIGINAL_COLUMNS_TO_DROP, errors='ignore')
 
-def drop_original_columns(X_tr: pd.DataFrame, X_te: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    X_tr = X_tr.copy()
-    X_te = X_te.copy()
-    columns_to_drop = [
-        'hotel', 'lead_time', 'adr', 'stays_in_weekend_nights',
-        'stays_in_week_nights', 'total_guests', 'reserved_room_type',
-        'assigned_room_type', 'customer_type',
-        'reservation_status',       # 예약 상태 (Check-Out, Canceled, No-Show)
-        'reservation_status_date',  # 수천 개의 날짜 컬럼 생성 방지
-        'arrival_date_full',        # 수천 개의 날짜 컬럼 생성 방지
-        'deposit_type',             # 보증금 타입
-        'agent',                    # 에이전트 ID (너무 많은 카테고리)
-        'company',                  # 회사 ID (너무 많은 카테고리)
-        'country',                  # 국가 (너무 많은 카테고리)
-    ]
-    X_tr.drop(columns=columns_to_drop, errors='ignore', inplace=True)
-    X_te.drop(columns=columns_to_drop, errors='ignore', inplace=True)
-    return X_tr, X_te
 
+def fit_one_hot_columns(X: pd.DataFrame) -> Tuple[List[str], List[str]]:
+    """원-핫 인코딩할 범주형 컬럼과 인코딩 후 컬럼 목록 (첫 범주 제외, drop_first)"""
+    cat_cols = X.select_dtypes(include='object').columns.tolist()
+    columns = pd.get_dummies(X, columns=cat_cols, drop_first=True).columns.tolist()
+    return cat_cols, columns
+
+
+def apply_one_hot(X: pd.DataFrame, cat_cols: List[str], columns: List[str]) -> pd.DataFrame:
+    """
+    학습 데이터 기준 컬럼으로 원-핫 인코딩
+
+    새 프레임의 첫 범주가 학습 데이터와 달라도 맞도록 drop_first 없이 인코딩한 뒤 학습 컬럼으로 맞춘다
+    (학습에 없던 범주는 버리고, 없는 더미 컬럼은 학습 때와 같은 bool 타입의 False).
+    """
+    if len(cat_cols) == 0:
+        return X.reindex(columns=columns, fill_value=0)
+    return pd.get_dummies(X, columns=cat_cols).reindex(columns=columns, fill_value=False)
 
+
+def one_hot_encode_and_align(X_tr: pd.DataFrame, X_te: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    cat_cols, columns = fit_one_hot_columns(X_tr)
+    return apply_one_hot(X_tr, cat_cols, columns), apply_one_hot(X_te, cat_cols, columns)
+
+
+def drop_original_columns(X_tr: pd.DataFrame, X_te: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    return apply_drop_original_columns(X_tr), apply_drop_original_columns(X_te)
@@ -3,77 +3,97 @@ from typing import Tuple
 import numpy as np
 import pandas as pd
 
+# lead_time 정상 범위 (밖이면 학습 데이터 중앙값으로 대체)
+LEAD_TIME_MAX = 373
+
+
+# 단일 프레임 변환 (apply_*: 전달받은 프레임에 컬럼을 추가/변경) 과 학습 통계 계산 (fit_*)
+
+def apply_is_alone(X: pd.DataFrame) -> pd.DataFrame:
+    X['is_alone'] = ((X['adults'] + X['children'] + X['babies']) == 1).astype(int)
+    return X
+
+
+def apply_has_company(X: pd.DataFrame) -> pd.DataFrame:
+    X['has_company'] = (X['company'] > 0).astype(int)
+    return X
+
+
+def apply_is_FB_meal(X: pd.DataFrame) -> pd.DataFrame:
+    X['is_FB_meal'] = np.where(X['meal'] == 'FB', 1, 0)
+    return X
+
+
+def fit_adr_iqr(X: pd.DataFrame) -> Tuple[float, float, float]:
+    """adr IQR 이상치 경계와 경계 안 값의 중앙값 (lower_bound, upper_bound, filtered_median)"""
+    Q1 = X['adr'].quantile(0.25)
+    Q3 = X['adr'].quantile(0.75)
+    IQR = Q3 - Q1
+    upper_bound = Q3 + 1.5 * IQR
+    lower_bound = Q1 - 1.5 * IQR
+    adr_filtered_median = X.loc[(X['adr'] >= lower_bound) & (X['adr'] <= upper_bound), 'adr'].median()
+    return float(lower_bound), float(upper_bound), float(adr_filtered_median)
+
+
+def apply_adr_iqr(X: pd.DataFrame, lower_bound: float, upper_bound: float, adr_filtered_median: float) -> pd.DataFrame:
+    X['adr_processed'] = np.where(
+        (X['adr'] < lower_bound) | (X['adr'] > upper_bound),
+        adr_filtered_median,
+        X['adr']
+    )
+    return X
+
+
+def apply_total_stay(X: pd.DataFrame) -> pd.DataFrame:
+    X['total_stay'] = X['stays_in_weekend_nights'] + X['stays_in_week_nights']
+    return X
+
+
+def fit_lead_time_median(X: pd.DataFrame) -> float:
+    return float(X['lead_time'].median())
+
+
+def apply_lead_time(X: pd.DataFrame, lead_time_median: float) -> pd.DataFrame:
+    X['lead_time_processed'] = np.where(
+        (X['lead_time'] < 0) | (X['lead_time'] > LEAD_TIME_MAX),
+        lead_time_median,
+        X['lead_time']
+    )
+    return X
+
+
+def apply_hotel_type(X: pd.DataFrame) -> pd.DataFrame:
+    X['is_resort'] = X['hotel'].map({'City Hotel': 0, 'Resort Hotel': 1})
+    return X
+
+
+# (X_tr, X_te) 쌍 변환 - 통계는 X_tr 에서 계산 (새 코드는 pipeline.FeaturePipeline 사용)
 
 def add_total_guests_and_is_alone(X_tr: pd.DataFrame, X_te: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    X_tr = X_tr.copy()
-    X_te = X_te.copy()
-    for X in (X_tr, X_te):
-        X['total_guests'] = X['adults'] + X['children'] + X['babies']
-        X['is_alone'] = (X['total_guests'] == 1).astype(int)
-        X.drop(columns=['total_guests'], inplace=True)
-    return X_tr, X_te
+    return apply_is_alone(X_tr.copy()), apply_is_alone(X_te.copy())
 
 
 def add_has_company(X_tr: pd.DataFrame, X_te: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    X_tr = X_tr.copy()
-    X_te = X_te.copy()
-    for X in (X_tr, X_te):
-        X['has_company'] = (X['company'] > 0).astype(int)
-    return X_tr, X_te
+    return apply_has_company(X_tr.copy()), apply_has_company(X_te.copy())
 
 
 def add_is_FB_meal(X_tr: pd.DataFrame, X_te: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    X_tr = X_tr.copy()
-    X_te = X_te.copy()
-    for X in (X_tr, X_te):
-        X['is_FB_meal'] = np.where(X['meal'] == 'FB', 1, 0)
-    return X_tr, X_te
+    return apply_is_FB_meal(X_tr.copy()), apply_is_FB_meal(X_te.copy())
 
 
 def process_adr_iqr(X_tr: pd.DataFrame, X_te: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    X_tr = X_tr.copy()
-    X_te = X_te.copy()
-    Q1 = X_tr['adr'].quantile(0.25)
-    Q3 = X_tr['adr'].quantile(0.75)
-    IQR = Q3 - Q1
-    upper_bound = Q3 + 1.5 * IQR
-    lower_bound = Q1 - 1.5 * IQR
-    adr_filtered_median = X_tr.loc[(X_tr['adr'] >= lower_bound) & (X_tr['adr'] <= upper_bound), 'adr'].median()
-    for X in (X_tr, X_te):
-        X['adr_processed'] = np.where(
-            (X['adr'] < lower_bound) | (X['adr'] > upper_bound),
-            adr_filtered_median,
-            X['adr']
-        )
-    return X_tr, X_te
+    stats = fit_adr_iqr(X_tr)
+    return apply_adr_iqr(X_tr.copy(), *stats), apply_adr_iqr(X_te.copy(), *stats)
 
 
 def add_total_stay(X_tr: pd.DataFrame, X_te: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    X_tr = X_tr.copy()
-    X_te = X_te.copy()
-    for X in (X_tr, X_te):
-        X['total_stay'] = X['stays_in_weekend_nights'] + X['stays_in_week_nights']
-    return X_tr, X_te
+    return apply_total_stay(X_tr.copy()), apply_total_stay(X_te.copy())
 
 
 def process_lead_time(X_tr: pd.DataFrame, X_te: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    X_tr = X_tr.copy()
-    X_te = X_te.copy()
-    lead_time_median = X_tr['lead_time'].median()
-    for X in (X_tr, X_te):
-        X['lead_time_processed'] = np.where(
-            (X['lead_time'] < 0) | (X['lead_time'] > 373),
-            lead_time_median,
-            X['lead_time']
-        )
-    return X_tr, X_te
+    lead_time_median = fit_lead_time_median(X_tr)
+    return apply_lead_time(X_tr.copy(), lead_time_median), apply_lead_time(X_te.copy(), lead_time_median)
 
 
 def map_hotel_type(X_tr: pd.DataFrame, X_te: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    X_tr = X_tr.copy()
-    X_te = X_te.copy()
-    for X in (X_tr, X_te):
-        X['is_resort'] = X['hotel'].map({'City Hotel': 0, 'Resort Hotel': 1})
-    return X_tr, X_te
-
-
+    return apply_hotel_type(X_tr.copy()), apply_hotel_type(X_te.copy())
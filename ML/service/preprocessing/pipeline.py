@@ -0,0 +1,119 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .encoding import ORIGINAL_COLUMNS_TO_DROP
+from .featureExtraction import LEAD_TIME_MAX, fit_adr_iqr, fit_lead_time_median
+
+# 파생 피처 (featureExtraction 의 apply_* 와 같은 정의, 같은 순서)
+DERIVED_COLUMNS = [
+    'is_alone', 'has_company', 'is_FB_meal', 'adr_processed',
+    'total_stay', 'lead_time_processed', 'is_resort',
+]
+# fill_missing_values 와 같이 결측을 0 으로 보는 컬럼
+ZERO_FILL_COLUMNS = ('children', 'company')
+HOTEL_TYPES = ['City Hotel', 'Resort Hotel']  # is_resort 값 = 위치
+
+
+def _is_categorical(dtype) -> bool:
+    return pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+
+
+def _level_codes(values: pd.Series, levels: List[str]) -> np.ndarray:
+    """levels 안의 위치 (없는 값/결측은 -1) - 고유값만 비교하도록 factorize 후 조회표 사용"""
+    codes, uniques = pd.factorize(values)
+    lookup = np.append(pd.Index(levels).get_indexer(uniques), -1)
+    return lookup[codes]
+
+
+def _numeric(X: pd.DataFrame, col: str) -> np.ndarray:
+    values = X[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    if col in ZERO_FILL_COLUMNS:
+        values = np.nan_to_num(values, nan=0.0)
+    return values
+
+
+class FeaturePipeline:
+    """
+    피처 엔지니어링 + 원-핫 인코딩 fit/transform 파이프라인
+
+    fit() 은 학습 데이터에서 통계(adr IQR 경계와 경계 안 중앙값, lead_time 중앙값,
+    원-핫 범주와 최종 피처 컬럼)를 한 번만 계산해 보관하고, transform() 은 그 통계로
+    새 프레임 하나를 변환한다. 모델과 함께 저장하면 예측 시 학습 CSV 가 필요 없다.
+
+    변환은 프레임 복사 없이 필요한 컬럼만 읽어 미리 할당한 float32 피처 행렬(컬럼 우선 순서)에
+    한 번에 채운다. children/company 결측은 fill_missing_values 와 같이 0 으로 본다.
+    """
+
+    def __init__(self):
+        self.adr_lower_bound: Optional[float] = None
+        self.adr_upper_bound: Optional[float] = None
+        self.adr_filtered_median: Optional[float] = None
+        self.lead_time_median: Optional[float] = None
+        self.categorical_columns: Optional[List[str]] = None
+        # 범주형 컬럼별 학습 범주 (정렬 순, 첫 범주는 drop_first 로 더미 없음)
+        self.category_levels: Optional[Dict[str, List[str]]] = None
+        self.passthrough_columns: Optional[List[str]] = None
+        self.feature_columns: Optional[List[str]] = None
+
+    def fit(self, X: pd.DataFrame) -> "FeaturePipeline":
+        self.adr_lower_bound, self.adr_upper_bound, self.adr_filtered_median = fit_adr_iqr(X)
+        self.lead_time_median = fit_lead_time_median(X)
+
+        # 컬럼 배치는 apply_* → apply_drop_original_columns → get_dummies(drop_first) 결과와 같다
+        kept = [c for c in X.columns if c not in ORIGINAL_COLUMNS_TO_DROP and c not in DERIVED_COLUMNS]
+        self.categorical_columns = [c for c in kept if _is_categorical(X[c].dtype)]
+        self.passthrough_columns = [c for c in kept if c not in self.categorical_columns]
+        self.category_levels = {
+            col: sorted(X[col].dropna().unique().tolist()) for col in self.categorical_columns
+        }
+        dummies = [
+            f'{col}_{level}' for col in self.categorical_columns for level in self.category_levels[col][1:]
+        ]
+        self.feature_columns = self.passthrough_columns + DERIVED_COLUMNS + dummies
+        return self
+
+    def transform_array(self, X: pd.DataFrame) -> np.ndarray:
+        """feature_columns 순서의 (행 수, 피처 수) float32 행렬"""
+        if self.feature_columns is None:
+            raise RuntimeError("FeaturePipeline is not fitted")
+
+        out = np.zeros((len(X), len(self.feature_columns)), dtype=np.float32, order='F')
+        j = 0
+        for col in self.passthrough_columns:
+            out[:, j] = _numeric(X, col)
+            j += 1
+
+        adults, children, babies = _numeric(X, 'adults'), _numeric(X, 'children'), _numeric(X, 'babies')
+        out[:, j] = (adults + children + babies) == 1
+        out[:, j + 1] = _numeric(X, 'company') > 0
+        out[:, j + 2] = _level_codes(X['meal'], ['FB']) == 0
+        adr = _numeric(X, 'adr')
+        out[:, j + 3] = np.where(
+            (adr < self.adr_lower_bound) | (adr > self.adr_upper_bound), self.adr_filtered_median, adr
+        )
+        out[:, j + 4] = _numeric(X, 'stays_in_weekend_nights') + _numeric(X, 'stays_in_week_nights')
+        lead_time = _numeric(X, 'lead_time')
+        out[:, j + 5] = np.where(
+            (lead_time < 0) | (lead_time > LEAD_TIME_MAX), self.lead_time_median, lead_time
+        )
+        hotel = _level_codes(X['hotel'], HOTEL_TYPES)
+        out[:, j + 6] = np.where(hotel >= 0, hotel, np.nan)
+        j += len(DERIVED_COLUMNS)
+
+        # 원-핫: 학습 범주 코드로 1 만 표시 (첫 범주, 학습에 없던 범주, 결측은 모두 0)
+        rows = np.arange(len(X))
+        for col in self.categorical_columns:
+            levels = self.category_levels[col]
+            codes = _level_codes(X[col], levels)
+            hit = codes >= 1
+            out[rows[hit], j + codes[hit] - 1] = 1.0
+            j += len(levels) - 1
+        return out
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame(self.transform_array(X), index=X.index, columns=self.feature_columns, copy=False)
+
+    def fit_transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(X).transform(X)
@@ -0,0 +1,106 @@
+"""
+온라인 취소 예측 요청 마이크로 배칭
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class MicroBatcher:
+    """
+    동시에 들어온 단건 예측 요청을 모아 한 번의 배치 예측으로 처리
+
+    score_batch 는 (모델, DataFrame) 을 받아 확률 배열을 돌려주는 코루틴 함수이다.
+    요청은 제출할 때 함께 넘긴 모델별로 따로 모이므로, 대기 중에 모델이 교체되어도 각 요청은
+    요청 시작 시점의 모델로 예측된다. 모델별 첫 요청이 들어오면 window_ms 동안 기다리며 요청을 모으고,
+    그 사이 max_batch_size 에 도달하면 즉시 처리한다. 각 요청자는 자신의 예약에 해당하는 확률을 돌려받는다.
+    """
+
+    def __init__(self, score_batch: Callable[[Any, pd.DataFrame], Awaitable[np.ndarray]],
+                 window_ms: float = 2.0, max_batch_size: int = 64):
+        self.score_batch = score_batch
+        self.window_ms = window_ms
+        self.max_batch_size = max_batch_size
+        # 모델별 대기 요청과 처리 타이머
+        self._pending: Dict[Any, List[Tuple[Dict, asyncio.Future]]] = {}
+        self._timers: Dict[Any, asyncio.TimerHandle] = {}
+        # 실행 중인 배치 작업 (GC 로 사라지지 않도록 참조 유지)
+        self._tasks = set()
+
+        # 배치 크기 분포 (2의 거듭제곱 상한 버킷)
+        self.bucket_bounds = [2 ** i for i in range(int(np.log2(max(max_batch_size, 1))) + 2)]
+        self.batch_size_counts = [0] * len(self.bucket_bounds)
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+
+    async def submit(self, booking: Dict, model: Any) -> float:
+        """예약 하나를 model 의 대기열에 넣고 배치 처리 결과(취소 확률)를 기다림"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(model, [])
+        pending.append((booking, future))
+        self.requests += 1
+
+        if len(pending) >= self.max_batch_size:
+            self._flush(model)
+        elif model not in self._timers:
+            self._timers[model] = loop.call_later(self.window_ms / 1000, self._flush, model)
+
+        return await future
+
+    def _flush(self, model: Any):
+        """model 의 대기 요청을 떼어내 배치 처리 작업으로 넘김"""
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(model, [])
+        if not batch:
+            return
+        self._record_batch(len(batch))
+        task = asyncio.get_running_loop().create_task(self._score(model, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _score(self, model: Any, batch: List[Tuple[Dict, asyncio.Future]]):
+        """한 번의 score_batch 호출로 처리 후 각 요청자의 future 에 결과 전달"""
+        try:
+            bookings = pd.DataFrame.from_records([booking for booking, _ in batch])
+            probabilities = await self.score_batch(model, bookings)
+            if len(probabilities) != len(batch):
+                raise ValueError(f"score_batch returned {len(probabilities)} probabilities for {len(batch)} bookings")
+        except Exception as e:
+            # 결과를 받지 못한 요청자가 계속 기다리지 않도록 모두 예외로 끝냄
+            self.errors += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), probability in zip(batch, probabilities):
+            if not future.done():
+                future.set_result(float(probability))
+
+    def _record_batch(self, size: int):
+        self.batches += 1
+        for i, bound in enumerate(self.bucket_bounds):
+            if size <= bound:
+                self.batch_size_counts[i] += 1
+                break
+
+    def stats(self) -> Dict:
+        """설정값과 배치 크기 분포 카운터"""
+        return {
+            "window_ms": self.window_ms,
+            "max_batch_size": self.max_batch_size,
+            "requests": self.requests,
+            "batches": self.batches,
+            "errors": self.errors,
+            "avg_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "batch_size_histogram": {
+                f"le_{bound}": count for bound, count in zip(self.bucket_bounds, self.batch_size_counts)
+            },
+        }
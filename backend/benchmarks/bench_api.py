@@ -0,0 +1,331 @@
+"""
+API 부하 벤치마크 - 엔드포인트별 처리량과 지연 시간 p50/p95/p99
+
+합성 예약 데이터(크기/시드 지정)를 만들어 앱을 같은 프로세스에서 띄우고,
+엔드포인트마다 고정된 동시성 수준으로 정해진 수의 요청을 보내 결과를 JSON 으로 저장한다.
+--baseline 을 주면 저장된 결과와 비교해 처리량 감소나 지연 증가가 --threshold 를 넘는 항목이나
+오류 수가 기준선보다 많은 항목이 있을 때 종료 코드 1 로 실패한다.
+
+    cd backend
+    python benchmarks/bench_api.py --rows 200000 --concurrency 1 8 32 --output bench.json
+    python benchmarks/bench_api.py --rows 200000 --save-baseline benchmarks/baseline_api.json
+    python benchmarks/bench_api.py --rows 200000 --baseline benchmarks/baseline_api.json --threshold 0.15
+
+응답 캐시와 단건 예측 캐시는 기본으로 끄고 매 요청을 실제로 계산한다 (--with-cache 로 켬).
+모델은 합성 데이터 일부로 학습해 임시 경로에 저장하므로 models/ 의 모델은 건드리지 않는다.
+결과는 기계마다 다르므로 기준선은 같은 기계/설정에서 만든 것과 비교한다.
+httpx 가 필요하다 (pip install httpx).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from database import LOADED_COLUMNS, PARTITION_COLUMN, ROW_ID_COLUMN, HAS_PYARROW  # noqa: E402
+
+# 비교에 쓰는 지표와 좋아지는 방향 (True: 클수록 좋음)
+GATED_METRICS = {"throughput_rps": True, "p50_ms": False, "p95_ms": False, "p99_ms": False}
+
+COUNTRIES = ['PRT', 'GBR', 'FRA', 'ESP', 'DEU', 'ITA', 'IRL', 'BEL', 'BRA', 'NLD',
+             'USA', 'CHE', 'CN', 'AUT', 'SWE', 'POL', 'CHN', 'ISR', 'NOR', 'RUS']
+ROOM_TYPES = list('ABCDEFGH')
+
+
+def make_synthetic_results(rows: int, days: int, seed: int = 0, start: str = "2016-01-01") -> pd.DataFrame:
+    """예측 결과(hotel_booking_predictions) 형식의 합성 예약 - 같은 시드면 같은 데이터"""
+    rng = np.random.default_rng(seed)
+
+    def pick(values, p=None):
+        return np.asarray(values, dtype=object)[rng.choice(len(values), size=rows, p=p)]
+
+    arrival = pd.DatetimeIndex(np.datetime64(start, 'D') + rng.integers(0, days, rows).astype('timedelta64[D]'))
+    probability = rng.beta(2.0, 4.5, rows)
+    reserved = pick(ROOM_TYPES, [.55, .02, .02, .2, .1, .05, .04, .02])
+    df = pd.DataFrame({
+        'hotel': pick(['City Hotel', 'Resort Hotel'], [.6, .4]),
+        'lead_time': np.minimum(rng.gamma(1.2, 90, rows), 700).astype(np.int64),
+        'arrival_date_year': arrival.year,
+        'arrival_date_month': arrival.month_name(),
+        'arrival_date_day_of_month': arrival.day,
+        'stays_in_weekend_nights': np.minimum(rng.poisson(1.0, rows), 8),
+        'stays_in_week_nights': np.minimum(rng.poisson(2.5, rows), 20),
+        'adults': pick([1, 2, 3], [.2, .72, .08]).astype(np.int64),
+        'children': pick([0, 1, 2], [.92, .05, .03]).astype(np.int64),
+        'babies': pick([0, 1], [.99, .01]).astype(np.int64),
+        'meal': pick(['BB', 'HB', 'SC', 'FB'], [.75, .12, .1, .03]),
+        'country': pick(COUNTRIES),
+        'market_segment': pick(['Online TA', 'Offline TA/TO', 'Groups', 'Direct', 'Corporate', 'Complementary'],
+                               [.47, .2, .16, .1, .05, .02]),
+        'distribution_channel': pick(['TA/TO', 'Direct', 'Corporate', 'GDS'], [.82, .12, .05, .01]),
+        'is_repeated_guest': (rng.random(rows) < .03).astype(np.int64),
+        'previous_cancellations': rng.poisson(.08, rows),
+        'previous_bookings_not_canceled': rng.poisson(.12, rows),
+        'reserved_room_type': reserved,
+        'assigned_room_type': np.where(rng.random(rows) < .85, reserved, pick(ROOM_TYPES)),
+        'booking_changes': rng.poisson(.2, rows),
+        'deposit_type': pick(['No Deposit', 'Non Refund', 'Refundable'], [.87, .12, .01]),
+        'days_in_waiting_list': np.where(rng.random(rows) < .97, 0, rng.integers(1, 100, rows)),
+        'customer_type': pick(['Transient', 'Transient-Party', 'Contract', 'Group'], [.75, .21, .035, .005]),
+        'adr': np.round(rng.gamma(4.0, 25.0, rows), 2),
+        'required_car_parking_spaces': (rng.random(rows) < .06).astype(np.int64),
+        'total_of_special_requests': np.minimum(rng.poisson(.6, rows), 5),
+        'predicted_is_canceled': (probability > 0.5).astype(np.int64),
+        'predicted_probability': probability,
+    })
+    return df[[col for col in LOADED_COLUMNS if col in df.columns]]
+
+
+def write_results(df: pd.DataFrame, results_dir: Path) -> Path:
+    """database.load_hotel_data 가 읽는 형식으로 저장 (pyarrow 가 있으면 연-월 파티션 Parquet, 없으면 CSV)"""
+    results_dir.mkdir(parents=True, exist_ok=True)
+    if not HAS_PYARROW:
+        path = results_dir / "hotel_booking_predictions.csv"
+        df.to_csv(path, index=False)
+        return path
+
+    dataset = df.copy()
+    dataset[ROW_ID_COLUMN] = np.arange(len(dataset), dtype=np.int64)
+    months = pd.to_datetime(dataset['arrival_date_month'], format='%B').dt.month
+    dataset[PARTITION_COLUMN] = (dataset['arrival_date_year'].astype(str) + '-' +
+                                 months.astype(str).str.zfill(2))
+    dataset = dataset.sort_values(PARTITION_COLUMN, kind='stable')
+    path = results_dir / "hotel_booking_predictions"
+    dataset.to_parquet(path, partition_cols=[PARTITION_COLUMN], index=False)
+    return path
+
+
+def prepare_dataset(args, work_dir: Path) -> Path:
+    """합성 데이터 디렉터리 (--data-dir 에 같은 크기/시드로 만든 것이 있으면 재사용)"""
+    base = Path(args.data_dir) if args.data_dir else work_dir
+    results_dir = base / f"synthetic-{args.rows}-{args.days}-{args.seed}"
+    if not results_dir.exists():
+        started = time.perf_counter()
+        write_results(make_synthetic_results(args.rows, args.days, args.seed), results_dir)
+        print(f"Generated {args.rows} synthetic bookings in {time.perf_counter() - started:.1f}s -> {results_dir}",
+              file=sys.stderr)
+    return results_dir
+
+
+def booking_payload(rng) -> dict:
+    """/api/predict/booking 요청 본문 (BookingFeatures)"""
+    return {
+        "lead_time": int(rng.integers(0, 400)), "adults": int(rng.integers(1, 4)),
+        "children": int(rng.integers(0, 3)), "babies": 0, "meal": str(rng.choice(['BB', 'HB', 'FB', 'SC'])),
+        "country": str(rng.choice(COUNTRIES)), "market_segment": "Online TA", "distribution_channel": "TA/TO",
+        "is_repeated_guest": 0, "previous_cancellations": int(rng.integers(0, 2)),
+        "previous_bookings_not_canceled": 0, "booking_changes": int(rng.integers(0, 3)),
+        "deposit_type": "No Deposit", "days_in_waiting_list": 0, "customer_type": "Transient",
+        "adr": float(np.round(rng.uniform(40, 250), 2)), "required_car_parking_spaces": 0,
+        "total_of_special_requests": int(rng.integers(0, 3)),
+    }
+
+
+def build_scenarios(dates: list, seed: int) -> dict:
+    """엔드포인트 이름 -> i 번째 요청 (method, path, json) 생성 함수 - 시드가 같으면 같은 요청 순서"""
+    rng = np.random.default_rng(seed)
+    picked = [dates[i] for i in rng.integers(0, len(dates), 4096)]
+    bookings = [booking_payload(rng) for _ in range(4096)]
+
+    def date_of(i):
+        return picked[i % len(picked)]
+
+    def range_end(day: str, n_days: int = 30) -> str:
+        return (np.datetime64(day) + np.timedelta64(n_days - 1, 'D')).astype(str)
+
+    return {
+        "predict_date": lambda i: ("POST", "/api/predict/date", {"date": date_of(i), "hotel_type": None}),
+        "predict_range_30d": lambda i: ("POST", "/api/predict/range",
+                                        {"start_date": date_of(i), "end_date": range_end(date_of(i)),
+                                         "hotel_type": None}),
+        "bookings_by_date": lambda i: ("GET", "/api/bookings/by-date?year={}&month={}&day={}&limit=20".format(
+            *map(int, date_of(i).split("-"))), None),
+        "calendar_monthly": lambda i: ("GET", "/api/calendar/monthly?year={}&month={}".format(
+            *map(int, date_of(i).split("-")[:2])), None),
+        "predict_booking": lambda i: ("POST", "/api/predict/booking", bookings[i % len(bookings)]),
+        "trends_weekly": lambda i: ("GET", "/api/trends/weekly", None),
+        "statistics_overview": lambda i: ("GET", "/api/statistics/overview", None),
+        "dates_available": lambda i: ("GET", "/api/dates/available", None),
+    }
+
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    values = np.array(latencies) * 1000
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "throughput_rps": len(values) / elapsed if elapsed > 0 else 0.0,
+        "mean_ms": float(values.mean()) if len(values) else 0.0,
+        "p50_ms": float(np.percentile(values, 50)) if len(values) else 0.0,
+        "p95_ms": float(np.percentile(values, 95)) if len(values) else 0.0,
+        "p99_ms": float(np.percentile(values, 99)) if len(values) else 0.0,
+    }
+
+
+async def run_case(client, make_request, concurrency: int, n_requests: int, warmup: int) -> dict:
+    """concurrency 개 클라이언트가 요청 n_requests 개를 나눠 보냄 (앞의 warmup 개는 측정 제외)"""
+    for i in range(warmup):
+        method, path, payload = make_request(i)
+        await client.request(method, path, json=payload)
+
+    latencies = []
+    errors = 0
+    next_index = warmup
+
+    async def client_loop():
+        nonlocal next_index, errors
+        while next_index < warmup + n_requests:
+            method, path, payload = make_request(next_index)
+            next_index += 1
+            started = time.perf_counter()
+            response = await client.request(method, path, json=payload)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def start_app(main, model_dir: Path, train_rows: int, seed: int):
+    """데이터 스냅샷 로드 후 합성 데이터 표본으로 학습한 모델을 임시 경로에 저장해 로드"""
+    from ml_model import CancellationPredictor
+
+    main.snapshots.model_path = model_dir / "cancellation_model.pkl"
+    await main.snapshots.reload(data=True, model=False, reason="benchmark")
+    hotel_data = main.snapshots.current.hotel_data
+    sample = hotel_data.sample(n=min(train_rows, len(hotel_data)), random_state=seed)
+    predictor = CancellationPredictor()
+    await asyncio.to_thread(predictor.train, sample)
+    predictor.save_model(str(main.snapshots.model_path))
+    await main.snapshots.reload(data=False, model=True, reason="benchmark")
+
+
+async def main_async(args, results_dir: Path, model_dir: Path) -> dict:
+    import httpx
+
+    os.environ["HOTEL_RESULTS_DIR"] = str(results_dir)
+    os.environ["RELOAD_WATCH_INTERVAL"] = "0"
+    os.environ.pop("SHARED_STORE_DIR", None)
+    os.environ.pop("HOTEL_DATA_START_MONTH", None)
+    os.environ.pop("HOTEL_DATA_END_MONTH", None)
+    if not args.with_cache:
+        os.environ["RESPONSE_CACHE_SIZE"] = "0"
+        os.environ["PREDICTION_CACHE_SIZE"] = "0"
+    import main
+
+    started = time.perf_counter()
+    await start_app(main, model_dir, args.train_rows, args.seed)
+    startup_s = time.perf_counter() - started
+
+    snapshot = main.snapshots.current
+    dates = snapshot.booking_index.available_dates()
+    scenarios = build_scenarios(dates, args.seed)
+    endpoints = args.endpoints or list(scenarios)
+
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name in endpoints:
+            for concurrency in args.concurrency:
+                case = f"{name}@c{concurrency}"
+                results[case] = {"endpoint": name, "concurrency": concurrency,
+                                 **await run_case(client, scenarios[name], concurrency, args.requests, args.warmup)}
+                print(f"{case:32s} {results[case]['throughput_rps']:9.1f} req/s  "
+                      f"p50 {results[case]['p50_ms']:8.2f} ms  p95 {results[case]['p95_ms']:8.2f} ms  "
+                      f"p99 {results[case]['p99_ms']:8.2f} ms  errors {results[case]['errors']}",
+                      file=sys.stderr, flush=True)
+    main.executor.shutdown()
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "rows": int(len(snapshot.hotel_data)),
+            "startup_s": round(startup_s, 3),
+        },
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float, metrics: list) -> list:
+    """
+    기준선 대비 threshold(비율) 이상 나빠진 (case, 지표, 기준값, 현재값, 변화율) 목록
+
+    오류 수는 비율과 무관하게 기준선보다 많으면 (기준선에 없는 케이스는 0 과 비교) 회귀로 본다.
+    실패 응답은 대개 더 빨라서 처리량/지연 지표만으로는 통과할 수 있기 때문이다.
+    """
+    regressions = []
+    for case, current in report["results"].items():
+        previous = baseline.get("results", {}).get(case)
+        errors_before, errors_after = (previous or {}).get("errors", 0), current.get("errors", 0)
+        if errors_after > errors_before:
+            change = (errors_after - errors_before) / errors_before if errors_before else float("inf")
+            regressions.append((case, "errors", errors_before, errors_after, change))
+        if previous is None:
+            continue
+        for metric in metrics:
+            before, after = previous.get(metric), current.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = -change if GATED_METRICS[metric] else change
+            if worse > threshold:
+                regressions.append((case, metric, before, after, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="합성 예약 수")
+    parser.add_argument("--days", type=int, default=730, help="도착일 분포 기간(일)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", type=str, default=None, help="합성 데이터 보관/재사용 디렉터리")
+    parser.add_argument("--train-rows", type=int, default=20000, help="벤치마크용 모델 학습 표본 수")
+    parser.add_argument("--endpoints", nargs="+", default=None, help="측정할 엔드포인트 (기본: 전체)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=300, help="케이스별 측정 요청 수")
+    parser.add_argument("--warmup", type=int, default=20, help="케이스별 측정 전 요청 수")
+    parser.add_argument("--with-cache", action="store_true", help="응답/예측 캐시 사용")
+    parser.add_argument("--output", type=str, default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", type=str, default=None, help="비교할 기준선 JSON")
+    parser.add_argument("--save-baseline", type=str, default=None, help="결과를 기준선으로 저장할 경로")
+    parser.add_argument("--threshold", type=float, default=0.10, help="허용 악화 비율 (0.10 = 10%%)")
+    parser.add_argument("--metrics", nargs="+", default=["throughput_rps", "p95_ms"], choices=list(GATED_METRICS),
+                        help="기준선 비교 지표")
+    args = parser.parse_args()
+
+    os.chdir(BACKEND_DIR)
+    with tempfile.TemporaryDirectory(prefix="bench-api-") as work_dir:
+        results_dir = prepare_dataset(args, Path(work_dir))
+        report = {"config": vars(args), **asyncio.run(main_async(args, results_dir, Path(work_dir)))}
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    for path in (args.output, args.save_baseline):
+        if path:
+            Path(path).write_text(text)
+
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text()), args.threshold, args.metrics)
+        for case, metric, before, after, change in regressions:
+            print(f"REGRESSION {case} {metric}: {before:.2f} -> {after:.2f} ({change:+.1%})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
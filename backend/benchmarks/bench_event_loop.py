@@ -0,0 +1,142 @@
+"""
+이벤트 루프 블로킹 벤치마크
+
+무거운 요청(/api/predict/batch 대량 채점, 캐시 없는 /api/trends/weekly)이 계속 들어오는 동안
+가벼운 요청(/, /api/predict/booking)의 지연 시간 p50/p95/p99 를 실행기 모드별로 비교한다.
+inline 은 이전처럼 이벤트 루프에서 바로 계산하는 모드, thread_pool 은 WorkExecutor 스레드 풀 모드,
+process_pool 은 스레드 풀 + 모델이 미리 로드된 프로세스 풀(EXECUTOR_PROCESSES) 모드이다.
+
+    cd backend
+    python benchmarks/bench_event_loop.py --heavy-clients 4 --batch-size 20000
+
+httpx 가 필요하다 (pip install httpx).
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def make_bookings(n: int, seed: int = 0) -> list:
+    """BookingFeatures 형식의 합성 예약"""
+    rng = np.random.default_rng(seed)
+    meals = ['BB', 'HB', 'FB', 'SC']
+    segments = ['Online TA', 'Offline TA/TO', 'Direct', 'Groups', 'Corporate']
+    return [
+        {
+            "lead_time": int(rng.integers(0, 400)), "adults": int(rng.integers(1, 4)),
+            "children": int(rng.integers(0, 3)), "babies": 0, "meal": meals[i % 4],
+            "country": "PRT", "market_segment": segments[i % 5], "distribution_channel": "TA/TO",
+            "is_repeated_guest": 0, "previous_cancellations": 0, "previous_bookings_not_canceled": 0,
+            "booking_changes": 0, "deposit_type": "No Deposit", "days_in_waiting_list": 0,
+            "customer_type": "Transient", "adr": float(rng.uniform(40, 250)),
+            "required_car_parking_spaces": 0, "total_of_special_requests": int(rng.integers(0, 3)),
+        }
+        for i in range(n)
+    ]
+
+
+def percentiles(samples: list) -> dict:
+    values = np.array(samples) * 1000
+    return {
+        "count": len(values),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max()),
+    }
+
+
+async def run_mode(main, client, bookings, args) -> dict:
+    stop = asyncio.Event()
+
+    async def heavy_client(i):
+        while not stop.is_set():
+            if i % 2 == 0:
+                await client.post("/api/predict/batch", json=bookings)
+            else:
+                await client.get("/api/trends/weekly")
+            # 인메모리 전송은 I/O 대기가 없으므로 다른 클라이언트에게 차례를 넘김
+            await asyncio.sleep(0)
+
+    async def cheap_client(method, path, payload, samples):
+        # 고정 간격으로 보낼 예정 시각부터 응답까지를 측정 (루프가 막혀 늦게 보낸 시간도 포함)
+        interval = args.cheap_interval_ms / 1000
+        scheduled = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            await client.request(method, path, json=payload)
+            samples.append(time.perf_counter() - scheduled)
+            scheduled = max(scheduled + interval, time.perf_counter() - interval)
+
+    cheap_requests = {
+        "GET /": ("GET", "/", None),
+        "POST /api/predict/booking": ("POST", "/api/predict/booking", bookings[0]),
+    }
+    cheap_samples = {name: [] for name in cheap_requests}
+    tasks = [asyncio.create_task(heavy_client(i)) for i in range(args.heavy_clients)]
+    tasks += [
+        asyncio.create_task(cheap_client(*cheap_requests[name], samples))
+        for name, samples in cheap_samples.items()
+    ]
+    await asyncio.sleep(args.duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return {path: percentiles(samples) for path, samples in cheap_samples.items()}
+
+
+async def main_async(args):
+    import httpx
+    import main
+    from cache import ResponseCache
+    from executor import WorkExecutor
+
+    await main.load_service_state()
+    # 무거운 엔드포인트가 캐시로 가벼워지지 않도록 응답 캐시 비활성화
+    main.response_cache = ResponseCache(maxsize=0)
+    bookings = make_bookings(args.batch_size)
+
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        modes = (("inline", 0, 0), ("thread_pool", args.threads, 0), ("process_pool", args.threads, args.processes))
+        for mode, threads, processes in modes:
+            main.executor = WorkExecutor(thread_workers=threads, process_workers=processes,
+                                         max_concurrency=args.max_concurrency)
+            main.executor.start_model_workers(str(main.MODEL_PATH))
+            results[mode] = await run_mode(main, client, bookings, args)
+            main.executor.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--heavy-clients", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=20000, help="/api/predict/batch 요청당 예약 수")
+    parser.add_argument("--threads", type=int, default=min(8, os.cpu_count() or 1))
+    parser.add_argument("--processes", type=int, default=min(4, os.cpu_count() or 1),
+                        help="process_pool 모드의 모델 프로세스 수")
+    parser.add_argument("--max-concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="모드별 측정 시간(초)")
+    parser.add_argument("--cheap-interval-ms", type=float, default=5.0)
+    parser.add_argument("--output", type=str, default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    os.chdir(BACKEND_DIR)
+    results = asyncio.run(main_async(args))
+    report = json.dumps({"config": vars(args), "results": results}, indent=2)
+    print(report)
+    if args.output:
+        Path(args.output).write_text(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+다중 uvicorn 워커 메모리/처리량 벤치마크
+
+워커 수(기본 1, 4, 8)와 데이터 적재 방식별로 uvicorn 을 띄우고 워커별 RSS/PSS 와
+초당 요청 수를 측정한다.
+- copy   : 워커마다 load_hotel_data 로 DataFrame 을 따로 적재 (이전 방식)
+- shared : 로더 프로세스(shared_store.py)가 만든 메모리 매핑 저장소에 워커들이 붙음 (SHARED_STORE_DIR)
+
+RSS 는 공유 페이지도 워커마다 전부 세므로, 실제 점유량 비교에는 PSS(공유 페이지를 나눠 센 값)를 본다.
+큰 데이터로 측정하려면 --results-dir 로 hotel_booking_predictions(.csv) 가 있는 디렉터리를 지정한다.
+
+    cd backend
+    python benchmarks/bench_workers.py --workers 1 4 8 --duration 15
+
+uvicorn, httpx 가 필요하며 /proc 를 읽으므로 Linux 에서만 동작한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# 응답 캐시 없이 실제 계산이 일어나는 요청 묶음
+REQUESTS = [
+    ("GET", "/api/calendar/monthly?year=2017&month=7", None),
+    ("GET", "/api/bookings/by-date?year=2017&month=7&day=15&limit=20", None),
+    ("POST", "/api/predict/date", {"date": "2017-07-15"}),
+    ("GET", "/api/trends/weekly", None),
+    ("GET", "/api/statistics/overview", None),
+]
+
+
+def worker_pids(master_pid: int) -> list:
+    """uvicorn 마스터 프로세스의 워커(자식) 프로세스 목록"""
+    pids = []
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+            cmdline = (stat.parent / "cmdline").read_bytes()
+        except OSError:
+            continue
+        if int(fields[1]) == master_pid and b"resource_tracker" not in cmdline:
+            pids.append(int(stat.parent.name))
+    return sorted(pids)
+
+
+def process_memory_mb(pid: int) -> dict:
+    """프로세스 RSS / PSS (MB)"""
+    values = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+        parts = line.split()
+        if parts[0] in ("Rss:", "Pss:"):
+            values[parts[0][:-1].lower() + "_mb"] = int(parts[1]) / 1024
+    return values
+
+
+async def wait_ready(base_url: str, workers: int, timeout: float):
+    """/readyz 가 연속으로 충분히 200 을 돌려줄 때까지 대기 (요청이 워커들에 나뉘어 들어감)"""
+    import httpx
+    deadline = time.monotonic() + timeout
+    streak = 0
+    async with httpx.AsyncClient(base_url=base_url, timeout=5) as client:
+        while streak < max(10, 4 * workers):
+            if time.monotonic() > deadline:
+                raise TimeoutError("server did not become ready")
+            try:
+                ready = (await client.get("/readyz")).status_code == 200
+            except httpx.TransportError:
+                ready = False
+            streak = streak + 1 if ready else 0
+            if not ready:
+                await asyncio.sleep(0.2)
+
+
+async def generate_load(base_url: str, concurrency: int, duration: float) -> dict:
+    """concurrency 개 클라이언트가 duration 초 동안 REQUESTS 를 반복 호출"""
+    import httpx
+    completed = 0
+    errors = 0
+    stop_at = time.perf_counter() + duration
+
+    async def client_loop(client, offset):
+        nonlocal completed, errors
+        i = offset
+        while time.perf_counter() < stop_at:
+            method, path, payload = REQUESTS[i % len(REQUESTS)]
+            i += 1
+            try:
+                response = await client.request(method, path, json=payload)
+                if response.status_code == 200:
+                    completed += 1
+                else:
+                    errors += 1
+            except httpx.TransportError:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return {"requests": completed, "errors": errors, "requests_per_s": completed / elapsed}
+
+
+def run_case(mode: str, workers: int, args, store_dir: str) -> dict:
+    env = dict(os.environ, RESPONSE_CACHE_SIZE="0", RELOAD_WATCH_INTERVAL="0")
+    if args.results_dir:
+        env["HOTEL_RESULTS_DIR"] = args.results_dir
+    if mode == "shared":
+        env["SHARED_STORE_DIR"] = store_dir
+    else:
+        env.pop("SHARED_STORE_DIR", None)
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        started = time.perf_counter()
+        asyncio.run(wait_ready(base_url, workers, args.startup_timeout))
+        ready_s = time.perf_counter() - started
+        load = asyncio.run(generate_load(base_url, args.concurrency, args.duration))
+        # --workers 1 이면 uvicorn 이 자식 없이 마스터 프로세스에서 바로 서비스
+        memory = [process_memory_mb(pid) for pid in worker_pids(server.pid) or [server.pid]]
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    return {
+        "mode": mode,
+        "workers": workers,
+        "ready_s": round(ready_s, 2),
+        **load,
+        "rss_per_worker_mb": round(sum(m["rss_mb"] for m in memory) / max(len(memory), 1), 1),
+        "pss_per_worker_mb": round(sum(m["pss_mb"] for m in memory) / max(len(memory), 1), 1),
+        "pss_total_mb": round(sum(m["pss_mb"] for m in memory), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--modes", nargs="+", default=["copy", "shared"], choices=["copy", "shared"])
+    parser.add_argument("--duration", type=float, default=10.0, help="측정 시간(초)")
+    parser.add_argument("--concurrency", type=int, default=32, help="동시 클라이언트 수")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--results-dir", type=str, default=None, help="HOTEL_RESULTS_DIR 로 넘길 데이터 디렉터리")
+    parser.add_argument("--startup-timeout", type=float, default=600.0)
+    parser.add_argument("--output", type=str, default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="booking-store-") as store_dir:
+        if "shared" in args.modes:
+            # 로더 프로세스가 워커 시작 전에 저장소를 한 번 생성
+            env = dict(os.environ)
+            if args.results_dir:
+                env["HOTEL_RESULTS_DIR"] = args.results_dir
+            subprocess.run([sys.executable, "shared_store.py", store_dir], cwd=BACKEND_DIR, env=env, check=True)
+
+        results = []
+        for mode in args.modes:
+            for workers in args.workers:
+                result = run_case(mode, workers, args, store_dir)
+                print(json.dumps(result), flush=True)
+                results.append(result)
+
+    report = json.dumps({"config": vars(args), "results": results}, indent=2)
+    print(report)
+    if args.output:
+        Path(args.output).write_text(report)
+
+
+if __name__ == "__main__":
+    main()
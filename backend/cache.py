@@ -0,0 +1,103 @@
+"""
+응답/예측 캐시 관련 클래스들
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class LRUCache:
+    """크기(및 선택적 TTL) 제한이 있는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """키 조회 - 있으면 최근 사용으로 갱신, 만료됐으면 제거"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, stored_at = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """키 저장 - 용량 초과 시 가장 오래전에 사용한 항목부터 제거"""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """모든 항목 제거"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/실패/제거 카운터"""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class ResponseCache:
+    """
+    읽기 전용 API 응답 캐시
+
+    키는 (데이터 세대, 경로, 정규화된 파라미터) 이며, 데이터나 모델이 다시
+    로드되면 invalidate() 로 세대를 올려 이전 응답을 모두 무효화한다.
+    값은 직렬화된 JSON 본문과 그 ETag 이다.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.generation = 0
+        self._entries = LRUCache(maxsize)
+
+    def make_key(self, route: str, params: Optional[Dict] = None, version: int = 0) -> str:
+        """경로 + 정렬된 파라미터 (+ 응답을 계산한 데이터 스냅샷 버전) 로 캐시 키 생성"""
+        normalized = json.dumps(params or {}, sort_keys=True, default=str)
+        return f"{self.generation}:{version}:{route}:{normalized}"
+
+    def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        return self._entries.get(key)
+
+    def set(self, key: str, body: bytes) -> Tuple[bytes, str]:
+        """본문 저장 후 (본문, ETag) 반환"""
+        etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        entry = (body, etag)
+        self._entries.set(key, entry)
+        return entry
+
+    def invalidate(self):
+        """데이터/모델 재로드 시 호출 - 세대 증가 및 전체 비우기"""
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"generation": self.generation, **self._entries.stats()}
@@ -2,118 +2,597 @@
 데이터베이스 및 데이터 로드 관련 함수들
 """
 import pandas as pd
-from datetime import datetime
+import numpy as np
+import calendar
+from datetime import datetime, date
 from pathlib import Path
+from typing import Optional
 import os
 
-def load_hotel_data():
-    """호텔 예약 데이터 로드"""
+from headcount import guest_count_distribution, distribution_quantiles
+
+# Parquet 데이터셋 읽기용 (없으면 CSV 만 사용)
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# 일자 서수(ordinal) 기준일 - 1970-01-01 이후 경과 일수
+EPOCH = np.datetime64('1970-01-01', 'D')
+
+# 월 이름을 숫자로 변환하는 딕셔너리
+MONTH_MAPPING = {
+    'January': 1, 'February': 2, 'March': 3, 'April': 4,
+    'May': 5, 'June': 6, 'July': 7, 'August': 8,
+    'September': 9, 'October': 10, 'November': 11, 'December': 12
+}
+
+
+def date_to_ordinal(value) -> int:
+    """날짜(str 'YYYY-MM-DD' / date / datetime)를 일자 서수로 변환"""
+    if isinstance(value, datetime):
+        value = value.date()
+    return int((np.datetime64(value, 'D') - EPOCH).astype(np.int64))
+
+
+def ordinal_to_date(ordinal: int) -> date:
+    """일자 서수를 date 객체로 변환"""
+    return (EPOCH + np.timedelta64(int(ordinal), 'D')).astype(object)
+
+
+# 조식이 포함된 식사 타입
+BREAKFAST_MEALS = ['BB', 'HB', 'FB']
+
+# 메모리에 올리는 예약 컬럼 - API 와 모델 학습에서 읽는 컬럼만 유지
+# (arrival_date_week_number, agent, company, reservation_status(_date), arrival_date_full 문자열은 제외)
+CATEGORICAL_COLUMNS = [
+    'hotel', 'meal', 'country', 'market_segment', 'distribution_channel',
+    'reserved_room_type', 'assigned_room_type', 'deposit_type', 'customer_type'
+]
+COUNT_COLUMNS = [
+    'lead_time', 'stays_in_weekend_nights', 'stays_in_week_nights', 'adults', 'children', 'babies',
+    'is_repeated_guest', 'previous_cancellations', 'previous_bookings_not_canceled',
+    'booking_changes', 'days_in_waiting_list', 'required_car_parking_spaces',
+    'total_of_special_requests', 'predicted_is_canceled'
+]
+ARRIVAL_DATE_COLUMNS = ['arrival_date_year', 'arrival_date_month', 'arrival_date_day_of_month']
+LOADED_COLUMNS = (CATEGORICAL_COLUMNS + COUNT_COLUMNS + ARRIVAL_DATE_COLUMNS +
+                  ['adr', 'predicted_probability'])
+
+# 예측 결과 Parquet 데이터셋의 파티션 컬럼 ('YYYY-MM') 과 원본 행 번호 컬럼 (ML/service/data_setup.py 와 동일)
+PARTITION_COLUMN = 'arrival_year_month'
+ROW_ID_COLUMN = 'row_id'
+
+# 예약 10만 건당 메모리 예산 (MB) - 시작 시 메모리 리포트에서 초과 여부 표시
+MEMORY_BUDGET_MB_PER_100K = float(os.getenv("MEMORY_BUDGET_MB_PER_100K", "8"))
+
+
+def row_positions(row_ids: np.ndarray) -> np.ndarray:
+    """원본 행 번호 -> 정렬 프레임 위치 조회 배열 (없는 번호는 -1)"""
+    positions = np.full(int(row_ids.max()) + 1 if len(row_ids) else 0, -1, dtype=np.int64)
+    positions[row_ids] = np.arange(len(row_ids), dtype=np.int64)
+    return positions
+
+
+class BookingIndex:
+    """
+    arrival_day(일자 서수) x hotel 순으로 정렬된 프레임 위의 위치 인덱스
+
+    offsets[slot] ~ offsets[slot + 1] 구간이 (일자, 호텔) 한 칸의 행 위치이며
+    slot = (day - first_day) * n_hotels + hotel_code 이다.
+    일자/호텔 조회는 마스크 스캔 없이 iloc 슬라이스로 처리된다.
+    """
+
+    def __init__(self, df: pd.DataFrame, positions: np.ndarray = None):
+        self.frame = df
+        self.hotels = sorted(df['hotel'].unique().tolist())
+        self._hotel_codes = {hotel: code for code, hotel in enumerate(self.hotels)}
+
+        days = df['arrival_day'].to_numpy(dtype=np.int64)
+        n_hotels = max(len(self.hotels), 1)
+        if len(days) == 0:
+            self.first_day = 0
+            self.n_days = 0
+        else:
+            self.first_day = int(days[0])
+            self.n_days = int(days[-1]) - self.first_day + 1
+
+        hotel_codes = pd.Categorical(df['hotel'], categories=self.hotels).codes.astype(np.int64)
+        slots = (days - self.first_day) * n_hotels + hotel_codes
+        counts = np.bincount(slots, minlength=self.n_days * n_hotels)
+        self.offsets = np.zeros(self.n_days * n_hotels + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+
+        # 예약이 있는 일자 목록 (정렬됨)
+        self.days = np.unique(days)
+
+        # 원본 행 번호(reservation id) -> 정렬 프레임 위치 (키셋 페이지네이션용)
+        self.row_ids = df.index.to_numpy(dtype=np.int64)
+        self._positions = positions if positions is not None else row_positions(self.row_ids)
+
+    def bounds(self, day: int, hotel_type: str = None):
+        """(일자[, 호텔]) 의 행 위치 구간 (start, stop)"""
+        rel = day - self.first_day
+        if rel < 0 or rel >= self.n_days:
+            return 0, 0
+        n_hotels = len(self.hotels)
+        if hotel_type:
+            code = self._hotel_codes.get(hotel_type)
+            if code is None:
+                return 0, 0
+            slot = rel * n_hotels + code
+            return int(self.offsets[slot]), int(self.offsets[slot + 1])
+        return int(self.offsets[rel * n_hotels]), int(self.offsets[(rel + 1) * n_hotels])
+
+    def range_bounds(self, first_day: int, last_day: int):
+        """[first_day, last_day] 일자 구간 (전체 호텔) 의 행 위치 구간"""
+        first_rel = min(max(first_day - self.first_day, 0), self.n_days)
+        last_rel = min(max(last_day - self.first_day + 1, 0), self.n_days)
+        if last_rel <= first_rel:
+            return 0, 0
+        n_hotels = len(self.hotels)
+        return int(self.offsets[first_rel * n_hotels]), int(self.offsets[last_rel * n_hotels])
+
+    def position_of(self, row_id: int) -> int:
+        """원본 행 번호의 정렬 프레임 내 위치 (없으면 -1)"""
+        if row_id < 0 or row_id >= len(self._positions):
+            return -1
+        return int(self._positions[row_id])
+
+    def bookings_on(self, day: int, hotel_type: str = None) -> pd.DataFrame:
+        """특정 일자(및 호텔)의 예약 슬라이스"""
+        start, stop = self.bounds(day, hotel_type)
+        return self.frame.iloc[start:stop]
+
+    def bookings_between(self, first_day: int, last_day: int) -> pd.DataFrame:
+        """일자 구간의 예약 슬라이스"""
+        start, stop = self.range_bounds(first_day, last_day)
+        return self.frame.iloc[start:stop]
+
+    def available_dates(self) -> list:
+        """예약이 존재하는 날짜 문자열 목록 (YYYY-MM-DD, 오름차순)"""
+        return (EPOCH + self.days.astype('timedelta64[D]')).astype(str).tolist()
+
+
+def find_results_path(name: str) -> Optional[Path]:
+    """ML/data/results (HOTEL_RESULTS_DIR 환경 변수로 변경 가능) 아래 파일/디렉터리 경로 탐색 (없으면 None)"""
+    results_dir = os.getenv("HOTEL_RESULTS_DIR")
+    if results_dir:
+        path = Path(results_dir) / name
+        return path if path.exists() else None
+    
     # 현재 파일 기준으로 상대경로 설정
     current_dir = Path(__file__).parent
     
     # 여러 경로 시도
     possible_paths = [
-        current_dir / "../ML/data/results/hotel_booking_predictions.csv",
-        current_dir / "../../ML/data/results/hotel_booking_predictions.csv", 
-        Path("../ML/data/results/hotel_booking_predictions.csv"),
-        Path("ML/data/results/hotel_booking_predictions.csv"),
-        Path("./ML/data/results/hotel_booking_predictions.csv")
+        current_dir / "../ML/data/results" / name,
+        current_dir / "../../ML/data/results" / name,
+        Path("../ML/data/results") / name,
+        Path("ML/data/results") / name,
+        Path("./ML/data/results") / name
     ]
     
-    data_path = None
     for path in possible_paths:
         if path.exists():
-            data_path = path
-            break
-            
-    if data_path is None:
-        raise FileNotFoundError(f"Data file not found in any of these paths: {[str(p) for p in possible_paths]}")
+            return path
+    return None
+
+
+def month_window(start_month: Optional[str], end_month: Optional[str]):
+    """'YYYY-MM' 시작/끝 월 (포함) -> (first_day, last_day) 일자 서수 (None 은 제한 없음)"""
+    first_day = date_to_ordinal(f"{start_month}-01") if start_month else None
+    last_day = None
+    if end_month:
+        year, month = map(int, end_month.split('-'))
+        last_day = date_to_ordinal(date(year, month, calendar.monthrange(year, month)[1]))
+    return first_day, last_day
+
+
+def data_source_path() -> Path:
+    """load_hotel_data 가 읽을 원본 경로 - Parquet 데이터셋 디렉터리, 없으면 CSV"""
+    dataset_path = find_results_path("hotel_booking_predictions")
+    if HAS_PYARROW and dataset_path is not None and dataset_path.is_dir():
+        return dataset_path
+    csv_path = find_results_path("hotel_booking_predictions.csv")
+    if csv_path is None:
+        raise FileNotFoundError("Data file not found: ML/data/results/hotel_booking_predictions(.csv)")
+    return csv_path
+
+
+def source_mtime(path: Path) -> float:
+    """원본 수정 시각 - 디렉터리(Parquet 데이터셋)는 안의 파일 중 가장 최근 값"""
+    if path.is_dir():
+        return max([path.stat().st_mtime] + [f.stat().st_mtime for f in path.rglob('*') if f.is_file()])
+    return path.stat().st_mtime
+
+
+def read_prediction_results(start_month: Optional[str] = None, end_month: Optional[str] = None) -> pd.DataFrame:
+    """
+    예측 결과 원본 로드 - 사용하는 컬럼만 읽음
+
+    Parquet 데이터셋(연-월 파티션)이 있으면 [start_month, end_month] 파티션만 읽고,
+    없으면 CSV 를 읽는다. 인덱스는 원본 CSV 의 행 번호(예약 번호)이다.
+    """
+    source_path = data_source_path()
+    if source_path.is_dir():
+        dataset_path = source_path
+        filters = []
+        if start_month:
+            filters.append((PARTITION_COLUMN, '>=', start_month))
+        if end_month:
+            filters.append((PARTITION_COLUMN, '<=', end_month))
+        df = pd.read_parquet(dataset_path, columns=LOADED_COLUMNS + [ROW_ID_COLUMN],
+                             filters=filters or None)
+        df = df.set_index(ROW_ID_COLUMN).rename_axis(None)
+        print(f"Read {len(df)} rows from {dataset_path}")
+        return df
     
-    # CSV 로드
-    df = pd.read_csv(data_path)
+    # CSV 로드 (사용하는 컬럼만)
+    df = pd.read_csv(source_path, usecols=lambda col: col in LOADED_COLUMNS)
+    print(f"Read {len(df)} rows from {source_path}")
+    return df
+
+
+def load_hotel_data(start_month: Optional[str] = None, end_month: Optional[str] = None):
+    """
+    호텔 예약 데이터 로드
+
+    start_month/end_month ('YYYY-MM', 포함) 로 서비스할 기간만 읽을 수 있으며,
+    지정하지 않으면 HOTEL_DATA_START_MONTH / HOTEL_DATA_END_MONTH 환경 변수를 사용한다.
+    """
+    start_month = start_month or os.getenv("HOTEL_DATA_START_MONTH") or None
+    end_month = end_month or os.getenv("HOTEL_DATA_END_MONTH") or None
+    df = read_prediction_results(start_month, end_month)
     
-    # 기본 데이터 정리
+    # 기본 데이터 정리 (Parquet 에서 읽은 카테고리 컬럼은 'Unknown' 카테고리 추가 후 채움)
     df['children'] = df['children'].fillna(0)
+    if isinstance(df['country'].dtype, pd.CategoricalDtype) and 'Unknown' not in df['country'].cat.categories:
+        df['country'] = df['country'].cat.add_categories('Unknown')
     df['country'] = df['country'].fillna('Unknown')
-    df['agent'] = df['agent'].fillna(0)
-    df['company'] = df['company'].fillna(0)
-    
-    # arrival_date_full 컬럼 생성 (YYYY-MM-DD 형식)
-    try:
-        # 월 이름을 숫자로 변환하는 딕셔너리
-        month_mapping = {
-            'January': 1, 'February': 2, 'March': 3, 'April': 4,
-            'May': 5, 'June': 6, 'July': 7, 'August': 8,
-            'September': 9, 'October': 10, 'November': 11, 'December': 12
-        }
-        
-        # 월 이름을 숫자로 변환
-        df['arrival_date_month_num'] = df['arrival_date_month'].map(month_mapping)
-        
-        # arrival_date_full 컬럼 생성
-        df['arrival_date_full'] = (
-            df['arrival_date_year'].astype(str) + '-' + 
-            df['arrival_date_month_num'].astype(str).str.zfill(2) + '-' + 
-            df['arrival_date_day_of_month'].astype(str).str.zfill(2)
-        )
-        
-        print(f"Created arrival_date_full column with date range: {df['arrival_date_full'].min()} to {df['arrival_date_full'].max()}")
-        
-    except Exception as e:
-        print(f"Warning: Could not create arrival_date_full column: {e}")
+    
+    # 일자 서수 컬럼 생성 - 연/월 이름/일 문자열 컬럼 대신 int32 하나로 보관
+    arrival = pd.to_datetime(pd.DataFrame({
+        'year': df['arrival_date_year'],
+        'month': df['arrival_date_month'].map(MONTH_MAPPING),
+        'day': df['arrival_date_day_of_month'],
+    }))
+    df['arrival_day'] = ((arrival.to_numpy().astype('datetime64[D]') - EPOCH)
+                         .astype(np.int64).astype(np.int32))
+    df = df.drop(columns=ARRIVAL_DATE_COLUMNS)
+    
+    # CSV 는 행 단위로 기간 제한 (Parquet 는 파티션 단위로 이미 제한됨)
+    first_day, last_day = month_window(start_month, end_month)
+    if first_day is not None:
+        df = df[df['arrival_day'] >= first_day]
+    if last_day is not None:
+        df = df[df['arrival_day'] <= last_day]
+    
+    df = compact_columns(df)
+    
+    # (일자, 호텔) 순으로 정렬 - BookingIndex 의 전제 조건 (카테고리는 정렬된 순서라 문자열 정렬과 같음)
+    df = df.sort_values(['arrival_day', 'hotel'], kind='stable')
     
     print(f"Loaded {len(df)} booking records")
+    report = memory_report(df)
+    print(f"Booking data memory: {report['total_mb']:.2f} MB "
+          f"({report['mb_per_100k']:.2f} MB per 100k bookings, budget {report['budget_mb_per_100k']:.0f} MB)")
+    if not report['within_budget']:
+        print("Warning: booking data exceeds the per-100k memory budget")
     
     return df
 
-def get_bookings_by_date(df: pd.DataFrame, target_date: datetime, hotel_type: str = None):
+
+def compact_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """문자열 컬럼은 Categorical, 건수 컬럼은 값 범위에 맞는 최소 정수형(int8/int16 ...)으로 변환"""
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            # 쓰지 않는 카테고리를 빼고 순서를 값 정렬 순서로 맞춤 (코드 정렬 = 문자열 정렬)
+            values = df[col].astype('category')
+            categories = values.cat.categories
+            used = np.bincount(values.cat.codes.to_numpy() + 1, minlength=len(categories) + 1)[1:] > 0
+            kept = sorted(categories[used])
+            if list(categories) != kept:
+                values = values.cat.set_categories(kept)
+            df[col] = values
+    for col in COUNT_COLUMNS:
+        if col in df.columns:
+            df[col] = downcast_integer(df[col])
+    if 'adr' in df.columns:
+        df['adr'] = df['adr'].astype(np.float32)
+    return df
+
+
+def downcast_integer(values: pd.Series) -> pd.Series:
+    """정수 컬럼을 값 범위에 맞는 가장 작은 부호 있는 정수형으로 변환"""
+    if not pd.api.types.is_integer_dtype(values.dtype):
+        return pd.to_numeric(values, downcast='integer')
+    if len(values) == 0:
+        return values.astype(np.int8)
+    low, high = values.min(), values.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return values
+
+
+def memory_report(df: pd.DataFrame) -> dict:
+    """예약 프레임의 메모리 사용량 (전체 / 예약 10만 건당 / 컬럼별, MB)"""
+    usage = df.memory_usage(deep=True)
+    total_mb = float(usage.sum()) / 1024 ** 2
+    mb_per_100k = total_mb / len(df) * 100_000 if len(df) else 0.0
+    return {
+        'rows': len(df),
+        'total_mb': total_mb,
+        'mb_per_100k': mb_per_100k,
+        'budget_mb_per_100k': MEMORY_BUDGET_MB_PER_100K,
+        'within_budget': bool(mb_per_100k <= MEMORY_BUDGET_MB_PER_100K),
+        'columns_mb': {col: float(usage[col]) / 1024 ** 2 for col in df.columns},
+    }
+
+
+def build_booking_index(df: pd.DataFrame, positions: np.ndarray = None) -> BookingIndex:
+    """load_hotel_data 결과 프레임에 대한 일자/호텔 인덱스 생성 (positions 는 미리 계산된 행 위치 배열)"""
+    return BookingIndex(df, positions)
+
+
+class BookingCube:
+    """
+    일자 x 호텔 x 식사 x 마켓 세그먼트 단위로 미리 집계한 예약 큐브
+
+    cells 의 각 행이 한 칸이며 예약 수와 인원/확률/취소 합계를 담는다.
+    통계/캘린더/트렌드 조회는 원본 예약 대신 이 칸들을 다시 묶어서 계산한다.
+    """
+
+    KEYS = ['arrival_day', 'hotel', 'meal', 'market_segment']
+
+    def __init__(self, df: pd.DataFrame):
+        cells = df.groupby(self.KEYS, sort=True, observed=True).agg(
+            bookings=('arrival_day', 'size'),
+            adults=('adults', 'sum'),
+            children=('children', 'sum'),
+            babies=('babies', 'sum'),
+            probability_sum=('predicted_probability', 'sum'),
+            cancellations=('predicted_is_canceled', 'sum'),
+            lead_time_sum=('lead_time', 'sum'),
+            weekend_nights=('stays_in_weekend_nights', 'sum'),
+            week_nights=('stays_in_week_nights', 'sum'),
+        ).reset_index()
+
+        # 다시 묶을 때 쓰는 파생 키 (칸 단위라 계산 비용이 작다)
+        dates = pd.DatetimeIndex(EPOCH + cells['arrival_day'].to_numpy().astype('timedelta64[D]'))
+        cells['year'] = dates.year
+        cells['month'] = dates.month
+        cells['month_name'] = dates.month.map(lambda m: calendar.month_name[m])
+        cells['weekday'] = dates.dayofweek
+        cells['is_breakfast'] = cells['meal'].isin(BREAKFAST_MEALS)
+        cells['breakfast_bookings'] = cells['bookings'].where(cells['is_breakfast'], 0)
+        cells['breakfast_guests'] = (cells['adults'] + cells['children']).where(cells['is_breakfast'], 0)
+
+        self.cells = cells
+        self._days = cells['arrival_day'].to_numpy()
+
+    def cells_between(self, first_day: int, last_day: int) -> pd.DataFrame:
+        """[first_day, last_day] 일자 구간의 칸들"""
+        start = np.searchsorted(self._days, first_day, side='left')
+        stop = np.searchsorted(self._days, last_day, side='right')
+        return self.cells.iloc[start:stop]
+
+    def rollup(self, by, cells: pd.DataFrame = None) -> pd.DataFrame:
+        """칸들을 by 기준으로 다시 집계 (합계 컬럼)"""
+        cells = self.cells if cells is None else cells
+        return cells.groupby(by, sort=False).agg(
+            bookings=('bookings', 'sum'),
+            adults=('adults', 'sum'),
+            children=('children', 'sum'),
+            babies=('babies', 'sum'),
+            probability_sum=('probability_sum', 'sum'),
+            cancellations=('cancellations', 'sum'),
+            lead_time_sum=('lead_time_sum', 'sum'),
+            weekend_nights=('weekend_nights', 'sum'),
+            week_nights=('week_nights', 'sum'),
+            breakfast_bookings=('breakfast_bookings', 'sum'),
+            breakfast_guests=('breakfast_guests', 'sum'),
+        )
+
+
+def build_booking_cube(df: pd.DataFrame) -> BookingCube:
+    """load_hotel_data 결과 프레임에 대한 집계 큐브 생성"""
+    return BookingCube(df)
+
+
+class BookingOccupancy:
+    """
+    일자 x 호텔별 재실(in-house) 인원 - 숙박 구간 차분 배열과 누적합으로 한 번에 계산
+
+    예약 하나는 [arrival_day, arrival_day + 주말 숙박 + 주중 숙박) 구간의 밤마다 재실하며,
+    그날 밤 재실 고객이 다음 날 아침 조식 대상이다. 구간 시작 칸에 +값, 끝 칸에 -값을 더한
+    차분 배열을 누적합하면 모든 일자의 재실 합계가 O(N + 일수) 로 나온다.
+    expected_* 는 (1 - 취소 확률) 가중 합계이다.
+    """
+
+    COUNT_METRICS = ['bookings', 'adults', 'children', 'breakfast_adults', 'breakfast_children']
+    EXPECTED_METRICS = ['expected_bookings', 'expected_guests', 'expected_breakfast_guests']
+
+    def __init__(self, df: pd.DataFrame):
+        self.hotels = sorted(df['hotel'].unique().tolist())
+        self._hotel_codes = {hotel: code for code, hotel in enumerate(self.hotels)}
+        n_hotels = max(len(self.hotels), 1)
+
+        start = df['arrival_day'].to_numpy(dtype=np.int64)
+        nights = (df['stays_in_weekend_nights'].to_numpy(dtype=np.int64) +
+                  df['stays_in_week_nights'].to_numpy(dtype=np.int64))
+        stay = nights > 0
+        start, end = start[stay], start[stay] + nights[stay]
+        if len(start) == 0:
+            self.first_day = 0
+            self.n_days = 0
+        else:
+            self.first_day = int(start.min())
+            self.n_days = int(end.max()) - self.first_day
+
+        # 호텔마다 n_days + 1 칸 (마지막 칸은 구간 끝 표시용)
+        width = self.n_days + 1
+        hotel_codes = pd.Categorical(df['hotel'], categories=self.hotels).codes.astype(np.int64)[stay]
+        start_slots = hotel_codes * width + (start - self.first_day)
+        end_slots = hotel_codes * width + (end - self.first_day)
+
+        adults = df['adults'].to_numpy(dtype=np.float64)[stay]
+        children = df['children'].to_numpy(dtype=np.float64)[stay]
+        breakfast = df['meal'].isin(BREAKFAST_MEALS).to_numpy()[stay]
+        probability_column = 'predicted_probability' if 'predicted_probability' in df.columns else 'predicted_is_canceled'
+        keep = 1.0 - df[probability_column].to_numpy(dtype=np.float64)[stay]
+        breakfast_guests = np.where(breakfast, adults + children, 0.0)
+
+        weights = {
+            'bookings': None,
+            'adults': adults,
+            'children': children,
+            'breakfast_adults': np.where(breakfast, adults, 0.0),
+            'breakfast_children': np.where(breakfast, children, 0.0),
+            'expected_bookings': keep,
+            'expected_guests': (adults + children) * keep,
+            'expected_breakfast_guests': breakfast_guests * keep,
+        }
+        self.metrics = {}
+        for name, w in weights.items():
+            diff = (np.bincount(start_slots, weights=w, minlength=n_hotels * width) -
+                    np.bincount(end_slots, weights=w, minlength=n_hotels * width))
+            in_house = np.cumsum(diff.reshape(n_hotels, width), axis=1)[:, :self.n_days]
+            if name in self.COUNT_METRICS:
+                in_house = np.rint(in_house).astype(np.int64)
+            self.metrics[name] = in_house
+
+    def between(self, first_day: int, last_day: int, hotel_type: str = None) -> dict:
+        """[first_day, last_day] 일자별 재실 합계 (컬럼명 -> 일자 수 길이 배열, 범위 밖은 0)"""
+        n_days = max(last_day - first_day + 1, 0)
+        lo = min(max(first_day - self.first_day, 0), self.n_days)
+        hi = min(max(last_day - self.first_day + 1, 0), self.n_days)
+        offset = lo - (first_day - self.first_day)
+
+        if hotel_type:
+            code = self._hotel_codes.get(hotel_type)
+            rows = slice(code, code + 1) if code is not None else slice(0, 0)
+        else:
+            rows = slice(None)
+
+        result = {}
+        for name, in_house in self.metrics.items():
+            values = np.zeros(n_days, dtype=in_house.dtype)
+            if hi > lo:
+                values[offset:offset + hi - lo] = in_house[rows, lo:hi].sum(axis=0)
+            result[name] = values
+        return result
+
+
+def build_booking_occupancy(df: pd.DataFrame) -> BookingOccupancy:
+    """load_hotel_data 결과 프레임에 대한 일자별 재실 인원 생성"""
+    return BookingOccupancy(df)
+
+def get_bookings_by_date(index: BookingIndex, target_date: datetime, hotel_type: str = None):
     """특정 날짜의 예약 데이터 조회"""
-    # 날짜 정보 추출
-    year = target_date.year
-    month = target_date.strftime("%B")  # 월 이름 (예: "July")
-    day = target_date.day
-    
-    # 필터링
-    filtered_df = df[
-        (df['arrival_date_year'] == year) &
-        (df['arrival_date_month'] == month) &
-        (df['arrival_date_day_of_month'] == day)
-    ]
-    
-    # 호텔 타입 필터링
+    return index.bookings_on(date_to_ordinal(target_date), hotel_type)
+
+def bookings_in_range(index: BookingIndex, first_day: int, last_day: int, hotel_type: str = None) -> pd.DataFrame:
+    """[first_day, last_day] 도착 예약 슬라이스 (hotel_type 지정 시 해당 호텔만)"""
+    rows = index.bookings_between(first_day, last_day)
     if hotel_type:
-        filtered_df = filtered_df[filtered_df['hotel'] == hotel_type]
-    
-    return filtered_df
+        rows = rows[(rows['hotel'] == hotel_type).to_numpy()]
+    return rows
+
+def cancellation_probability(rows: pd.DataFrame) -> np.ndarray:
+    """예약별 취소 확률 (predicted_probability 가 없으면 predicted_is_canceled)"""
+    if 'predicted_probability' in rows.columns:
+        return rows['predicted_probability'].to_numpy(dtype=np.float64)
+    return rows['predicted_is_canceled'].to_numpy(dtype=np.float64)
+
+def daily_booking_totals(index: BookingIndex, first_day: int, last_day: int, hotel_type: str = None) -> dict:
+    """
+    [first_day, last_day] 일자별 예약 합계 - 구간 슬라이스 한 번과 bincount 로 계산
+
+    반환값은 컬럼명 -> 일자 수 길이 배열이며, i 번째 값이 first_day + i 일의 합계이다.
+    (bookings, adults, children, babies, breakfast_bookings, breakfast_adults,
+    breakfast_children, probability_sum)
+    """
+    n_days = max(last_day - first_day + 1, 0)
+    rows = bookings_in_range(index, first_day, last_day, hotel_type)
+
+    day = rows['arrival_day'].to_numpy().astype(np.int64) - first_day
+    adults = rows['adults'].to_numpy(dtype=np.float64)
+    children = rows['children'].to_numpy(dtype=np.float64)
+    breakfast = rows['meal'].isin(BREAKFAST_MEALS).to_numpy()
+    probability = cancellation_probability(rows)
 
-def get_monthly_statistics(df: pd.DataFrame, year: int, month: int):
+    def total(weights=None):
+        return np.bincount(day, weights=weights, minlength=n_days)[:n_days]
+
+    counts = {
+        'bookings': total(),
+        'adults': total(adults),
+        'children': total(children),
+        'babies': total(rows['babies'].to_numpy(dtype=np.float64)),
+        'breakfast_bookings': total(breakfast.astype(np.float64)),
+        'breakfast_adults': total(np.where(breakfast, adults, 0.0)),
+        'breakfast_children': total(np.where(breakfast, children, 0.0)),
+    }
+    totals = {name: values.astype(np.int64) for name, values in counts.items()}
+    totals['probability_sum'] = total(probability)
+    return totals
+
+def daily_breakfast_headcount(index: BookingIndex, first_day: int, last_day: int, hotel_type: str = None,
+                              quantiles=(0.1, 0.5, 0.9)) -> dict:
+    """
+    [first_day, last_day] 일자별 조식 인원 분포 요약
+
+    조식 포함 예약마다 (성인 + 아동) 명이 (1 - 취소 확률) 로 온다고 보고 일자별 정확한 분포를
+    구한 뒤 분위수를 계산한다. 반환값은 mean (일자 수 길이 배열) 과 quantiles (일자 수 x 분위수 개수).
+    """
+    n_days = max(last_day - first_day + 1, 0)
+    rows = bookings_in_range(index, first_day, last_day, hotel_type)
+    breakfast = rows['meal'].isin(BREAKFAST_MEALS).to_numpy()
+    rows = rows[breakfast]
+
+    day = rows['arrival_day'].to_numpy().astype(np.int64) - first_day
+    sizes = rows['adults'].to_numpy(dtype=np.int64) + rows['children'].to_numpy(dtype=np.int64)
+    keep = 1.0 - cancellation_probability(rows)
+
+    dist = guest_count_distribution(day, sizes, keep, n_days)
+    return {
+        'mean': np.bincount(day, weights=sizes * keep, minlength=n_days)[:n_days],
+        'quantiles': distribution_quantiles(dist, quantiles),
+    }
+
+def get_monthly_statistics(index: BookingIndex, cube: BookingCube, year: int, month: int):
     """월별 통계 계산"""
-    month_name = datetime(year, month, 1).strftime("%B")
-    
-    month_data = df[
-        (df['arrival_date_year'] == year) &
-        (df['arrival_date_month'] == month_name)
-    ]
+    first_day = date_to_ordinal(date(year, month, 1))
+    last_day = first_day + calendar.monthrange(year, month)[1] - 1
+    month_cells = cube.cells_between(first_day, last_day)
     
-    if len(month_data) == 0:
+    if len(month_cells) == 0:
         return None
     
+    totals = month_cells[['bookings', 'cancellations', 'lead_time_sum', 'weekend_nights',
+                          'week_nights', 'adults', 'children', 'babies',
+                          'breakfast_bookings']].sum()
+    total_bookings = int(totals['bookings'])
+    
+    # 객실 타입 분포는 큐브 키가 아니므로 해당 월 슬라이스에서 계산
+    month_data = index.bookings_between(first_day, last_day)
+    
     stats = {
-        'total_bookings': len(month_data),
-        'cancellations': int(month_data['predicted_is_canceled'].sum()),
-        'cancellation_rate': float(month_data['predicted_is_canceled'].mean()),
-        'avg_lead_time': float(month_data['lead_time'].mean()),
+        'total_bookings': total_bookings,
+        'cancellations': int(totals['cancellations']),
+        'cancellation_rate': float(totals['cancellations'] / total_bookings),
+        'avg_lead_time': float(totals['lead_time_sum'] / total_bookings),
         'avg_stay_length': float(
-            month_data['stays_in_weekend_nights'].mean() + 
-            month_data['stays_in_week_nights'].mean()
-        ),
-        'total_guests': int(
-            month_data['adults'].sum() + 
-            month_data['children'].sum() + 
-            month_data['babies'].sum()
+            (totals['weekend_nights'] + totals['week_nights']) / total_bookings
         ),
-        'breakfast_bookings': len(month_data[month_data['meal'].isin(['BB', 'FB', 'HB'])]),
-        'room_types': month_data['reserved_room_type'].value_counts().to_dict()
+        'total_guests': int(totals['adults'] + totals['children'] + totals['babies']),
+        'breakfast_bookings': int(totals['breakfast_bookings']),
+        'room_types': month_data['reserved_room_type'].value_counts()
+                                .loc[lambda counts: counts > 0].to_dict()
     }
     
     return stats
@@ -121,7 +600,7 @@ def get_monthly_statistics(df: pd.DataFrame, year: int, month: int):
 def calculate_breakfast_estimate(df: pd.DataFrame, include_probability: bool = True):
     """조식 인원 예측"""
     # 조식이 포함된 예약만 필터링
-    breakfast_df = df[df['meal'].isin(['BB', 'FB', 'HB'])]
+    breakfast_df = df[df['meal'].isin(BREAKFAST_MEALS)]
     
     if len(breakfast_df) == 0:
         return 0
@@ -0,0 +1,89 @@
+"""
+CPU 작업 실행기 - pandas 필터링/집계와 모델 추론을 이벤트 루프 밖에서 실행
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+# 프로세스 풀 워커마다 한 번 로드되는 모델
+_worker_predictor = None
+
+
+def _init_model_worker(model_path: str):
+    """프로세스 풀 워커 초기화 - 모델을 워커당 한 번만 로드"""
+    global _worker_predictor
+    from ml_model import CancellationPredictor
+    _worker_predictor = CancellationPredictor()
+    _worker_predictor.load_model(model_path)
+
+
+def _call_worker_model(method: str, *args):
+    return getattr(_worker_predictor, method)(*args)
+
+
+class WorkExecutor:
+    """
+    이벤트 루프를 막지 않도록 무거운 작업을 풀로 보내는 실행기
+
+    - run(): 스레드 풀 (GIL 을 놓는 NumPy/pandas 연산용). thread_workers=0 이면 루프에서 바로 실행
+    - run_model(): process_workers > 0 이면 모델이 미리 로드된 프로세스 풀, 아니면 스레드 풀
+    - max_concurrency: 동시에 풀에 들어가는 작업 수 제한 (초과분은 루프에서 대기)
+    """
+
+    def __init__(self, thread_workers: int = 4, process_workers: int = 0, max_concurrency: int = 32):
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.max_concurrency = max_concurrency
+        self.thread_pool = (
+            ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix="cpu-work")
+            if thread_workers > 0 else None
+        )
+        self.process_pool = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @classmethod
+    def from_env(cls) -> "WorkExecutor":
+        """환경 변수 설정으로 생성 (EXECUTOR_THREADS / EXECUTOR_PROCESSES / EXECUTOR_MAX_CONCURRENCY)"""
+        return cls(
+            thread_workers=int(os.getenv("EXECUTOR_THREADS", str(min(8, os.cpu_count() or 1)))),
+            process_workers=int(os.getenv("EXECUTOR_PROCESSES", "0")),
+            max_concurrency=int(os.getenv("EXECUTOR_MAX_CONCURRENCY", "32")),
+        )
+
+    def start_model_workers(self, model_path: str):
+        """모델 프로세스 풀 (재)시작 - 모델 파일이 바뀌면 다시 호출 (이전 풀의 작업은 끝까지 처리)"""
+        if self.process_workers <= 0:
+            return
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=False)
+        self.process_pool = ProcessPoolExecutor(
+            max_workers=self.process_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_model_worker,
+            initargs=(model_path,),
+        )
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """스레드 풀에서 fn 실행"""
+        if self.thread_pool is None:
+            return fn(*args, **kwargs)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.thread_pool, partial(fn, *args, **kwargs))
+
+    async def run_model(self, predictor, method: str, *args) -> Any:
+        """모델 메서드 실행 (프로세스 풀이 있으면 워커의 모델 사용)"""
+        if self.process_pool is None:
+            return await self.run(getattr(predictor, method), *args)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.process_pool, _call_worker_model, method, *args)
+
+    def shutdown(self):
+        if self.thread_pool is not None:
+            self.thread_pool.shutdown(wait=False, cancel_futures=True)
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=False, cancel_futures=True)
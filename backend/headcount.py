@@ -0,0 +1,88 @@
+"""
+일자별 실제 조식 인원 분포 (Poisson-binomial) 계산
+"""
+from typing import Sequence
+
+import numpy as np
+
+
+def guest_count_distribution(day: np.ndarray, sizes: np.ndarray, keep: np.ndarray, n_days: int) -> np.ndarray:
+    """
+    일자별 실제 방문 인원의 정확한 확률 분포
+
+    예약 i 는 확률 keep[i] (= 1 - 취소 확률) 로 sizes[i] 명이 오고, 아니면 0 명이 온다고 보고
+    dist[d, k] = P(d 번째 일자 인원 == k) 를 동적 계획법 합성곱으로 구한다.
+    j 번째 단계에서 j 번째 예약이 있는 모든 일자를 한 번에 갱신하므로 파이썬 반복 횟수는
+    하루 최대 예약 수이고, 일자 수와는 무관하다.
+
+    day 는 0 ~ n_days - 1 의 일자 위치, sizes 는 정수 인원수이다.
+    """
+    sizes = np.asarray(sizes, dtype=np.int64)
+    present = sizes > 0
+    day = np.asarray(day, dtype=np.int64)[present]
+    sizes = sizes[present]
+    keep = np.clip(np.asarray(keep, dtype=np.float64)[present], 0.0, 1.0)
+
+    counts = np.bincount(day, minlength=n_days)[:n_days]
+    totals = np.bincount(day, weights=sizes, minlength=n_days)[:n_days].astype(np.int64)
+    support = int(totals.max()) + 1 if n_days and len(day) else 1
+
+    # 예약 수가 많은 일자부터 배치해 j 단계에서 갱신할 일자가 앞쪽 연속 구간이 되도록 함
+    slot_order = np.argsort(-counts, kind='stable')
+    slot_of_day = np.empty(n_days, dtype=np.int64)
+    slot_of_day[slot_order] = np.arange(n_days)
+    active = counts[slot_order]
+
+    # 일자 내 순번(rank)과 누적 인원 - 단계별로 갱신할 지지 구간(support) 상한 계산용
+    order = np.argsort(day, kind='stable')
+    day, sizes, keep = day[order], sizes[order], keep[order]
+    starts = np.zeros(n_days + 1, dtype=np.int64)
+    np.cumsum(counts, out=starts[1:])
+    rank = np.arange(len(day)) - starts[day]
+    cumulative = np.cumsum(sizes) - np.concatenate([[0], np.cumsum(sizes)])[starts[day]]
+
+    max_rank = int(active[0]) if n_days else 0
+    by_rank = np.argsort(rank, kind='stable')
+    rank_starts = np.zeros(max_rank + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rank, minlength=max_rank), out=rank_starts[1:])
+
+    # 행은 slot 순서 (예약 수 내림차순) - 마지막에 일자 순서로 되돌림
+    dist = np.zeros((n_days, support), dtype=np.float64)
+    dist[:, 0] = 1.0
+    for j in range(max_rank):
+        rows = by_rank[rank_starts[j]:rank_starts[j + 1]]
+        n_active = len(rows)
+        slots = slot_of_day[day[rows]]
+        width = int(cumulative[rows].max()) + 1
+
+        if n_active == 1:
+            # 한 일자만 남은 단계 (단일 일자 조회 포함) - 배열 인덱싱 없이 행 하나만 갱신
+            row = dist[0, :width]
+            size, q = int(sizes[rows[0]]), float(keep[rows[0]])
+            shifted = row[:width - size] * q
+            row *= 1.0 - q
+            row[size:] += shifted
+            continue
+
+        q = np.empty(n_active)
+        w = np.empty(n_active, dtype=np.int64)
+        q[slots] = keep[rows]
+        w[slots] = sizes[rows]
+
+        block = dist[:n_active, :width]
+        updated = block * (1.0 - q)[:, None]
+        for size in np.unique(w):
+            mask = w == size
+            updated[mask, size:] += block[mask, :width - size] * q[mask, None]
+        block[:] = updated
+    return dist[slot_of_day]
+
+
+def distribution_quantiles(dist: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    """일자별 분포의 분위수 (P(X <= k) >= q 인 최소 k) - (일자 수, 분위수 개수) 정수 배열"""
+    cdf = np.cumsum(dist, axis=1)
+    result = np.empty((dist.shape[0], len(quantiles)), dtype=np.int64)
+    for i, q in enumerate(quantiles):
+        # 부동소수 누적 오차로 마지막 칸이 q 에 못 미치는 경우 대비
+        result[:, i] = np.argmax(cdf >= q - 1e-9, axis=1)
+    return result
@@ -1,20 +1,32 @@
 """
 호텔 예약 취소 예측 및 조식 예측 서비스 백엔드 API
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, PlainTextResponse
 from datetime import datetime, timedelta
+import calendar
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Optional
 from pydantic import BaseModel
 import joblib
+import asyncio
+import io
+import json
 import os
+import time
 from pathlib import Path
 
 # ML 모델 관련 임포트
-from ml_model import CancellationPredictor
-from database import load_hotel_data, get_bookings_by_date
+from cache import ResponseCache
+from batching import MicroBatcher
+from executor import WorkExecutor
+from startup import StartupPhases
+import metrics
+from snapshot import SnapshotManager, ServiceSnapshot
+from database import date_to_ordinal, ordinal_to_date, daily_booking_totals, daily_breakfast_headcount, BREAKFAST_MEALS
 
 app = FastAPI(
     title="Hotel Booking Prediction API",
@@ -29,8 +41,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+
+# 라우트별 요청 수/오류 수/지연 시간 (/metrics)
+app.add_middleware(metrics.RequestMetricsMiddleware)
+
 # Pydantic 모델들
 class PredictionRequest(BaseModel):
     date: str  # YYYY-MM-DD 형식
@@ -65,6 +82,16 @@ class PredictionResponse(BaseModel):
     confidence_level: float
     details: Dict
 
+class RangePredictionRequest(BaseModel):
+    start_date: str  # YYYY-MM-DD 형식
+    end_date: str  # YYYY-MM-DD 형식 (포함)
+    hotel_type: Optional[str] = "Resort Hotel"
+
+class RangePredictionResponse(BaseModel):
+    start_date: str
+    end_date: str
+    days: List[PredictionResponse]
+
 class DailyStatistics(BaseModel):
     date: str
     total_bookings: int
@@ -72,43 +99,199 @@ class DailyStatistics(BaseModel):
     avg_party_size: float
     breakfast_count: int
 
-# 전역 변수
-model_predictor = None
-hotel_data = None
+# 시작 단계 진행 상황 (/healthz, /readyz)
+startup_phases = StartupPhases(["data", "model"])
+startup_task = None
+watch_task = None
+
+# 무거운 pandas/모델 작업 실행기 (EXECUTOR_THREADS / EXECUTOR_PROCESSES / EXECUTOR_MAX_CONCURRENCY)
+executor = WorkExecutor.from_env()
+
+# /api/predict/booking 마이크로 배칭 (MICROBATCH_ENABLED=1 로 활성화)
+# 요청은 시작 시점 스냅샷의 모델별로 묶이므로, 대기 중 모델이 교체되어도 원래 모델로 예측
+async def run_inference(predictor, bookings: pd.DataFrame, handler: str, source: str):
+    """모델 배치 추론 - 배치 크기와 추론 시간(풀 대기 포함) 기록"""
+    metrics.inference_batch_size.observe(len(bookings), source)
+    with metrics.stage(handler, "inference"):
+        return await executor.run_model(predictor, "predict_batch", bookings)
+
+micro_batcher = MicroBatcher(
+    lambda predictor, bookings: run_inference(predictor, bookings, "/api/predict/booking", "microbatch"),
+    window_ms=float(os.getenv("MICROBATCH_WINDOW_MS", "2")),
+    max_batch_size=int(os.getenv("MICROBATCH_MAX_SIZE", "64")),
+) if os.getenv("MICROBATCH_ENABLED", "0") == "1" else None
+
+# 읽기 전용 엔드포인트 응답 캐시 (데이터/모델 로드 시 무효화)
+response_cache = ResponseCache(maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "256")))
+
+
+def cached_response(request: Request, key: str) -> Optional[Response]:
+    """캐시에 있으면 응답(If-None-Match 일치 시 304) 반환, 없으면 None"""
+    entry = response_cache.get(key)
+    if entry is None:
+        return None
+    return _etag_response(request, *entry)
+
+
+def store_response(request: Request, key: str, result) -> Response:
+    """결과를 JSON 으로 직렬화해 캐시에 저장하고 ETag 응답 반환"""
+    route = request.scope.get("route")
+    with metrics.stage(route.path if route is not None else request.url.path, "serialize"):
+        body = JSONResponse(content=jsonable_encoder(result)).body
+    return _etag_response(request, *response_cache.set(key, body))
+
+
+def _etag_response(request: Request, body: bytes, etag: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def require_data() -> ServiceSnapshot:
+    """현재 스냅샷 반환 - 데이터 로드 전이면 503"""
+    snapshot = snapshots.current
+    if snapshot.hotel_data is None:
+        raise HTTPException(status_code=503, detail=_not_ready_detail("data", "Data not loaded yet"),
+                            headers={"Retry-After": "5"})
+    return snapshot
+
+
+def require_model() -> ServiceSnapshot:
+    """현재 스냅샷 반환 - 모델 로드/학습 전이면 503"""
+    snapshot = snapshots.current
+    if snapshot.model_predictor is None:
+        raise HTTPException(status_code=503, detail=_not_ready_detail("model", "Model not initialized yet"),
+                            headers={"Retry-After": "5"})
+    return snapshot
+
+
+def _not_ready_detail(phase: str, message: str) -> str:
+    error = startup_phases.error(phase)
+    return f"{message} ({startup_phases.status(phase)}: {error})" if error else f"{message} ({startup_phases.status(phase)})"
+
+
+MODEL_PATH = Path("models/cancellation_model.pkl")
+
+
+def on_snapshot_swap(snapshot: ServiceSnapshot, model_changed: bool):
+    """새 스냅샷 교체 후 - 응답 캐시 무효화, 모델이 바뀌었으면 모델 프로세스 풀 재시작"""
+    response_cache.invalidate()
+    if model_changed:
+        executor.start_model_workers(str(MODEL_PATH))
+
+
+# 데이터/인덱스/큐브/모델 스냅샷 (요청은 시작 시점의 스냅샷으로 끝까지 처리)
+# SHARED_STORE_DIR 를 지정하면 여러 워커가 예약 데이터를 메모리 매핑 저장소 하나로 공유
+snapshots = SnapshotManager(MODEL_PATH, on_swap=on_snapshot_swap,
+                            shared_store_dir=os.getenv("SHARED_STORE_DIR") or None)
+
+# 원본 파일 수정 감시 주기(초), 0 이면 감시하지 않음
+RELOAD_WATCH_INTERVAL = float(os.getenv("RELOAD_WATCH_INTERVAL", "10"))
+
+
+async def load_service_state():
+    """
+    시작 단계를 순서대로 실행 (데이터 -> 모델)
+
+    각 단계는 스레드에서 실행되어 이벤트 루프는 그동안 요청(/healthz, 데이터 엔드포인트)을 처리한다.
+    """
+    try:
+        with startup_phases.track("data"):
+            await snapshots.reload(data=True, model=False, reason="startup")
+        with startup_phases.track("model"):
+            await snapshots.reload(data=False, model=True, reason="startup")
+    except Exception as e:
+        print(f"Server startup failed: {e}")
+        return
+    
+    print("Server startup complete!")
+
+
+async def start_service():
+    """시작 단계 실행 후 원본 파일 감시 시작"""
+    global watch_task
+    await load_service_state()
+    if RELOAD_WATCH_INTERVAL > 0:
+        watch_task = asyncio.create_task(snapshots.watch(RELOAD_WATCH_INTERVAL))
+
 
 @app.on_event("startup")
 async def startup_event():
-    """서버 시작 시 모델 및 데이터 로드"""
-    global model_predictor, hotel_data
-    
-    print("Loading hotel data...")
-    hotel_data = load_hotel_data()
-    
-    print("Initializing ML model...")
-    model_predictor = CancellationPredictor()
-    
-    # 모델이 이미 학습되어 있는지 확인
-    model_path = Path("models/cancellation_model.pkl")
-    if model_path.exists():
-        print("Loading pre-trained model...")
-        model_predictor.load_model(str(model_path))
-    else:
-        print("Training new model...")
-        model_predictor.train(hotel_data)
-        model_path.parent.mkdir(exist_ok=True)
-        model_predictor.save_model(str(model_path))
+    """서버는 바로 요청을 받고, 데이터/모델은 백그라운드 작업으로 로드"""
+    global startup_task
+    startup_task = asyncio.create_task(start_service())
+
+
+@app.get("/healthz")
+async def healthz():
+    """프로세스 생존 여부와 시작 단계별 진행 상황 (항상 200)"""
+    return startup_phases.snapshot()
+
+
+@app.get("/readyz")
+async def readyz():
+    """모든 시작 단계가 끝났으면 200, 아니면 503 (단계별 상태 포함)"""
+    snapshot = startup_phases.snapshot()
+    return JSONResponse(status_code=200 if snapshot["ready"] else 503, content=snapshot)
+
+# 관리 API 토큰 (설정하면 X-Admin-Token 헤더가 일치해야 함)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+def require_admin(token: Optional[str]):
+    if ADMIN_TOKEN and token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@app.post("/api/admin/reload")
+async def reload_snapshot(target: str = "all", x_admin_token: Optional[str] = Header(None)):
+    """
+    예측 결과 데이터/모델을 다시 로드해 새 스냅샷으로 교체
+
+    target 은 all / data / model 이다. 새 스냅샷은 요청 경로 밖에서 만들어지고,
+    처리 중인 요청은 이전 스냅샷으로 끝난다. 소요 시간과 최대 메모리(RSS)를 반환한다.
+    """
+    require_admin(x_admin_token)
+    if target not in ("all", "data", "model"):
+        raise HTTPException(status_code=400, detail="target must be one of: all, data, model")
+    require_data()
     
-    print("Server startup complete!")
+    try:
+        return await snapshots.reload(data=target in ("all", "data"), model=target in ("all", "model"))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Reload failed: {e}")
+
+
+@app.get("/api/admin/reload/status")
+async def get_reload_status(x_admin_token: Optional[str] = Header(None)):
+    """현재 스냅샷 버전, 원본 수정 시각, 마지막 리로드 리포트"""
+    require_admin(x_admin_token)
+    return {"watch_interval_s": RELOAD_WATCH_INTERVAL, **snapshots.status()}
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """파일 감시 중지 및 실행기 풀 정리"""
+    if watch_task is not None:
+        watch_task.cancel()
+    executor.shutdown()
 
 @app.get("/api/dates/available")
-async def get_available_dates():
+async def get_available_dates(request: Request):
     """사용 가능한 날짜 범위 반환"""
-    if hotel_data is None:
-        raise HTTPException(status_code=500, detail="Data not loaded")
+    snapshot = require_data()
+    
+    key = response_cache.make_key("/api/dates/available", version=snapshot.version)
+    cached = cached_response(request, key)
+    if cached is not None:
+        return cached
     
+    return store_response(request, key, await executor.run(compute_available_dates, snapshot))
+
+def compute_available_dates(snapshot: ServiceSnapshot) -> Dict:
     try:
         # 데이터에서 사용 가능한 날짜들 추출
-        available_dates = sorted(hotel_data['arrival_date_full'].unique().tolist())
+        available_dates = snapshot.booking_index.available_dates()
         min_date = available_dates[0]
         max_date = available_dates[-1]
         
@@ -131,24 +314,34 @@ async def root():
     }
 
 @app.get("/api/statistics/overview")
-async def get_overview_statistics():
+async def get_overview_statistics(request: Request):
     """전체 데이터 통계 개요"""
-    if hotel_data is None:
-        raise HTTPException(status_code=500, detail="Data not loaded")
-    
-    total_bookings = len(hotel_data)
-    cancellation_rate = hotel_data['predicted_is_canceled'].mean()
-    avg_lead_time = hotel_data['lead_time'].mean()
-    
-    # 월별 취소율
-    monthly_stats = []
-    for month in hotel_data['arrival_date_month'].unique():
-        month_data = hotel_data[hotel_data['arrival_date_month'] == month]
-        monthly_stats.append({
+    snapshot = require_data()
+    
+    key = response_cache.make_key("/api/statistics/overview", version=snapshot.version)
+    cached = cached_response(request, key)
+    if cached is not None:
+        return cached
+    
+    return store_response(request, key, await executor.run(compute_overview_statistics, snapshot))
+
+def compute_overview_statistics(snapshot: ServiceSnapshot) -> Dict:
+    booking_cube = snapshot.booking_cube
+    cells = booking_cube.cells
+    total_bookings = int(cells['bookings'].sum())
+    cancellation_rate = cells['cancellations'].sum() / total_bookings if total_bookings > 0 else 0.0
+    avg_lead_time = cells['lead_time_sum'].sum() / total_bookings if total_bookings > 0 else 0.0
+    
+    # 월별 취소율 (큐브 칸을 월 이름으로 재집계)
+    monthly = booking_cube.rollup('month_name')
+    monthly_stats = [
+        {
             "month": month,
-            "bookings": len(month_data),
-            "cancellation_rate": month_data['predicted_is_canceled'].mean()
-        })
+            "bookings": int(row.bookings),
+            "cancellation_rate": float(row.cancellations / row.bookings)
+        }
+        for month, row in zip(monthly.index, monthly.itertuples())
+    ]
     
     return {
         "total_bookings": total_bookings,
@@ -160,137 +353,254 @@ async def get_overview_statistics():
 @app.post("/api/predict/date", response_model=PredictionResponse)
 async def predict_by_date(request: PredictionRequest):
     """특정 날짜의 예약 취소 예측 및 조식 준비 인원 계산"""
-    if model_predictor is None or hotel_data is None:
-        raise HTTPException(status_code=500, detail="Model not initialized")
+    # 미리 계산된 예측 확률만 사용하므로 데이터만 준비되면 응답
+    snapshot = require_data()
     
+    return await executor.run(compute_date_prediction, snapshot, request)
+
+def compute_date_prediction(snapshot: ServiceSnapshot, request: PredictionRequest) -> PredictionResponse:
     try:
-        # 날짜로 해당 날짜의 모든 예약 데이터 조회
-        date_bookings = hotel_data[hotel_data['arrival_date_full'] == request.date].copy()
-        
-        # 호텔 타입 필터링
-        if request.hotel_type:
-            date_bookings = date_bookings[date_bookings['hotel'] == request.hotel_type]
-        
-        if len(date_bookings) == 0:
-            # 예약 데이터가 없는 경우
-            return PredictionResponse(
-                date=request.date,
-                total_reservations=0,
-                predicted_cancellations=0,
-                expected_checkins=0,
-                breakfast_recommendation=0,
-                confidence_level=0.0,
-                details={
-                    "method": "no_data",
-                    "message": "해당 날짜의 예약 데이터가 없습니다.",
-                    "adults": 0,
-                    "children": 0,
-                    "babies": 0,
-                    "total_guests": 0,
-                    "breakfast_bookings": 0,
-                    "avg_cancellation_probability": 0.0,
-                    "expected_breakfast_guests": 0
-                }
-            )
-        
-        # 총 예약 건수
-        total_reservations = len(date_bookings)
-        
-        # 성인, 아동, 유아 수 계산
-        total_adults = int(date_bookings['adults'].sum())
-        total_children = int(date_bookings['children'].sum()) 
-        total_babies = int(date_bookings['babies'].sum())
-        
-        # 총 고객 수 (성인 + 아동만, 유아 제외)
-        total_guests = total_adults + total_children
-        
-        # 조식 신청자 수 (BB, HB, FB 포함)
-        breakfast_meals = ['BB', 'HB', 'FB']
-        breakfast_bookings = date_bookings[date_bookings['meal'].isin(breakfast_meals)]
-        breakfast_reservations = len(breakfast_bookings)
-        breakfast_adults = int(breakfast_bookings['adults'].sum())
-        breakfast_children = int(breakfast_bookings['children'].sum())
-        breakfast_guests = breakfast_adults + breakfast_children
-        
-        # 취소 확률 계산 (predicted_probability 컬럼 사용)
-        avg_cancellation_probability = float(date_bookings['predicted_probability'].mean())
-        
-        # 예상 취소 수 (확률 기반)
-        predicted_cancellations = int(total_reservations * avg_cancellation_probability)
-        
-        # 예상 체크인 수
-        expected_checkins = total_reservations - predicted_cancellations
-        
-        # 취소 확률을 반영한 실제 예상 손님 수
-        # 전체 고객 수에 취소확률 적용: (해당일 예약 고객 수) * (1 - 취소확률)
-        expected_total_guests = int((total_adults + total_children) * (1 - avg_cancellation_probability))
-        
-        # 성인/아동 비율 유지하여 계산
-        total_guest_ratio = total_adults + total_children
-        if total_guest_ratio > 0:
-            adult_ratio = total_adults / total_guest_ratio
-            child_ratio = total_children / total_guest_ratio
-            expected_adults = int(expected_total_guests * adult_ratio)
-            expected_children = int(expected_total_guests * child_ratio)
-        else:
-            expected_adults = 0
-            expected_children = 0
-        
-        # 조식 준비 인원 계산 (취소 확률 반영)
-        # 조식 신청 고객 수에 취소확률 적용
-        expected_breakfast_guests = int(breakfast_guests * (1 - avg_cancellation_probability))
-        
-        # 조식 성인/아동 비율 유지하여 계산
-        if breakfast_guests > 0:
-            breakfast_adult_ratio = breakfast_adults / breakfast_guests
-            breakfast_child_ratio = breakfast_children / breakfast_guests
-            expected_breakfast_adults = int(expected_breakfast_guests * breakfast_adult_ratio)
-            expected_breakfast_children = int(expected_breakfast_guests * breakfast_child_ratio)
-        else:
-            expected_breakfast_adults = 0
-            expected_breakfast_children = 0
-        
+        # 해당 날짜(및 호텔 타입) 하루 구간의 합계로 계산 (기간 예측과 같은 경로)
+        day = date_to_ordinal(datetime.strptime(request.date, "%Y-%m-%d"))
+        with metrics.stage("/api/predict/date", "aggregate"):
+            totals = daily_booking_totals(snapshot.booking_index, day, day, request.hotel_type)
+            in_house = snapshot.booking_occupancy.between(day, day, request.hotel_type)
+        with metrics.stage("/api/predict/date", "headcount"):
+            headcount = daily_breakfast_headcount(snapshot.booking_index, day, day, request.hotel_type,
+                                                  HEADCOUNT_QUANTILES)
+        with metrics.stage("/api/predict/date", "build_response"):
+            return prediction_from_totals(request.date, totals, 0, in_house, headcount)
+    
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def in_house_details(in_house: Dict[str, np.ndarray], i: int) -> Dict:
+    """BookingOccupancy.between 결과의 i 번째 일자 - 그날 밤 재실(체류 중) 인원과 다음 날 조식 대상"""
+    adults = int(in_house['adults'][i])
+    children = int(in_house['children'][i])
+    breakfast_adults = int(in_house['breakfast_adults'][i])
+    breakfast_children = int(in_house['breakfast_children'][i])
+    return {
+        "bookings": int(in_house['bookings'][i]),
+        "adults": adults,
+        "children": children,
+        "total_guests": adults + children,
+        "breakfast_adults": breakfast_adults,
+        "breakfast_children": breakfast_children,
+        "breakfast_guests": breakfast_adults + breakfast_children,
+        "expected_bookings": int(in_house['expected_bookings'][i]),
+        "expected_guests": int(in_house['expected_guests'][i]),
+        "expected_in_house_breakfast_guests": int(in_house['expected_breakfast_guests'][i]),
+    }
+
+# 조식 준비 수량 기준 분위수 (서비스 수준) - 예: 0.9 면 90% 날에 부족하지 않은 양
+BREAKFAST_PREP_SERVICE_LEVEL = float(os.getenv("BREAKFAST_PREP_SERVICE_LEVEL", "0.9"))
+# 조식 인원 분포에서 계산할 분위수 (P10, P50, P90, 준비 수량)
+HEADCOUNT_QUANTILES = (0.1, 0.5, 0.9, BREAKFAST_PREP_SERVICE_LEVEL)
+
+def headcount_details(headcount: Dict[str, np.ndarray], i: int) -> Dict:
+    """daily_breakfast_headcount 결과의 i 번째 일자 - 조식 인원 분포 분위수와 준비 수량"""
+    p10, p50, p90, prep = (int(value) for value in headcount['quantiles'][i])
+    return {
+        "mean": float(headcount['mean'][i]),
+        "p10": p10,
+        "p50": p50,
+        "p90": p90,
+        "prep_quantity": prep,
+        "service_level": BREAKFAST_PREP_SERVICE_LEVEL,
+    }
+
+def prediction_from_totals(date_str: str, totals: Dict[str, np.ndarray], i: int,
+                           in_house: Optional[Dict[str, np.ndarray]] = None,
+                           headcount: Optional[Dict[str, np.ndarray]] = None) -> PredictionResponse:
+    """daily_booking_totals (및 재실 인원, 조식 인원 분포) 결과의 i 번째 일자 -> PredictionResponse"""
+    in_house_stats = in_house_details(in_house, i) if in_house is not None else None
+    headcount_stats = headcount_details(headcount, i) if headcount is not None else None
+    if totals['bookings'][i] == 0:
+        # 예약 데이터가 없는 경우 (재실 인원은 이전 도착 예약으로 있을 수 있음)
+        details = {
+            "method": "no_data",
+            "message": "해당 날짜의 예약 데이터가 없습니다.",
+            "adults": 0,
+            "children": 0,
+            "babies": 0,
+            "total_guests": 0,
+            "breakfast_bookings": 0,
+            "avg_cancellation_probability": 0.0,
+            "expected_breakfast_guests": 0,
+            "legacy_expected_breakfast_guests": 0
+        }
+        if in_house_stats is not None:
+            details["in_house"] = in_house_stats
+        if headcount_stats is not None:
+            details["breakfast_headcount"] = headcount_stats
         return PredictionResponse(
-            date=request.date,
-            total_reservations=total_guests,  # 총 고객 수로 변경
-            predicted_cancellations=int(total_guests * avg_cancellation_probability),  # 고객 수 기준으로 계산
-            expected_checkins=expected_total_guests,  # 예상 체크인 고객 수
-            breakfast_recommendation=expected_breakfast_guests,
-            confidence_level=float(1 - avg_cancellation_probability),
-            details={
-                "total_bookings": total_reservations,  # 예약 건수
-                "method": "ml_prediction",
-                "message": "머신러닝 모델을 사용한 예측 결과입니다.",
-                "adults": total_adults,
-                "children": total_children,
-                "babies": total_babies,
-                "total_guests": total_guests,
-                "breakfast_bookings": breakfast_reservations,
-                "breakfast_guests": breakfast_guests,
-                "breakfast_adults": breakfast_adults,
-                "breakfast_children": breakfast_children,
-                "avg_cancellation_probability": avg_cancellation_probability,
-                "expected_adults": expected_adults,
-                "expected_children": expected_children,
-                "expected_total_guests": expected_total_guests,
-                "expected_breakfast_guests": expected_breakfast_guests,
-                "expected_breakfast_adults": expected_breakfast_adults,
-                "expected_breakfast_children": expected_breakfast_children
-            }
+            date=date_str,
+            total_reservations=0,
+            predicted_cancellations=0,
+            expected_checkins=0,
+            breakfast_recommendation=0,
+            confidence_level=0.0,
+            details=details
         )
     
+    # 총 예약 건수
+    total_reservations = int(totals['bookings'][i])
+    
+    # 성인, 아동, 유아 수
+    total_adults = int(totals['adults'][i])
+    total_children = int(totals['children'][i])
+    total_babies = int(totals['babies'][i])
+    
+    # 총 고객 수 (성인 + 아동만, 유아 제외)
+    total_guests = total_adults + total_children
+    
+    # 조식 신청자 수 (BB, HB, FB 포함)
+    breakfast_reservations = int(totals['breakfast_bookings'][i])
+    breakfast_adults = int(totals['breakfast_adults'][i])
+    breakfast_children = int(totals['breakfast_children'][i])
+    breakfast_guests = breakfast_adults + breakfast_children
+    
+    # 취소 확률 계산 (predicted_probability 평균)
+    avg_cancellation_probability = float(totals['probability_sum'][i] / total_reservations)
+    
+    # 예상 취소 수 (확률 기반)
+    predicted_cancellations = int(total_reservations * avg_cancellation_probability)
+    
+    # 예상 체크인 수
+    expected_checkins = total_reservations - predicted_cancellations
+    
+    # 취소 확률을 반영한 실제 예상 손님 수
+    # 전체 고객 수에 취소확률 적용: (해당일 예약 고객 수) * (1 - 취소확률)
+    expected_total_guests = int((total_adults + total_children) * (1 - avg_cancellation_probability))
+    
+    # 성인/아동 비율 유지하여 계산
+    total_guest_ratio = total_adults + total_children
+    if total_guest_ratio > 0:
+        adult_ratio = total_adults / total_guest_ratio
+        child_ratio = total_children / total_guest_ratio
+        expected_adults = int(expected_total_guests * adult_ratio)
+        expected_children = int(expected_total_guests * child_ratio)
+    else:
+        expected_adults = 0
+        expected_children = 0
+    
+    # 이전 방식 조식 인원 (그날 평균 취소 확률 하나를 조식 고객 수 전체에 적용) - 비교용으로만 남김
+    legacy_expected_breakfast_guests = int(breakfast_guests * (1 - avg_cancellation_probability))
+    
+    # 조식 준비 인원: 예약별 취소 확률로 계산한 조식 인원 분포의 평균(반올림) 과 준비 수량
+    if headcount_stats is not None:
+        expected_breakfast_guests = int(round(headcount_stats["mean"]))
+        breakfast_recommendation = headcount_stats["prep_quantity"]
+    else:
+        expected_breakfast_guests = breakfast_recommendation = legacy_expected_breakfast_guests
+    
+    # 조식 성인/아동 비율 유지하여 계산
+    if breakfast_guests > 0:
+        breakfast_adult_ratio = breakfast_adults / breakfast_guests
+        breakfast_child_ratio = breakfast_children / breakfast_guests
+        expected_breakfast_adults = int(expected_breakfast_guests * breakfast_adult_ratio)
+        expected_breakfast_children = int(expected_breakfast_guests * breakfast_child_ratio)
+    else:
+        expected_breakfast_adults = 0
+        expected_breakfast_children = 0
+    
+    details = {
+        "total_bookings": total_reservations,  # 예약 건수
+        "method": "ml_prediction",
+        "message": "머신러닝 모델을 사용한 예측 결과입니다.",
+        "adults": total_adults,
+        "children": total_children,
+        "babies": total_babies,
+        "total_guests": total_guests,
+        "breakfast_bookings": breakfast_reservations,
+        "breakfast_guests": breakfast_guests,
+        "breakfast_adults": breakfast_adults,
+        "breakfast_children": breakfast_children,
+        "avg_cancellation_probability": avg_cancellation_probability,
+        "expected_adults": expected_adults,
+        "expected_children": expected_children,
+        "expected_total_guests": expected_total_guests,
+        "expected_breakfast_guests": expected_breakfast_guests,
+        "legacy_expected_breakfast_guests": legacy_expected_breakfast_guests,
+        "expected_breakfast_adults": expected_breakfast_adults,
+        "expected_breakfast_children": expected_breakfast_children
+    }
+    if in_house_stats is not None:
+        details["in_house"] = in_house_stats
+    if headcount_stats is not None:
+        # 예약별 취소 확률과 인원수로 계산한 정확한 조식 인원 분포 (P10/P50/P90, 준비 수량)
+        details["breakfast_headcount"] = headcount_stats
+    
+    return PredictionResponse(
+        date=date_str,
+        total_reservations=total_guests,  # 총 고객 수로 변경
+        predicted_cancellations=int(total_guests * avg_cancellation_probability),  # 고객 수 기준으로 계산
+        expected_checkins=expected_total_guests,  # 예상 체크인 고객 수
+        breakfast_recommendation=breakfast_recommendation,
+        confidence_level=float(1 - avg_cancellation_probability),
+        details=details
+    )
+
+# 기간 예측 한 번에 조회할 수 있는 최대 일수
+MAX_RANGE_DAYS = int(os.getenv("MAX_RANGE_DAYS", "732"))
+
+@app.post("/api/predict/range", response_model=RangePredictionResponse)
+async def predict_by_range(request: RangePredictionRequest):
+    """
+    기간(start_date ~ end_date) 의 일자별 예약 취소 예측 및 조식 준비 인원
+
+    각 일자의 값은 /api/predict/date 와 같으며, 기간 전체를 한 번의 구간 슬라이스와
+    bincount 로 계산한다.
+    """
+    snapshot = require_data()
+    
+    return await executor.run(compute_range_prediction, snapshot, request)
+
+def compute_range_prediction(snapshot: ServiceSnapshot, request: RangePredictionRequest) -> RangePredictionResponse:
+    try:
+        first_day = date_to_ordinal(datetime.strptime(request.start_date, "%Y-%m-%d"))
+        last_day = date_to_ordinal(datetime.strptime(request.end_date, "%Y-%m-%d"))
+        if last_day < first_day:
+            raise ValueError("end_date must not be before start_date")
+        if last_day - first_day + 1 > MAX_RANGE_DAYS:
+            raise ValueError(f"Range is limited to {MAX_RANGE_DAYS} days")
+        
+        with metrics.stage("/api/predict/range", "aggregate"):
+            totals = daily_booking_totals(snapshot.booking_index, first_day, last_day, request.hotel_type)
+            in_house = snapshot.booking_occupancy.between(first_day, last_day, request.hotel_type)
+        with metrics.stage("/api/predict/range", "headcount"):
+            headcount = daily_breakfast_headcount(snapshot.booking_index, first_day, last_day, request.hotel_type,
+                                                  HEADCOUNT_QUANTILES)
+        with metrics.stage("/api/predict/range", "build_response"):
+            days = [
+                prediction_from_totals(ordinal_to_date(first_day + i).isoformat(), totals, i, in_house, headcount)
+                for i in range(last_day - first_day + 1)
+            ]
+            return RangePredictionResponse(start_date=request.start_date, end_date=request.end_date, days=days)
+    
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/api/predict/booking")
 async def predict_single_booking(features: BookingFeatures):
     """개별 예약의 취소 확률 예측"""
-    if model_predictor is None:
-        raise HTTPException(status_code=500, detail="Model not initialized")
+    snapshot = require_model()
     
     try:
-        # 예측
-        cancellation_prob = model_predictor.predict_single(features.dict())
+        # 예측 (마이크로 배칭 사용 시 동시 요청과 묶어서 처리, 단건 예측 캐시는 두 경로 모두 사용)
+        # 캐시에 없으면 실행기로 추론 (EXECUTOR_PROCESSES > 0 이면 모델이 로드된 프로세스 풀)
+        booking = features.dict()
+        predictor = snapshot.model_predictor
+        cancellation_prob = predictor.cached_prediction(booking)
+        if cancellation_prob is None:
+            if micro_batcher is not None:
+                cancellation_prob = await micro_batcher.submit(booking, predictor)
+            else:
+                metrics.inference_batch_size.observe(1, "single")
+                with metrics.stage("/api/predict/booking", "inference"):
+                    cancellation_prob = await executor.run_model(predictor, "predict_row", booking)
+            predictor.cache_prediction(booking, cancellation_prob)
         
         return {
             "cancellation_probability": float(cancellation_prob),
@@ -301,50 +611,198 @@ async def predict_single_booking(features: BookingFeatures):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/api/predict/batcher/stats")
+async def get_batcher_stats():
+    """마이크로 배칭 설정 및 배치 크기 분포"""
+    if micro_batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **micro_batcher.stats()}
+
+@app.get("/api/predict/cache/stats")
+async def get_prediction_cache_stats():
+    """단건 예측 캐시 적중/실패/제거 카운터"""
+    return require_model().model_predictor.cache_stats()
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus 텍스트 형식 지표 (요청/오류/지연, 단계별 시간, 추론 배치 크기, 로드 시간)"""
+    snapshot = snapshots.current
+    metrics.snapshot_version.set(snapshot.version)
+    metrics.snapshot_rows.set(0 if snapshot.hotel_data is None else len(snapshot.hotel_data))
+    cache_stats = response_cache.stats()
+    for event in ("hits", "misses", "evictions"):
+        metrics.response_cache_events.set(cache_stats[event], event)
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+# 배치 예측 시 한 번의 predict_batch 호출로 처리할 최대 예약 수
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "20000"))
+# 배치 예측 요청 본문 최대 크기(바이트)와 최대 예약 수 - 넘으면 413
+BATCH_MAX_BODY_BYTES = int(os.getenv("BATCH_MAX_BODY_BYTES", str(64 * 1024 * 1024)))
+BATCH_MAX_ROWS = int(os.getenv("BATCH_MAX_ROWS", "200000"))
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+async def read_limited_body(request: Request, limit: int) -> bytes:
+    """요청 본문을 limit 바이트까지만 읽음 (Content-Length 또는 실제 크기가 넘으면 413)"""
+    too_large = HTTPException(status_code=413, detail=f"Request body exceeds {limit} bytes")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        raise too_large
+    
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def parse_booking_batch(body: bytes, content_type: str) -> pd.DataFrame:
+    """JSON 배열 또는 NDJSON 본문을 BookingFeatures 컬럼의 DataFrame 으로 변환"""
+    if content_type.split(";")[0].strip().lower() in NDJSON_CONTENT_TYPES:
+        # 줄마다 dict 를 만들지 않고 pandas 파서로 바로 DataFrame 생성
+        if body.strip():
+            df = pd.read_json(io.BytesIO(body), lines=True, dtype=False, convert_dates=False)
+        else:
+            df = pd.DataFrame()
+    else:
+        records = json.loads(body)
+        if isinstance(records, dict):
+            records = records.get("bookings")
+        if not isinstance(records, list):
+            raise ValueError("Request body must be a JSON array of bookings")
+        df = pd.DataFrame.from_records(records)
+    
+    if len(df) == 0:
+        return pd.DataFrame(columns=list(BookingFeatures.model_fields))
+    
+    missing = [field for field in BookingFeatures.model_fields if field not in df.columns]
+    if missing:
+        raise ValueError(f"Missing booking fields: {missing}")
+    
+    # BookingFeatures 타입에 맞춰 컬럼 단위로 변환
+    for field, info in BookingFeatures.model_fields.items():
+        if info.annotation is str:
+            df[field] = df[field].astype(str)
+        else:
+            df[field] = pd.to_numeric(df[field], errors="raise")
+    
+    return df[list(BookingFeatures.model_fields)]
+
+
+def risk_levels(probabilities: np.ndarray) -> np.ndarray:
+    """취소 확률 -> 위험도 라벨 (predict_single_booking 과 동일 기준)"""
+    return np.select([probabilities > 0.7, probabilities > 0.3], ["높음", "중간"], default="낮음")
+
+
+@app.post("/api/predict/batch")
+async def predict_booking_batch(request: Request):
+    """
+    다수 예약의 취소 확률 일괄 예측
+
+    본문은 BookingFeatures 객체의 JSON 배열, 또는 Content-Type 이
+    application/x-ndjson 인 경우 한 줄에 하나씩 적은 NDJSON 이다.
+    BATCH_CHUNK_SIZE 단위로 나누어 predict_batch 를 호출하며, 결과는 입력 순서와 같다.
+    본문이 BATCH_MAX_BODY_BYTES 를 넘거나 예약이 BATCH_MAX_ROWS 건을 넘으면 413 을 돌려준다.
+    """
+    snapshot = require_model()
+    
+    body = await read_limited_body(request, BATCH_MAX_BODY_BYTES)
+    try:
+        with metrics.stage("/api/predict/batch", "parse"):
+            bookings = await executor.run(parse_booking_batch, body, request.headers.get("content-type", ""))
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    # 파싱이 끝난 원본 본문은 추론 전에 해제
+    del body
+    if len(bookings) > BATCH_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {BATCH_MAX_ROWS} bookings")
+    
+    try:
+        probabilities = np.empty(len(bookings), dtype=np.float64)
+        for start in range(0, len(bookings), BATCH_CHUNK_SIZE):
+            chunk = bookings.iloc[start:start + BATCH_CHUNK_SIZE]
+            probabilities[start:start + len(chunk)] = await run_inference(
+                snapshot.model_predictor, chunk, "/api/predict/batch", "batch")
+        
+        with metrics.stage("/api/predict/batch", "serialize"):
+            return await executor.run(JSONResponse, content={
+                "count": int(len(bookings)),
+                "cancellation_probabilities": probabilities.tolist(),
+                "risk_levels": risk_levels(probabilities).tolist()
+            })
+        
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/api/calendar/monthly")
-async def get_monthly_calendar(year: int, month: int):
+async def get_monthly_calendar(request: Request, year: int, month: int):
     """월별 캘린더 데이터 (예약 현황 포함)"""
-    if hotel_data is None:
-        raise HTTPException(status_code=500, detail="Data not loaded")
+    snapshot = require_data()
+    
+    key = response_cache.make_key("/api/calendar/monthly", {"year": year, "month": month},
+                                  version=snapshot.version)
+    cached = cached_response(request, key)
+    if cached is not None:
+        return cached
     
+    return store_response(request, key, await executor.run(compute_monthly_calendar, snapshot, year, month))
+
+def calendar_in_house(in_house: Dict[str, np.ndarray], i: int) -> Dict:
+    """캘린더 일자 항목에 붙는 재실 인원 필드"""
+    return {
+        "in_house_guests": int(in_house['adults'][i] + in_house['children'][i]),
+        "in_house_breakfast_guests": int(in_house['breakfast_adults'][i] + in_house['breakfast_children'][i]),
+        "expected_in_house_guests": int(in_house['expected_guests'][i]),
+        "expected_in_house_breakfast_guests": int(in_house['expected_breakfast_guests'][i]),
+    }
+
+def compute_monthly_calendar(snapshot: ServiceSnapshot, year: int, month: int) -> Dict:
+    booking_cube = snapshot.booking_cube
     try:
-        # 해당 월의 데이터 필터링
+        # 해당 월의 큐브 칸을 일자별로 재집계
         month_name = datetime(year, month, 1).strftime("%B")
-        month_data = hotel_data[
-            (hotel_data['arrival_date_year'] == year) &
-            (hotel_data['arrival_date_month'] == month_name)
-        ]
+        first_day = date_to_ordinal(datetime(year, month, 1))
+        days_in_month = calendar.monthrange(year, month)[1]
+        with metrics.stage("/api/calendar/monthly", "filter"):
+            month_cells = booking_cube.cells_between(first_day, first_day + days_in_month - 1)
+        with metrics.stage("/api/calendar/monthly", "aggregate"):
+            daily = booking_cube.rollup('arrival_day', month_cells)
+            # 일자별 재실(체류 중) 인원 - 도착일과 무관하게 그날 밤 묵는 모든 예약
+            in_house = snapshot.booking_occupancy.between(first_day, first_day + days_in_month - 1)
         
         # 일별 통계 계산
         daily_stats = []
-        for day in range(1, 32):
-            try:
-                date = datetime(year, month, day)
-                day_data = month_data[month_data['arrival_date_day_of_month'] == day]
-                
-                if len(day_data) > 0:
-                    daily_stats.append({
-                        "date": date.strftime("%Y-%m-%d"),
-                        "day": day,
-                        "bookings": len(day_data),
-                        "cancellations": int(day_data['predicted_is_canceled'].sum()),
-                        "cancellation_rate": float(day_data['predicted_is_canceled'].mean()),
-                        "total_guests": int(day_data['adults'].sum() + day_data['children'].sum()),
-                        "breakfast_count": len(day_data[day_data['meal'].isin(['BB', 'FB', 'HB'])])
-                    })
-                else:
-                    daily_stats.append({
-                        "date": date.strftime("%Y-%m-%d"),
-                        "day": day,
-                        "bookings": 0,
-                        "cancellations": 0,
-                        "cancellation_rate": 0,
-                        "total_guests": 0,
-                        "breakfast_count": 0
-                    })
-            except ValueError:
-                # 유효하지 않은 날짜 (예: 2월 30일)
-                break
+        for day in range(1, days_in_month + 1):
+            date = datetime(year, month, day)
+            ordinal = first_day + day - 1
+            if ordinal in daily.index:
+                row = daily.loc[ordinal]
+                daily_stats.append({
+                    "date": date.strftime("%Y-%m-%d"),
+                    "day": day,
+                    "bookings": int(row['bookings']),
+                    "cancellations": int(row['cancellations']),
+                    "cancellation_rate": float(row['cancellations'] / row['bookings']),
+                    "total_guests": int(row['adults'] + row['children']),
+                    "breakfast_count": int(row['breakfast_bookings']),
+                    **calendar_in_house(in_house, day - 1)
+                })
+            else:
+                daily_stats.append({
+                    "date": date.strftime("%Y-%m-%d"),
+                    "day": day,
+                    "bookings": 0,
+                    "cancellations": 0,
+                    "cancellation_rate": 0,
+                    "total_guests": 0,
+                    "breakfast_count": 0,
+                    **calendar_in_house(in_house, day - 1)
+                })
+        
+        month_bookings = int(daily['bookings'].sum())
+        month_cancellations = int(daily['cancellations'].sum())
         
         return {
             "year": year,
@@ -352,39 +810,94 @@ async def get_monthly_calendar(year: int, month: int):
             "month_name": month_name,
             "daily_statistics": daily_stats,
             "summary": {
-                "total_bookings": len(month_data),
-                "total_cancellations": int(month_data['predicted_is_canceled'].sum()),
-                "average_cancellation_rate": float(month_data['predicted_is_canceled'].mean()) if len(month_data) > 0 else 0
+                "total_bookings": month_bookings,
+                "total_cancellations": month_cancellations,
+                "average_cancellation_rate": float(month_cancellations / month_bookings) if month_bookings > 0 else 0
             }
         }
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+# 더미 개인정보 - 영국 기준 (실제 서비스에서는 실제 데이터 사용)
+DUMMY_NAMES = np.array([
+    "James Smith", "Emily Johnson", "Michael Brown", "Sarah Wilson", 
+    "David Jones", "Emma Davis", "Robert Miller", "Olivia Garcia",
+    "William Rodriguez", "Sophia Martinez", "Thomas Anderson", "Isabella Taylor",
+    "Charles Thomas", "Mia Jackson", "Christopher White", "Charlotte Harris"
+], dtype=object)
+DUMMY_PHONES = np.array([
+    "+44 20 7946 0958", "+44 161 496 0345", "+44 113 496 0123", "+44 117 496 0789",
+    "+44 121 496 0234", "+44 131 496 0567", "+44 151 496 0890", "+44 191 496 0345",
+    "+44 29 2018 0123", "+44 28 9018 0456", "+44 1234 567890", "+44 1632 960123",
+    "+44 114 496 0234", "+44 115 496 0567", "+44 116 496 0890", "+44 118 496 0123"
+], dtype=object)
+
+
+def serialize_bookings(page: pd.DataFrame, arrival_date: str) -> List[Dict]:
+    """예약 페이지를 컬럼 단위로 변환해 응답 레코드 목록 생성"""
+    row_ids = page.index.to_numpy(dtype=np.int64)
+    adults = page['adults'].to_numpy(dtype=np.int64)
+    children = page['children'].to_numpy(dtype=np.int64)
+    babies = page['babies'].to_numpy(dtype=np.int64)
+    special_requests = page['total_of_special_requests'].to_numpy(dtype=np.int64)
+    if 'predicted_probability' in page.columns:
+        probability = page['predicted_probability'].to_numpy(dtype=np.float64)
+    else:
+        probability = page['predicted_is_canceled'].to_numpy(dtype=np.float64)
+    
+    records = pd.DataFrame({
+        "reservation_id": "RES" + pd.Series(row_ids).astype(str).str.zfill(6),
+        "name": DUMMY_NAMES[row_ids % len(DUMMY_NAMES)],
+        "phone": DUMMY_PHONES[row_ids % len(DUMMY_PHONES)],
+        "adults": adults,
+        "children": children,
+        "babies": babies,
+        "total_guests": adults + children + babies,
+        "arrival_date": arrival_date,
+        "total_nights": (page['stays_in_weekend_nights'].to_numpy(dtype=np.int64) +
+                         page['stays_in_week_nights'].to_numpy(dtype=np.int64)),
+        "room_type": page['reserved_room_type'].to_numpy(dtype=object),
+        "meal": np.where(page['meal'].isin(BREAKFAST_MEALS).to_numpy(), "포함", "불포함"),
+        "special_requests": np.where(
+            special_requests > 0,
+            "특별 요청 " + special_requests.astype(str).astype(object) + "건",
+            "없음"
+        ),
+        "predicted_probability": probability,
+    })
+    return records.to_dict(orient="records")
+
+
 @app.get("/api/bookings/by-date")
-async def get_bookings_by_date_api(year: int, month: int, day: int, offset: int = 0, limit: int = 10):
-    """특정 날짜의 예약 목록 조회"""
-    if hotel_data is None:
-        raise HTTPException(status_code=500, detail="Data not loaded")
+async def get_bookings_by_date_api(year: int, month: int, day: int, offset: int = 0, limit: int = 10,
+                                   cursor: Optional[int] = None):
+    """
+    특정 날짜의 예약 목록 조회
+
+    cursor 에 직전 페이지의 next_cursor(마지막 예약의 행 번호)를 넘기면 해당 예약
+    바로 다음부터 조회한다(키셋 페이지네이션). cursor 가 없으면 offset 을 사용한다.
+    """
+    snapshot = require_data()
     
+    return await executor.run(compute_bookings_page, snapshot, year, month, day, offset, limit, cursor)
+
+def compute_bookings_page(snapshot: ServiceSnapshot, year: int, month: int, day: int, offset: int, limit: int,
+                          cursor: Optional[int]) -> Dict:
+    hotel_data, booking_index = snapshot.hotel_data, snapshot.booking_index
     try:
-        # 월 이름 변환
-        month_name = datetime(year, month, 1).strftime("%B")
-        
-        # 해당 날짜의 데이터 필터링
-        date_bookings = hotel_data[
-            (hotel_data['arrival_date_year'] == year) &
-            (hotel_data['arrival_date_month'] == month_name) &
-            (hotel_data['arrival_date_day_of_month'] == day)
-        ].copy()
-        
-        total_count = len(date_bookings)
+        # 해당 날짜의 위치 구간 조회
+        day_ordinal = date_to_ordinal(datetime(year, month, day))
+        with metrics.stage("/api/bookings/by-date", "filter"):
+            day_start, day_stop = booking_index.bounds(day_ordinal)
+        total_count = day_stop - day_start
         
         if total_count == 0:
             return {
                 "success": True,
                 "data": [],
                 "total_count": 0,
+                "next_cursor": None,
                 "statistics": {
                     "model_confidence": 0,
                     "total_expected_guests": 0,
@@ -392,95 +905,79 @@ async def get_bookings_by_date_api(year: int, month: int, day: int, offset: int
                 }
             }
         
-        # 페이지네이션 적용
-        paginated_bookings = date_bookings.iloc[offset:offset + limit]
+        # 페이지 시작 위치 결정 (cursor 우선, 없으면 offset)
+        if cursor is not None:
+            cursor_position = booking_index.position_of(cursor)
+            if not day_start <= cursor_position < day_stop:
+                raise ValueError(f"cursor {cursor} does not belong to {year}-{month:02d}-{day:02d}")
+            page_start = cursor_position + 1
+        else:
+            page_start = day_start + max(offset, 0)
+        page_stop = min(page_start + max(limit, 0), day_stop)
         
-        # 예약 데이터 변환
-        booking_list = []
-        for idx, booking in paginated_bookings.iterrows():
-            # 더미 개인정보 생성 - 영국 기준 (실제 서비스에서는 실제 데이터 사용)
-            dummy_names = [
-                "James Smith", "Emily Johnson", "Michael Brown", "Sarah Wilson", 
-                "David Jones", "Emma Davis", "Robert Miller", "Olivia Garcia",
-                "William Rodriguez", "Sophia Martinez", "Thomas Anderson", "Isabella Taylor",
-                "Charles Thomas", "Mia Jackson", "Christopher White", "Charlotte Harris"
-            ]
-            dummy_phones = [
-                "+44 20 7946 0958", "+44 161 496 0345", "+44 113 496 0123", "+44 117 496 0789",
-                "+44 121 496 0234", "+44 131 496 0567", "+44 151 496 0890", "+44 191 496 0345",
-                "+44 29 2018 0123", "+44 28 9018 0456", "+44 1234 567890", "+44 1632 960123",
-                "+44 114 496 0234", "+44 115 496 0567", "+44 116 496 0890", "+44 118 496 0123"
-            ]
-            
-            booking_data = {
-                "reservation_id": f"RES{idx:06d}",
-                "name": dummy_names[idx % len(dummy_names)],
-                "phone": dummy_phones[idx % len(dummy_phones)],
-                "adults": int(booking['adults']),
-                "children": int(booking['children']),
-                "babies": int(booking['babies']),
-                "total_guests": int(booking['adults'] + booking['children'] + booking['babies']),
-                "arrival_date": f"{year}-{month:02d}-{day:02d}",
-                "total_nights": int(booking['stays_in_weekend_nights'] + booking['stays_in_week_nights']),
-                "room_type": booking['reserved_room_type'],
-                "meal": "포함" if booking['meal'] in ['BB', 'HB', 'FB'] else "불포함",
-                "special_requests": f"특별 요청 {booking['total_of_special_requests']}건" if booking['total_of_special_requests'] > 0 else "없음",
-                "predicted_probability": float(booking['predicted_probability']) if 'predicted_probability' in booking else float(booking.get('predicted_is_canceled', 0))
-            }
-            booking_list.append(booking_data)
+        # 예약 데이터 변환 (정렬 프레임 슬라이스를 그대로 사용, 복사 없음)
+        page = hotel_data.iloc[page_start:page_stop]
+        with metrics.stage("/api/bookings/by-date", "serialize"):
+            booking_list = serialize_bookings(page, f"{year}-{month:02d}-{day:02d}")
+        next_cursor = int(booking_index.row_ids[page_stop - 1]) if page_start < page_stop < day_stop else None
         
         # 통계 계산
-        avg_cancellation_prob = float(date_bookings['predicted_probability'].mean()) if 'predicted_probability' in date_bookings.columns else float(date_bookings['predicted_is_canceled'].mean())
-        total_guests = int(date_bookings['adults'].sum() + date_bookings['children'].sum())
-        expected_guests = int(total_guests * (1 - avg_cancellation_prob))
-        
-        # 조식 준비 인원
-        breakfast_bookings = date_bookings[date_bookings['meal'].isin(['BB', 'HB', 'FB'])]
-        breakfast_guests = int(breakfast_bookings['adults'].sum() + breakfast_bookings['children'].sum())
-        expected_breakfast_guests = int(breakfast_guests * (1 - avg_cancellation_prob))
-        
-        statistics = {
-            "model_confidence": round((1 - avg_cancellation_prob) * 100, 1),
-            "total_expected_guests": expected_guests,
-            "breakfast_preparation_count": expected_breakfast_guests
-        }
+        with metrics.stage("/api/bookings/by-date", "aggregate"):
+            statistics = booking_day_statistics(hotel_data.iloc[day_start:day_stop])
         
         return {
             "success": True,
             "data": booking_list,
             "total_count": total_count,
+            "next_cursor": next_cursor,
             "statistics": statistics
         }
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+def booking_day_statistics(date_bookings: pd.DataFrame) -> Dict:
+    """예약 목록 화면의 하루 통계 (모델 신뢰도, 예상 고객 수, 조식 준비 인원)"""
+    avg_cancellation_prob = float(date_bookings['predicted_probability'].mean()) if 'predicted_probability' in date_bookings.columns else float(date_bookings['predicted_is_canceled'].mean())
+    total_guests = int(date_bookings['adults'].sum() + date_bookings['children'].sum())
+    expected_guests = int(total_guests * (1 - avg_cancellation_prob))
+    
+    # 조식 준비 인원
+    breakfast_bookings = date_bookings[date_bookings['meal'].isin(BREAKFAST_MEALS)]
+    breakfast_guests = int(breakfast_bookings['adults'].sum() + breakfast_bookings['children'].sum())
+    expected_breakfast_guests = int(breakfast_guests * (1 - avg_cancellation_prob))
+    
+    return {
+        "model_confidence": round((1 - avg_cancellation_prob) * 100, 1),
+        "total_expected_guests": expected_guests,
+        "breakfast_preparation_count": expected_breakfast_guests
+    }
+
 @app.get("/api/trends/weekly")
-async def get_weekly_trends():
+async def get_weekly_trends(request: Request):
     """주간 트렌드 분석"""
-    if hotel_data is None:
-        raise HTTPException(status_code=500, detail="Data not loaded")
-    
-    # 요일별 취소율 분석
-    hotel_data_copy = hotel_data.copy()
-    hotel_data_copy['arrival_date'] = pd.to_datetime(
-        hotel_data_copy['arrival_date_year'].astype(str) + '-' +
-        hotel_data_copy['arrival_date_month'] + '-' +
-        hotel_data_copy['arrival_date_day_of_month'].astype(str),
-        errors='coerce'
-    )
+    snapshot = require_data()
     
-    hotel_data_copy['weekday'] = hotel_data_copy['arrival_date'].dt.day_name()
+    key = response_cache.make_key("/api/trends/weekly", version=snapshot.version)
+    cached = cached_response(request, key)
+    if cached is not None:
+        return cached
+    
+    return store_response(request, key, await executor.run(compute_weekly_trends, snapshot))
+
+def compute_weekly_trends(snapshot: ServiceSnapshot) -> Dict:
+    # 요일별 취소율 분석 (큐브 칸을 요일로 재집계)
+    weekly = snapshot.booking_cube.rollup('weekday')
     
     weekday_stats = []
-    for weekday in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
-        weekday_data = hotel_data_copy[hotel_data_copy['weekday'] == weekday]
-        if len(weekday_data) > 0:
+    for weekday_num, weekday in enumerate(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']):
+        if weekday_num in weekly.index:
+            row = weekly.loc[weekday_num]
             weekday_stats.append({
                 "day": weekday,
-                "bookings": len(weekday_data),
-                "cancellation_rate": float(weekday_data['predicted_is_canceled'].mean()),
-                "avg_guests": float(weekday_data['adults'].mean() + weekday_data['children'].mean())
+                "bookings": int(row['bookings']),
+                "cancellation_rate": float(row['cancellations'] / row['bookings']),
+                "avg_guests": float((row['adults'] + row['children']) / row['bookings'])
             })
     
     return {"weekly_trends": weekday_stats}
@@ -0,0 +1,234 @@
+"""
+요청/처리 단계/모델 추론/로드 시간 측정 - Prometheus 텍스트 형식으로 /metrics 에 노출
+
+외부 클라이언트 라이브러리 없이 카운터/게이지/히스토그램만 구현한다.
+값은 프로세스별이므로 uvicorn 워커가 여럿이면 워커마다 따로 수집된다.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+# 지연 시간 히스토그램 기본 버킷 (초)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 로드 시간 버킷 (초)
+LOAD_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+# 추론 배치 크기 버킷 (건)
+BATCH_SIZE_BUCKETS = tuple(float(2 ** i) for i in range(17))
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """라벨 값 튜플별로 값을 보관하는 지표 공통 부분"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Sequence) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return tuple(str(label) for label in labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_samples(items))
+        return lines
+
+    def _render_samples(self, items) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1.0):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+
+class Gauge(_Metric):
+    """현재 값 게이지"""
+
+    kind = "gauge"
+
+    def set(self, value: float, *labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램 (버킷별 개수, 합계, 개수)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.bounds = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels):
+        key = self._key(labels)
+        # 버킷 위치 계산은 잠금 밖에서 (bisect 한 번)
+        i = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [[0] * (len(self.bounds) + 1), 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, *labels):
+        """with 블록 소요 시간(초) 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def count(self, *labels) -> int:
+        series = self._values.get(self._key(labels))
+        return series[2] if series else 0
+
+    def _render_samples(self, items) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.bounds + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """지표 모음 - render() 로 Prometheus 텍스트 형식 출력"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 서비스 전체에서 쓰는 기본 레지스트리와 지표
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route and status code", ["method", "route", "status"])
+http_errors = registry.counter(
+    "http_request_errors_total", "HTTP requests that failed with 5xx or an unhandled exception", ["method", "route"])
+http_latency = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"])
+stage_latency = registry.histogram(
+    "handler_stage_duration_seconds", "Time spent in a stage inside a handler", ["handler", "stage"])
+inference_batch_size = registry.histogram(
+    "model_inference_batch_size", "Bookings per model inference call", ["source"], BATCH_SIZE_BUCKETS)
+load_duration = registry.histogram(
+    "snapshot_load_duration_seconds", "Data/model load duration", ["part"], LOAD_BUCKETS)
+snapshot_version = registry.gauge(
+    "snapshot_version", "Version of the currently served data/model snapshot")
+snapshot_rows = registry.gauge(
+    "snapshot_booking_rows", "Booking rows in the current snapshot")
+response_cache_events = registry.gauge(
+    "response_cache_events", "Response cache hits/misses/evictions since start", ["event"])
+
+
+class RequestMetricsMiddleware:
+    """
+    라우트별 요청 수/오류 수/지연 시간 기록 ASGI 미들웨어
+
+    라우트 라벨은 라우터가 scope 에 넣은 경로 템플릿 (매칭 실패는 'unmatched') 이라
+    경로 파라미터 값이 늘어나도 시계열 수가 늘지 않는다. BaseHTTPMiddleware 와 달리
+    요청/응답을 감싸지 않고 응답 시작 메시지의 상태 코드만 읽는다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            http_latency.observe(time.perf_counter() - started, method, route_path)
+            http_requests.inc(method, route_path, status)
+            if status >= 500:
+                http_errors.inc(method, route_path)
+
+
+def stage(handler: str, name: str):
+    """핸들러 내부 단계(filter/aggregate/inference/serialize ...) 소요 시간 측정 with 블록"""
+    return stage_latency.time(handler, name)
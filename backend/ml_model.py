@@ -8,14 +8,74 @@ from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 import joblib
-from typing import Dict, List, Any
+import bisect
+import itertools
+import threading
+from typing import Dict, List, Any, Optional
+from cache import LRUCache
 import warnings
 warnings.filterwarnings('ignore')
 
+# GradientBoosting 트리 누적 합을 검증 단계 없이 계산하는 sklearn 내부 함수 (없으면 predict_proba 사용)
+try:
+    from sklearn.ensemble._gradient_boosting import predict_stages
+except ImportError:
+    predict_stages = None
+
+# Lead time 구간 경계와 고정 코드표
+# 구간 라벨의 알파벳 순서 코드이며, 구간 밖(0일 이하, 1000일 초과)은 마지막 코드를 쓴다.
+# 배치 구성과 무관하게 같은 lead_time 이 항상 같은 코드로 인코딩된다.
+LEAD_TIME_BINS = [0, 7, 30, 90, 180, 365, 1000]
+LEAD_TIME_LABELS = ['very_short', 'short', 'medium', 'long', 'very_long', 'extreme']
+LEAD_TIME_CODES = {label: code for code, label in enumerate(sorted(LEAD_TIME_LABELS))}
+LEAD_TIME_UNKNOWN_CODE = len(LEAD_TIME_LABELS)
+# pd.cut 구간 번호(-1 = 구간 밖) -> 고정 코드
+_LEAD_TIME_CODE_TABLE = np.array(
+    [LEAD_TIME_CODES[label] for label in LEAD_TIME_LABELS] + [LEAD_TIME_UNKNOWN_CODE]
+)
+
+
+def encode_lead_time(lead_time: pd.Series) -> np.ndarray:
+    """lead_time 을 고정 코드표로 구간 인코딩"""
+    bucket = pd.cut(lead_time, bins=LEAD_TIME_BINS, labels=LEAD_TIME_LABELS)
+    return _LEAD_TIME_CODE_TABLE[np.asarray(bucket.cat.codes)]
+
+
+def lead_time_code(lead_time) -> int:
+    """단일 lead_time 값의 구간 코드 (encode_lead_time 과 동일, pd.cut 의 (a, b] 구간)"""
+    bucket = bisect.bisect_left(LEAD_TIME_BINS, lead_time) - 1
+    if bucket >= len(LEAD_TIME_LABELS):
+        bucket = -1
+    return int(_LEAD_TIME_CODE_TABLE[bucket])
+
+
+# 학습/로드마다 새로 부여하는 모델 버전 (예측 캐시 키에 포함)
+_model_versions = itertools.count(1)
+
+
+def booking_cache_key(booking_data: Dict) -> tuple:
+    """예약 dict 의 정규화된 캐시 키 - 필드 순서와 무관, NaN 은 None 으로 통일"""
+    return tuple(sorted(
+        (field, None if value != value else value)
+        for field, value in booking_data.items()
+    ))
+
+
 class CancellationPredictor:
-    def __init__(self):
+    def __init__(self, cache_size: int = 4096, cache_ttl: Optional[float] = 300.0):
         self.model = None
+        self.model_version = 0
+        # 같은 예약을 반복 조회할 때 쓰는 단건 예측 캐시 (cache_size=0 이면 사용 안 함)
+        self.prediction_cache = LRUCache(cache_size, ttl=cache_ttl) if cache_size > 0 else None
         self.label_encoders = {}
+        # 컬럼별 (카테고리 Index, 'Unknown' 코드) - LabelEncoder 를 해시 조회표로 변환한 것
+        self.category_tables = {}
+        # 단건 예측용 컬럼별 (값 -> 코드 dict, 'Unknown' 코드)
+        self.category_codes = {}
+        # 단건 예측용 스레드별 특징 벡터 버퍼
+        self._row_buffers = threading.local()
+        # 단건 예측용 초기 raw 점수 (None 이면 predict_proba 사용)
+        self._online_init_score = None
         self.feature_columns = []
         self.categorical_columns = [
             'hotel', 'meal', 'country', 'market_segment', 
@@ -34,26 +94,37 @@ class CancellationPredictor:
         """데이터 전처리"""
         df = df.copy()
         
+        # 입력에 없는 컬럼은 기본값으로 채움 (BookingFeatures 에는 호텔/객실 타입/숙박일 수가 없음)
+        if not is_training:
+            for col in self.numerical_columns:
+                if col not in df.columns:
+                    df[col] = 0
+            for col in self.categorical_columns:
+                if col not in df.columns:
+                    df[col] = 'Unknown'
+        
         # NULL 값 처리
         df['children'] = df['children'].fillna(0)
         df['country'] = df['country'].fillna('Unknown')
-        df['agent'] = df['agent'].fillna(0)
-        df['company'] = df['company'].fillna(0)
+        for col in ['agent', 'company']:
+            if col in df.columns:
+                df[col] = df[col].fillna(0)
         
         # 카테고리 변수 인코딩
+        if is_training:
+            for col in self.categorical_columns:
+                if col in df.columns and col not in self.label_encoders:
+                    self.label_encoders[col] = LabelEncoder()
+                    # Unknown 값을 위한 처리
+                    unique_values = df[col].unique().tolist()
+                    unique_values.append('Unknown')
+                    self.label_encoders[col].fit(unique_values)
+            self.compile_category_tables()
+        
+        # 인코딩 적용 (학습 때 없던 값은 'Unknown' 코드)
         for col in self.categorical_columns:
             if col in df.columns:
-                if is_training:
-                    if col not in self.label_encoders:
-                        self.label_encoders[col] = LabelEncoder()
-                        # Unknown 값을 위한 처리
-                        unique_values = df[col].unique().tolist()
-                        unique_values.append('Unknown')
-                        self.label_encoders[col].fit(unique_values)
-                
-                # 인코딩 적용
-                df[col] = df[col].apply(lambda x: x if x in self.label_encoders[col].classes_ else 'Unknown')
-                df[col + '_encoded'] = self.label_encoders[col].transform(df[col])
+                df[col + '_encoded'] = self.encode_categorical(col, df[col])
         
         # 추가 특징 생성
         df['total_guests'] = df['adults'] + df['children'] + df['babies']
@@ -63,11 +134,8 @@ class CancellationPredictor:
         df['has_parking'] = (df['required_car_parking_spaces'] > 0).astype(int)
         df['is_family'] = ((df['children'] > 0) | (df['babies'] > 0)).astype(int)
         
-        # Lead time 구간화
-        df['lead_time_category'] = pd.cut(df['lead_time'], 
-                                          bins=[0, 7, 30, 90, 180, 365, 1000],
-                                          labels=['very_short', 'short', 'medium', 'long', 'very_long', 'extreme'])
-        df['lead_time_category_encoded'] = LabelEncoder().fit_transform(df['lead_time_category'])
+        # Lead time 구간화 (고정 코드표 사용)
+        df['lead_time_category_encoded'] = encode_lead_time(df['lead_time'])
         
         # ADR 이상치 처리
         df['adr'] = df['adr'].clip(upper=500)
@@ -82,6 +150,29 @@ class CancellationPredictor:
         
         return df[self.feature_columns] if not is_training else df
     
+    def compile_category_tables(self):
+        """학습된 LabelEncoder 를 카테고리 -> 코드 해시 조회표로 변환"""
+        self.category_tables = {}
+        for col, encoder in self.label_encoders.items():
+            # classes_ 는 정렬되어 있으므로 위치가 곧 LabelEncoder 코드
+            categories = pd.Index(encoder.classes_)
+            self.category_tables[col] = (categories, int(categories.get_loc('Unknown')))
+        self.compile_category_codes()
+    
+    def compile_category_codes(self):
+        """조회표를 단건 예측용 dict 로 변환"""
+        self.category_codes = {
+            col: ({value: code for code, value in enumerate(categories.tolist())}, unknown_code)
+            for col, (categories, unknown_code) in self.category_tables.items()
+        }
+    
+    def encode_categorical(self, col: str, values: pd.Series) -> np.ndarray:
+        """컬럼 전체를 한 번에 코드로 변환 (LabelEncoder.transform 과 동일한 코드)"""
+        categories, unknown_code = self.category_tables[col]
+        codes = categories.get_indexer(values)
+        codes[codes < 0] = unknown_code
+        return codes
+    
     def train(self, df: pd.DataFrame):
         """모델 학습"""
         print("Preprocessing data...")
@@ -108,6 +199,8 @@ class CancellationPredictor:
         )
         
         self.model.fit(X_train, y_train)
+        self.compile_online_path()
+        self.bump_model_version()
         
         # 성능 평가
         y_pred = self.model.predict(X_test)
@@ -140,20 +233,107 @@ class CancellationPredictor:
         }
     
     def predict_single(self, booking_data: Dict) -> float:
-        """단일 예약 취소 확률 예측"""
+        """
+        단일 예약 취소 확률 예측 (온라인 경로)
+
+        DataFrame/전처리 파이프라인을 거치지 않고 예약 dict 를 feature_columns 순서의
+        미리 할당된 벡터에 바로 채운다. 결과는 predict_batch 와 같은 확률이다.
+        같은 (모델 버전, 예약 필드) 조합은 prediction_cache 에서 바로 돌려준다.
+        """
         if self.model is None:
             raise ValueError("Model not trained yet")
         
-        # DataFrame으로 변환
-        df = pd.DataFrame([booking_data])
+        probability = self.cached_prediction(booking_data)
+        if probability is None:
+            probability = self.predict_row(booking_data)
+            self.cache_prediction(booking_data, probability)
+        return probability
+    
+    def cached_prediction(self, booking_data: Dict) -> Optional[float]:
+        """현재 모델 버전으로 캐시된 예약 확률 (없거나 캐시를 쓰지 않으면 None)"""
+        if self.prediction_cache is None:
+            return None
+        return self.prediction_cache.get((self.model_version, booking_cache_key(booking_data)))
+    
+    def cache_prediction(self, booking_data: Dict, probability: float):
+        """다른 경로(마이크로 배칭 등)에서 계산한 예약 확률을 단건 예측 캐시에 저장"""
+        if self.prediction_cache is not None:
+            self.prediction_cache.set((self.model_version, booking_cache_key(booking_data)), probability)
+    
+    def predict_row(self, booking_data: Dict) -> float:
+        """캐시를 거치지 않는 단건 예측 (호출자가 cached_prediction/cache_prediction 으로 캐시를 관리할 때)"""
+        if self.model is None:
+            raise ValueError("Model not trained yet")
         
-        # 전처리
-        processed_df = self.preprocess_data(df, is_training=False)
+        row = self.build_feature_row(booking_data)
+        if self._online_init_score is None:
+            return float(self.model.predict_proba(row)[0, 1])
         
-        # 예측
-        cancellation_prob = self.model.predict_proba(processed_df)[0, 1]
+        # 초기 점수 + 트리 누적 합 -> 시그모이드 (이진 log_loss 의 predict_proba 와 동일)
+        raw = self._row_buffers.raw
+        raw[0, 0] = self._online_init_score
+        predict_stages(self.model.estimators_, row, self.model.learning_rate, raw)
+        return float(1.0 / (1.0 + np.exp(-raw[0, 0])))
+    
+    def bump_model_version(self):
+        """모델 교체 시 호출 - 버전을 올리고 이전 모델의 예측 캐시를 비움"""
+        self.model_version = next(_model_versions)
+        if self.prediction_cache is not None:
+            self.prediction_cache.clear()
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """예측 캐시 적중/실패/제거 카운터"""
+        if self.prediction_cache is None:
+            return {"enabled": False, "model_version": self.model_version}
+        return {
+            "enabled": True,
+            "model_version": self.model_version,
+            "ttl": self.prediction_cache.ttl,
+            **self.prediction_cache.stats(),
+        }
+    
+    def compile_online_path(self):
+        """단건 예측 경로 준비 - 이진 GradientBoostingClassifier 면 트리 직접 평가"""
+        self._online_init_score = None
+        model = self.model
+        if (predict_stages is None or not isinstance(model, GradientBoostingClassifier)
+                or model.n_classes_ != 2 or model.loss not in ('log_loss', 'deviance')):
+            return
+        # decision_function = 초기 점수 + 트리 합 이므로 영벡터에서 트리 합을 빼서 초기 점수를 구함
+        zero = np.zeros((1, len(self.feature_columns)), dtype=np.float32)
+        stages = np.zeros((1, 1), dtype=np.float64)
+        predict_stages(model.estimators_, zero, model.learning_rate, stages)
+        self._online_init_score = float(model.decision_function(zero)[0] - stages[0, 0])
+    
+    def build_feature_row(self, booking_data: Dict) -> np.ndarray:
+        """예약 dict -> (1, n_features) float32 특징 벡터 (preprocess_data 와 같은 규칙)"""
+        row = getattr(self._row_buffers, 'row', None)
+        if row is None or row.shape[1] != len(self.feature_columns):
+            # sklearn 트리도 내부적으로 float32 로 변환하므로 같은 정밀도를 사용
+            row = np.empty((1, len(self.feature_columns)), dtype=np.float32)
+            self._row_buffers.row = row
+            self._row_buffers.raw = np.zeros((1, 1), dtype=np.float64)
+        
+        # 입력에 없는 값은 0, children 결측(None/NaN)도 0
+        values = {col: booking_data.get(col, 0) for col in self.numerical_columns}
+        children = values['children']
+        if children is None or children != children:
+            values['children'] = 0
+        values['adr'] = min(values['adr'], 500)
+        
+        for col, (codes, unknown_code) in self.category_codes.items():
+            values[col + '_encoded'] = codes.get(booking_data.get(col), unknown_code)
+        
+        values['total_guests'] = values['adults'] + values['children'] + values['babies']
+        values['total_stay_nights'] = values['stays_in_weekend_nights'] + values['stays_in_week_nights']
+        values['is_weekend_stay'] = int(values['stays_in_weekend_nights'] > 0)
+        values['has_special_requests'] = int(values['total_of_special_requests'] > 0)
+        values['has_parking'] = int(values['required_car_parking_spaces'] > 0)
+        values['is_family'] = int(values['children'] > 0 or values['babies'] > 0)
+        values['lead_time_category_encoded'] = lead_time_code(values['lead_time'])
         
-        return cancellation_prob
+        row[0] = [values[col] for col in self.feature_columns]
+        return row
     
     def predict_batch(self, df: pd.DataFrame) -> np.ndarray:
         """배치 예측"""
@@ -173,6 +353,7 @@ class CancellationPredictor:
         model_data = {
             'model': self.model,
             'label_encoders': self.label_encoders,
+            'category_tables': self.category_tables,
             'feature_columns': self.feature_columns,
             'categorical_columns': self.categorical_columns,
             'numerical_columns': self.numerical_columns
@@ -188,4 +369,12 @@ class CancellationPredictor:
         self.feature_columns = model_data['feature_columns']
         self.categorical_columns = model_data['categorical_columns']
         self.numerical_columns = model_data['numerical_columns']
+        # 조회표가 없는 이전 형식의 모델 파일은 로드 시 변환
+        self.category_tables = model_data.get('category_tables') or {}
+        if self.category_tables:
+            self.compile_category_codes()
+        else:
+            self.compile_category_tables()
+        self.compile_online_path()
+        self.bump_model_version()
         print(f"Model loaded from {filepath}")
@@ -0,0 +1,157 @@
+"""
+여러 uvicorn 워커가 공유하는 메모리 매핑(.npy) 컬럼 저장소
+
+한 프로세스가 load_hotel_data 결과를 컬럼별 .npy 파일(카테고리는 코드 배열)로 한 번 저장하고,
+각 워커는 np.load(mmap_mode='r') 로 붙어서 복사 없이 읽는다. 페이지는 OS 페이지 캐시에서
+공유되므로 워커 수가 늘어도 예약 데이터 메모리는 한 벌만 쓴다.
+
+저장소 디렉터리 구성:
+    CURRENT            현재 세대 디렉터리 이름
+    gen-<ns>/          세대별 컬럼 파일 + manifest.json
+    .lock              생성 시 워커 간 배타 잠금
+"""
+import json
+import os
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from database import load_hotel_data, data_source_path, source_mtime, row_positions
+
+# 파일 잠금 (Windows 등 fcntl 이 없으면 잠금 없이 동작)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+STORE_FORMAT = 1
+ROW_ID_FILE = "row_id.npy"
+POSITIONS_FILE = "row_positions.npy"
+
+
+@contextmanager
+def store_lock(store_dir: Path):
+    """저장소 생성/갱신 배타 잠금 (다른 워커는 끝날 때까지 대기)"""
+    store_dir.mkdir(parents=True, exist_ok=True)
+    with open(store_dir / ".lock", "w") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def source_key() -> Dict[str, Any]:
+    """저장소가 만들어진 원본 식별 정보 - 경로, 수정 시각, 기간 설정"""
+    path = data_source_path()
+    return {
+        "source": str(path.resolve()),
+        "source_mtime": source_mtime(path),
+        "start_month": os.getenv("HOTEL_DATA_START_MONTH") or None,
+        "end_month": os.getenv("HOTEL_DATA_END_MONTH") or None,
+    }
+
+
+def read_manifest(store_dir: Path) -> Optional[Dict[str, Any]]:
+    """현재 세대의 manifest (없으면 None)"""
+    try:
+        generation = (store_dir / "CURRENT").read_text().strip()
+        manifest = json.loads((store_dir / generation / "manifest.json").read_text())
+    except (OSError, ValueError):
+        return None
+    manifest["path"] = str(store_dir / generation)
+    return manifest
+
+
+def write_store(df: pd.DataFrame, store_dir: Path, key: Dict[str, Any]) -> Path:
+    """
+    프레임을 새 세대 디렉터리에 컬럼별 .npy 로 저장하고 CURRENT 를 교체
+
+    이전 세대 파일은 지우지만, 이미 매핑한 워커는 파일이 지워져도 기존 매핑으로 계속 읽는다.
+    """
+    store_dir.mkdir(parents=True, exist_ok=True)
+    generation = f"gen-{time.time_ns()}"
+    tmp_dir = store_dir / f".tmp-{generation}"
+    tmp_dir.mkdir()
+
+    columns = []
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        filename = f"col{i}.npy"
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            np.save(tmp_dir / filename, values.cat.codes.to_numpy())
+            columns.append({"name": col, "file": filename, "categories": values.cat.categories.tolist()})
+        else:
+            np.save(tmp_dir / filename, values.to_numpy())
+            columns.append({"name": col, "file": filename})
+
+    row_ids = df.index.to_numpy(dtype=np.int64)
+    np.save(tmp_dir / ROW_ID_FILE, row_ids)
+    np.save(tmp_dir / POSITIONS_FILE, row_positions(row_ids))
+
+    manifest = {"format": STORE_FORMAT, "rows": len(df), "columns": columns, **key}
+    (tmp_dir / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False))
+    os.replace(tmp_dir, store_dir / generation)
+
+    current_tmp = store_dir / "CURRENT.tmp"
+    current_tmp.write_text(generation)
+    os.replace(current_tmp, store_dir / "CURRENT")
+
+    for old in store_dir.glob("gen-*"):
+        if old.name != generation:
+            shutil.rmtree(old, ignore_errors=True)
+    return store_dir / generation
+
+
+def open_store(store_dir: Path) -> Tuple[pd.DataFrame, np.ndarray]:
+    """현재 세대를 읽기 전용 메모리 매핑으로 열어 (프레임, 행 위치 배열) 반환 - 복사 없음"""
+    manifest = read_manifest(store_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"Shared booking store not found: {store_dir}")
+    path = Path(manifest["path"])
+
+    data = {}
+    for column in manifest["columns"]:
+        values = np.load(path / column["file"], mmap_mode="r")
+        if "categories" in column:
+            values = pd.Categorical.from_codes(values, categories=column["categories"], validate=False)
+        data[column["name"]] = values
+    index = pd.Index(np.load(path / ROW_ID_FILE, mmap_mode="r"), copy=False)
+    df = pd.DataFrame(data, index=index, copy=False)
+    return df, np.load(path / POSITIONS_FILE, mmap_mode="r")
+
+
+def load_shared_hotel_data(store_dir) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    공유 저장소에서 예약 데이터를 열기 - 원본이 바뀌었거나 저장소가 없으면 먼저 생성
+
+    여러 워커가 동시에 호출해도 잠금으로 한 워커만 load_hotel_data 를 실행하고,
+    나머지는 만들어진 저장소에 붙기만 한다.
+    """
+    store_dir = Path(store_dir)
+    with store_lock(store_dir):
+        key = source_key()
+        manifest = read_manifest(store_dir)
+        current = manifest is not None and manifest.get("format") == STORE_FORMAT and all(
+            manifest.get(field) == value for field, value in key.items()
+        )
+        if not current:
+            print(f"Building shared booking store in {store_dir}...")
+            write_store(load_hotel_data(), store_dir, key)
+        df, positions = open_store(store_dir)
+    print(f"Attached to shared booking store ({len(df)} rows, memory-mapped)")
+    return df, positions
+
+
+if __name__ == "__main__":
+    # 워커 시작 전에 저장소를 미리 만들기: python shared_store.py [저장소 디렉터리]
+    target = sys.argv[1] if len(sys.argv) > 1 else os.getenv("SHARED_STORE_DIR", "shared_store")
+    load_shared_hotel_data(target)
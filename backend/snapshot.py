@@ -0,0 +1,226 @@
+"""
+서비스 스냅샷(데이터, 인덱스, 큐브, 모델) 생성과 원자적 교체 - 재시작 없는 핫 리로드
+"""
+import asyncio
+import itertools
+import os
+import resource
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from database import (load_hotel_data, build_booking_index, build_booking_cube, build_booking_occupancy,
+                      data_source_path, source_mtime)
+from ml_model import CancellationPredictor
+from shared_store import load_shared_hotel_data
+import metrics
+
+
+class ServiceSnapshot:
+    """
+    한 시점의 데이터/인덱스/큐브/재실 인원/모델 묶음
+
+    만든 뒤에는 바꾸지 않는다. 요청 처리 함수는 시작할 때 현재 스냅샷을 한 번 잡고
+    끝까지 그것만 쓰므로, 처리 중에 새 스냅샷으로 교체되어도 이전 스냅샷으로 끝까지 응답한다.
+    """
+
+    def __init__(self, version: int = 0, hotel_data=None, booking_index=None, booking_cube=None,
+                 booking_occupancy=None, model_predictor=None, data_mtime: Optional[float] = None, model_mtime: Optional[float] = None):
+        self.version = version
+        self.hotel_data = hotel_data
+        self.booking_index = booking_index
+        self.booking_cube = booking_cube
+        self.booking_occupancy = booking_occupancy
+        self.model_predictor = model_predictor
+        self.data_mtime = data_mtime
+        self.model_mtime = model_mtime
+
+    def replace(self, version: int, **changes) -> "ServiceSnapshot":
+        """일부 구성 요소만 바꾼 새 스냅샷"""
+        fields = dict(self.__dict__, version=version)
+        fields.update(changes)
+        return ServiceSnapshot(**fields)
+
+
+def current_rss_bytes() -> int:
+    """현재 프로세스 RSS (Linux /proc, 그 외에는 최대 RSS 로 대체)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class PeakMemorySampler:
+    """with 블록 동안 RSS 를 주기적으로 샘플링해 최대값 기록"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.start_bytes = 0
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start_bytes = self.peak_bytes = current_rss_bytes()
+        self._thread = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, current_rss_bytes())
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_bytes = max(self.peak_bytes, current_rss_bytes())
+
+
+class SnapshotManager:
+    """
+    스냅샷 생성/교체 관리
+
+    reload() 는 새 스냅샷 전체를 요청 경로 밖(스레드)에서 만든 뒤 current 참조 하나를
+    바꿔서 교체한다. 리로드는 한 번에 하나씩 실행되며, 교체 후 on_swap(snapshot, model_changed)
+    콜백으로 응답 캐시 무효화/모델 워커 재시작을 알린다.
+    """
+
+    def __init__(self, model_path: Path, on_swap: Optional[Callable[[ServiceSnapshot, bool], None]] = None,
+                 shared_store_dir: Optional[str] = None):
+        self.model_path = Path(model_path)
+        # 지정하면 예약 데이터를 워커 간 공유 메모리 매핑 저장소에서 읽음
+        self.shared_store_dir = shared_store_dir
+        self.on_swap = on_swap
+        self.current = ServiceSnapshot()
+        self._versions = itertools.count(1)
+        self._lock = asyncio.Lock()
+        self.reloads = 0
+        self.failures = 0
+        self.last_reload: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+
+    def _build_data(self) -> Dict[str, Any]:
+        """데이터 로드 및 인덱스/큐브/재실 인원 생성 (수정 시각은 읽기 전에 기록 - 읽는 중 바뀌면 다음 감시에서 다시 로드)"""
+        data_mtime = source_mtime(data_source_path())
+        print("Loading hotel data...")
+        if self.shared_store_dir:
+            data, positions = load_shared_hotel_data(self.shared_store_dir)
+        else:
+            data, positions = load_hotel_data(), None
+        return {
+            "hotel_data": data,
+            "booking_index": build_booking_index(data, positions),
+            "booking_cube": build_booking_cube(data),
+            "booking_occupancy": build_booking_occupancy(data),
+            "data_mtime": data_mtime,
+        }
+
+    def _build_model(self, hotel_data) -> Dict[str, Any]:
+        """저장된 모델 로드 (없으면 hotel_data 로 학습 후 저장)"""
+        print("Initializing ML model...")
+        predictor = CancellationPredictor(
+            cache_size=int(os.getenv("PREDICTION_CACHE_SIZE", "4096")),
+            cache_ttl=float(os.getenv("PREDICTION_CACHE_TTL", "300")) or None,
+        )
+
+        if self.model_path.exists():
+            print("Loading pre-trained model...")
+            model_mtime = self.model_path.stat().st_mtime
+            predictor.load_model(str(self.model_path))
+        else:
+            if hotel_data is None:
+                raise RuntimeError("Cannot train a model before the data is loaded")
+            print("Training new model...")
+            predictor.train(hotel_data)
+            self.model_path.parent.mkdir(exist_ok=True)
+            predictor.save_model(str(self.model_path))
+            model_mtime = self.model_path.stat().st_mtime
+        return {"model_predictor": predictor, "model_mtime": model_mtime}
+
+    def _build(self, data: bool, model: bool) -> Dict[str, Any]:
+        changes = {}
+        if data:
+            with metrics.load_duration.time("data"):
+                changes.update(self._build_data())
+        if model:
+            with metrics.load_duration.time("model"):
+                changes.update(self._build_model(changes.get("hotel_data", self.current.hotel_data)))
+        return changes
+
+    async def reload(self, data: bool = True, model: bool = True, reason: str = "admin") -> Dict[str, Any]:
+        """
+        새 스냅샷을 만들어 원자적으로 교체하고 소요 시간/최대 메모리 리포트 반환
+
+        실패하면 현재 스냅샷을 그대로 두고 예외를 다시 던진다.
+        """
+        async with self._lock:
+            started = time.perf_counter()
+            try:
+                with PeakMemorySampler() as memory:
+                    changes = await asyncio.to_thread(self._build, data, model)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                raise
+
+            snapshot = self.current.replace(next(self._versions), **changes)
+            self.current = snapshot
+            self.reloads += 1
+            self.last_error = None
+            if self.on_swap is not None:
+                self.on_swap(snapshot, model)
+
+            self.last_reload = {
+                "version": snapshot.version,
+                "reason": reason,
+                "reloaded": [part for part, flag in (("data", data), ("model", model)) if flag],
+                "duration_s": round(time.perf_counter() - started, 3),
+                "rss_before_mb": round(memory.start_bytes / 1024 ** 2, 1),
+                "peak_rss_mb": round(memory.peak_bytes / 1024 ** 2, 1),
+                "peak_increase_mb": round((memory.peak_bytes - memory.start_bytes) / 1024 ** 2, 1),
+                "rows": 0 if snapshot.hotel_data is None else int(len(snapshot.hotel_data)),
+                "finished_at": time.time(),
+            }
+            print(f"Snapshot v{snapshot.version} ready ({reason}): {self.last_reload['reloaded']} "
+                  f"in {self.last_reload['duration_s']}s, peak RSS {self.last_reload['peak_rss_mb']} MB")
+            return self.last_reload
+
+    def changed_sources(self):
+        """(데이터 변경 여부, 모델 변경 여부) - 원본 수정 시각을 현재 스냅샷과 비교"""
+        snapshot = self.current
+        try:
+            data_changed = (snapshot.data_mtime is not None
+                            and source_mtime(data_source_path()) != snapshot.data_mtime)
+        except FileNotFoundError:
+            data_changed = False
+        model_changed = (snapshot.model_mtime is not None and self.model_path.exists()
+                         and self.model_path.stat().st_mtime != snapshot.model_mtime)
+        return data_changed, model_changed
+
+    async def watch(self, interval: float):
+        """interval 초마다 원본 수정 시각을 확인해 바뀐 부분만 다시 로드"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                data_changed, model_changed = await asyncio.to_thread(self.changed_sources)
+                if data_changed or model_changed:
+                    await self.reload(data=data_changed, model=model_changed, reason="file_change")
+            except Exception as e:
+                print(f"Snapshot reload failed: {e}")
+
+    def status(self) -> Dict[str, Any]:
+        snapshot = self.current
+        return {
+            "version": snapshot.version,
+            "data_loaded": snapshot.hotel_data is not None,
+            "model_loaded": snapshot.model_predictor is not None,
+            "data_mtime": snapshot.data_mtime,
+            "model_mtime": snapshot.model_mtime,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "reloading": self._lock.locked(),
+            "last_reload": self.last_reload,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,69 @@
+"""
+서버 시작 단계(데이터 로드, 모델 로드/학습 ...) 진행 상황 추적
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+PENDING = "pending"
+RUNNING = "running"
+READY = "ready"
+FAILED = "failed"
+
+
+class StartupPhases:
+    """
+    이름 붙은 시작 단계들의 상태와 소요 시간
+
+    각 단계는 pending -> running -> ready/failed 순으로 바뀌며,
+    /healthz, /readyz 는 snapshot() 을 그대로 응답한다.
+    """
+
+    def __init__(self, names: List[str]):
+        self.names = list(names)
+        self._lock = threading.Lock()
+        self._phases = {name: {"status": PENDING} for name in self.names}
+        self.created_at = time.time()
+
+    @contextmanager
+    def track(self, name: str):
+        """with 블록 동안 단계를 running 으로 두고, 끝나면 ready(예외 시 failed) 로 기록"""
+        started = time.perf_counter()
+        with self._lock:
+            self._phases[name] = {"status": RUNNING, "started_at": time.time()}
+        try:
+            yield
+        except Exception as e:
+            self._finish(name, FAILED, started, error=f"{type(e).__name__}: {e}")
+            raise
+        self._finish(name, READY, started)
+
+    def _finish(self, name: str, status: str, started: float, error: Optional[str] = None):
+        with self._lock:
+            phase = self._phases[name]
+            phase["status"] = status
+            phase["duration_s"] = round(time.perf_counter() - started, 3)
+            if error is not None:
+                phase["error"] = error
+
+    def status(self, name: str) -> str:
+        return self._phases[name]["status"]
+
+    def is_ready(self, name: Optional[str] = None) -> bool:
+        """단계(없으면 전체 단계)가 모두 ready 인지"""
+        names = [name] if name else self.names
+        return all(self._phases[n]["status"] == READY for n in names)
+
+    def error(self, name: str) -> Optional[str]:
+        return self._phases[name].get("error")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """단계별 상태/소요 시간과 전체 준비 여부"""
+        with self._lock:
+            phases = {name: dict(phase) for name, phase in self._phases.items()}
+        return {
+            "ready": all(phase["status"] == READY for phase in phases.values()),
+            "uptime_s": round(time.time() - self.created_at, 3),
+            "phases": phases,
+        }
@@ -0,0 +1,54 @@
+"""
+백엔드 테스트 공통 설정 - backend 디렉터리를 import 경로에 넣고 합성 예약 데이터/학습된 모델을 제공
+
+    cd backend
+    python -m pytest -q tests
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.bench_api import make_synthetic_results, start_app, write_results  # noqa: E402
+from ml_model import CancellationPredictor  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def synthetic_bookings():
+    """예측 결과 형식의 합성 예약 20,000건 (시드 고정)"""
+    return make_synthetic_results(20_000, days=365, seed=7)
+
+
+@pytest.fixture(scope="session")
+def trained_predictor(synthetic_bookings):
+    predictor = CancellationPredictor()
+    predictor.train(synthetic_bookings)
+    return predictor
+
+
+@pytest.fixture(scope="session")
+def app_main(synthetic_bookings, tmp_path_factory):
+    """합성 데이터 스냅샷과 그 표본으로 학습한 모델을 로드한 main 모듈 (백그라운드 감시 없음)"""
+    work_dir = tmp_path_factory.mktemp("backend")
+    results_dir = work_dir / "results"
+    write_results(synthetic_bookings, results_dir)
+    os.environ["HOTEL_RESULTS_DIR"] = str(results_dir)
+    os.environ["RELOAD_WATCH_INTERVAL"] = "0"
+    for name in ("SHARED_STORE_DIR", "HOTEL_DATA_START_MONTH", "HOTEL_DATA_END_MONTH", "MICROBATCH_ENABLED"):
+        os.environ.pop(name, None)
+
+    import main
+    asyncio.run(start_app(main, work_dir, train_rows=5_000, seed=7))
+    yield main
+    main.executor.shutdown()
+
+
+@pytest.fixture
+def client(app_main):
+    from fastapi.testclient import TestClient
+    return TestClient(app_main.app)
@@ -0,0 +1,90 @@
+"""MicroBatcher - 창 만료/최대 크기 처리, 모델별 묶음, 오류 전달, 배치 크기 분포"""
+import asyncio
+
+import numpy as np
+import pytest
+
+from batching import MicroBatcher
+
+
+class Scorer:
+    """예약의 lead_time / 1000 을 확률로 돌려주고 호출마다 (모델, 배치 크기) 기록"""
+
+    def __init__(self, result=None, error=None):
+        self.calls = []
+        self.result = result
+        self.error = error
+
+    async def __call__(self, model, bookings):
+        self.calls.append((model, len(bookings)))
+        if self.error is not None:
+            raise self.error
+        if self.result is not None:
+            return self.result
+        return bookings['lead_time'].to_numpy() / 1000
+
+
+def submit_all(batcher, lead_times, model="m1", timeout=1.0):
+    async def run():
+        tasks = [batcher.submit({"lead_time": lead_time}, model) for lead_time in lead_times]
+        return await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout)
+    return asyncio.run(run())
+
+
+def test_flushes_when_window_expires():
+    scorer = Scorer()
+    batcher = MicroBatcher(scorer, window_ms=20, max_batch_size=64)
+    assert submit_all(batcher, [100, 200, 300]) == [0.1, 0.2, 0.3]
+    assert scorer.calls == [("m1", 3)]
+
+
+def test_flushes_at_max_batch_size_without_waiting_for_window():
+    scorer = Scorer()
+    # 창이 끝날 때까지 기다리면 timeout 안에 끝나지 않음
+    batcher = MicroBatcher(scorer, window_ms=60_000, max_batch_size=4)
+    assert submit_all(batcher, [1, 2, 3, 4], timeout=1.0) == [0.001, 0.002, 0.003, 0.004]
+    assert scorer.calls == [("m1", 4)]
+
+
+def test_groups_requests_by_model():
+    scorer = Scorer()
+    batcher = MicroBatcher(scorer, window_ms=20, max_batch_size=64)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.submit({"lead_time": 100}, "old"),
+            batcher.submit({"lead_time": 200}, "new"),
+            batcher.submit({"lead_time": 300}, "old"),
+        )
+
+    assert asyncio.run(run()) == [0.1, 0.2, 0.3]
+    assert sorted(scorer.calls) == [("new", 1), ("old", 2)]
+
+
+def test_error_is_delivered_to_every_caller():
+    batcher = MicroBatcher(Scorer(error=RuntimeError("model failed")), window_ms=5)
+    results = submit_all(batcher, [1, 2, 3])
+    assert all(isinstance(r, RuntimeError) and str(r) == "model failed" for r in results)
+    assert batcher.stats()["errors"] == 1
+
+
+@pytest.mark.parametrize("result", [np.array([0.5]), np.array([0.1, 0.2, 0.3, 0.4])])
+def test_wrong_result_length_fails_every_caller_instead_of_hanging(result):
+    batcher = MicroBatcher(Scorer(result=result), window_ms=5)
+    results = submit_all(batcher, [1, 2, 3])
+    assert all(isinstance(r, ValueError) for r in results)
+    assert batcher.stats()["errors"] == 1
+
+
+def test_batch_size_histogram_counts():
+    batcher = MicroBatcher(Scorer(), window_ms=5, max_batch_size=8)
+    for size in (1, 3, 8, 8):
+        submit_all(batcher, list(range(size)))
+
+    stats = batcher.stats()
+    assert stats["requests"] == 20
+    assert stats["batches"] == 4
+    assert stats["avg_batch_size"] == 5.0
+    assert stats["batch_size_histogram"] == {
+        "le_1": 1, "le_2": 0, "le_4": 1, "le_8": 2, "le_16": 0,
+    }
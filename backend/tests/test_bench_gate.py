@@ -0,0 +1,36 @@
+"""API 벤치마크 기준선 비교 (compare) - 지표 악화와 오류 증가 검출"""
+from benchmarks.bench_api import compare
+
+
+def report(**cases) -> dict:
+    return {"results": {case: {"errors": 0, "throughput_rps": 100.0, "p95_ms": 10.0, **values}
+                        for case, values in cases.items()}}
+
+
+def test_within_threshold_passes():
+    baseline = report(date={})
+    assert compare(report(date={"throughput_rps": 95.0, "p95_ms": 10.5}), baseline, 0.10,
+                   ["throughput_rps", "p95_ms"]) == []
+
+
+def test_slower_case_fails():
+    regressions = compare(report(date={"p95_ms": 12.0}), report(date={}), 0.10, ["throughput_rps", "p95_ms"])
+    assert [(case, metric) for case, metric, *_ in regressions] == [("date", "p95_ms")]
+
+
+def test_new_errors_fail_even_when_faster():
+    # 실패 응답이 빨라 처리량/지연은 좋아진 경우
+    current = report(date={"errors": 5, "throughput_rps": 300.0, "p95_ms": 2.0})
+    regressions = compare(current, report(date={}), 0.10, ["throughput_rps", "p95_ms"])
+    assert [(case, metric, before, after) for case, metric, before, after, _ in regressions] == \
+        [("date", "errors", 0, 5)]
+
+
+def test_errors_compared_to_baseline_errors():
+    assert compare(report(date={"errors": 2}), report(date={"errors": 2}), 0.10, ["p95_ms"]) == []
+    assert len(compare(report(date={"errors": 3}), report(date={"errors": 2}), 0.10, ["p95_ms"])) == 1
+
+
+def test_errors_in_case_missing_from_baseline_fail():
+    regressions = compare(report(new_case={"errors": 1}), report(date={}), 0.10, ["p95_ms"])
+    assert [(case, metric) for case, metric, *_ in regressions] == [("new_case", "errors")]
@@ -0,0 +1,18 @@
+"""/api/predict/date 조식 권장 수량은 예약별 취소 확률로 계산한 조식 인원 분포 기준"""
+from database import ordinal_to_date
+
+
+def test_breakfast_recommendation_uses_headcount_distribution(client, app_main):
+    df = app_main.snapshots.current.hotel_data
+    day = ordinal_to_date(int(df['arrival_day'].value_counts().idxmax())).isoformat()
+    response = client.post("/api/predict/date", json={"date": day})
+    assert response.status_code == 200
+    body = response.json()
+    details = body["details"]
+    headcount = details["breakfast_headcount"]
+
+    assert body["breakfast_recommendation"] == headcount["prep_quantity"]
+    assert details["expected_breakfast_guests"] == round(headcount["mean"])
+    # 평균 취소 확률 하나로 계산한 이전 값은 별도 필드로만
+    assert "legacy_expected_breakfast_guests" in details
+    assert headcount["p10"] <= headcount["p50"] <= headcount["p90"]
@@ -0,0 +1,27 @@
+"""재실 기준 조식 인원과 도착 기준 조식 인원은 서로 다른 필드 이름"""
+from database import ordinal_to_date
+
+
+def busiest_day(app_main) -> str:
+    df = app_main.snapshots.current.hotel_data
+    return ordinal_to_date(int(df['arrival_day'].value_counts().idxmax())).isoformat()
+
+
+def test_calendar_uses_in_house_breakfast_field(client, app_main):
+    year, month, _ = busiest_day(app_main).split("-")
+    response = client.get("/api/calendar/monthly", params={"year": int(year), "month": int(month)})
+    assert response.status_code == 200
+    for entry in response.json()["daily_statistics"]:
+        assert "expected_in_house_breakfast_guests" in entry
+        assert "expected_breakfast_guests" not in entry
+        assert entry["expected_in_house_breakfast_guests"] <= entry["in_house_breakfast_guests"]
+
+
+def test_date_prediction_keeps_arrival_breakfast_field(client, app_main):
+    response = client.post("/api/predict/date", json={"date": busiest_day(app_main), "hotel_type": "Resort Hotel"})
+    assert response.status_code == 200
+    details = response.json()["details"]
+    # 도착 기준 (그날 도착하는 예약) 과 재실 기준 (그날 밤 묵는 예약) 을 각각 다른 이름으로
+    assert "expected_breakfast_guests" in details
+    assert "expected_in_house_breakfast_guests" in details["in_house"]
+    assert "expected_breakfast_guests" not in details["in_house"]
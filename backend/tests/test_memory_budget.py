@@ -0,0 +1,32 @@
+"""서비스용 예약 프레임의 예약 10만 건당 메모리가 MEMORY_BUDGET_MB_PER_100K 이내"""
+from pathlib import Path
+
+import pytest
+
+from benchmarks.bench_api import write_results
+from database import MEMORY_BUDGET_MB_PER_100K, load_hotel_data, memory_report
+
+REPO_RESULTS_DIR = Path(__file__).resolve().parents[2] / "ML" / "data" / "results"
+
+
+def assert_within_budget(df):
+    report = memory_report(df)
+    assert report['rows'] > 0
+    assert report['mb_per_100k'] <= MEMORY_BUDGET_MB_PER_100K, (
+        f"{report['mb_per_100k']:.2f} MB per 100k bookings exceeds the "
+        f"{MEMORY_BUDGET_MB_PER_100K:.0f} MB budget; largest columns: "
+        f"{sorted(report['columns_mb'].items(), key=lambda item: -item[1])[:5]}"
+    )
+    assert report['within_budget']
+
+
+def test_synthetic_bookings_within_budget(synthetic_bookings, tmp_path, monkeypatch):
+    write_results(synthetic_bookings, tmp_path)
+    monkeypatch.setenv("HOTEL_RESULTS_DIR", str(tmp_path))
+    assert_within_budget(load_hotel_data())
+
+
+@pytest.mark.skipif(not REPO_RESULTS_DIR.exists(), reason="ML/data/results 예측 결과가 없음")
+def test_repository_results_within_budget(monkeypatch):
+    monkeypatch.setenv("HOTEL_RESULTS_DIR", str(REPO_RESULTS_DIR))
+    assert_within_budget(load_hotel_data())
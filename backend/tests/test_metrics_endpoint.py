@@ -0,0 +1,73 @@
+"""GET /metrics - 계측된 라우트를 호출한 뒤 Prometheus 텍스트 출력 확인"""
+import re
+
+import pytest
+
+SAMPLE = re.compile(r'^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(?P<labels>[^}]*)\})? (?P<value>\S+)$')
+
+
+def scrape(client) -> tuple:
+    """(content-type, 전체 텍스트, {(이름, 라벨 frozenset): 값})"""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    samples = {}
+    for line in response.text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = SAMPLE.match(line)
+        assert match, f"malformed sample line: {line!r}"
+        labels = frozenset(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', match["labels"] or ""))
+        samples[(match["name"], labels)] = float(match["value"])
+    return response.headers["content-type"], response.text, samples
+
+
+def series(samples: dict, name: str, **labels) -> float:
+    return samples.get((name, frozenset(labels.items())), 0.0)
+
+
+@pytest.fixture
+def available_date(app_main) -> str:
+    return app_main.snapshots.current.booking_index.available_dates()[0]
+
+
+def test_metrics_exposition(client, available_date):
+    _, _, before = scrape(client)
+
+    for _ in range(3):
+        assert client.post("/api/predict/date", json={"date": available_date}).status_code == 200
+    year, month = (int(part) for part in available_date.split("-")[:2])
+    assert client.get("/api/calendar/monthly", params={"year": year, "month": month}).status_code == 200
+    assert client.get("/no/such/route").status_code == 404
+
+    content_type, text, after = scrape(client)
+    assert content_type.startswith("text/plain")
+    assert "version=0.0.4" in content_type
+
+    for name, kind in [("http_requests_total", "counter"), ("http_request_errors_total", "counter"),
+                       ("http_request_duration_seconds", "histogram"),
+                       ("handler_stage_duration_seconds", "histogram"), ("snapshot_version", "gauge")]:
+        assert f"# HELP {name} " in text
+        assert f"# TYPE {name} {kind}" in text
+
+    # 요청 카운터는 라우트 템플릿 라벨로, 매칭되지 않은 경로는 'unmatched'
+    date_route = dict(method="POST", route="/api/predict/date")
+    assert series(after, "http_requests_total", status="200", **date_route) - \
+        series(before, "http_requests_total", status="200", **date_route) == 3
+    assert series(after, "http_requests_total", method="GET", route="unmatched", status="404") >= 1
+    assert not any("/no/such/route" in "".join(v for _, v in labels) for _, labels in after)
+
+    # 히스토그램: 누적 버킷이 단조 증가하고 +Inf 버킷 = _count
+    count = series(after, "http_request_duration_seconds_count", **date_route)
+    assert count - series(before, "http_request_duration_seconds_count", **date_route) == 3
+    assert series(after, "http_request_duration_seconds_sum", **date_route) > 0
+    buckets = sorted(
+        (float("inf") if dict(labels)["le"] == "+Inf" else float(dict(labels)["le"]), value)
+        for (name, labels), value in after.items()
+        if name == "http_request_duration_seconds_bucket" and {("route", "/api/predict/date"), ("method", "POST")} <= labels
+    )
+    assert buckets[-1] == (float("inf"), count)
+    assert all(a[1] <= b[1] for a, b in zip(buckets, buckets[1:]))
+
+    assert series(after, "handler_stage_duration_seconds_count",
+                  handler="/api/calendar/monthly", stage="aggregate") >= 1
+    assert series(after, "snapshot_version") >= 1
@@ -0,0 +1,40 @@
+"""/api/predict/batch 본문 크기/예약 수 제한 (413) 과 NDJSON 파싱"""
+import json
+
+from test_predict_booking_cache import BOOKING
+
+NDJSON = {"content-type": "application/x-ndjson"}
+
+
+def bookings(n: int) -> list:
+    return [{**BOOKING, "lead_time": i, "country": "NA" if i % 2 else "PRT"} for i in range(n)]
+
+
+def test_ndjson_matches_json_array(client):
+    rows = bookings(5)
+    as_array = client.post("/api/predict/batch", json=rows)
+    as_ndjson = client.post("/api/predict/batch", headers=NDJSON,
+                            content="\n".join(json.dumps(row) for row in rows) + "\n")
+    assert as_array.status_code == as_ndjson.status_code == 200
+    assert as_ndjson.json() == as_array.json()
+    assert as_ndjson.json()["count"] == 5
+
+
+def test_empty_ndjson_body(client):
+    response = client.post("/api/predict/batch", headers=NDJSON, content="")
+    assert response.status_code == 200
+    assert response.json()["count"] == 0
+
+
+def test_body_over_limit_is_rejected(client, app_main, monkeypatch):
+    monkeypatch.setattr(app_main, "BATCH_MAX_BODY_BYTES", 1024)
+    response = client.post("/api/predict/batch", json=bookings(20))
+    assert response.status_code == 413
+
+
+def test_rows_over_limit_are_rejected(client, app_main, monkeypatch):
+    monkeypatch.setattr(app_main, "BATCH_MAX_ROWS", 3)
+    assert client.post("/api/predict/batch", json=bookings(3)).status_code == 200
+    response = client.post("/api/predict/batch", headers=NDJSON,
+                           content="\n".join(json.dumps(row) for row in bookings(4)))
+    assert response.status_code == 413
@@ -0,0 +1,61 @@
+"""/api/predict/booking 단건 예측 캐시 - 마이크로 배칭 경로에서도 적중/저장"""
+import pytest
+
+from batching import MicroBatcher
+
+BOOKING = {
+    "lead_time": 120, "adults": 2, "children": 0, "babies": 0, "meal": "BB", "country": "PRT",
+    "market_segment": "Online TA", "distribution_channel": "TA/TO", "is_repeated_guest": 0,
+    "previous_cancellations": 0, "previous_bookings_not_canceled": 0, "booking_changes": 0,
+    "deposit_type": "No Deposit", "days_in_waiting_list": 0, "customer_type": "Transient",
+    "adr": 98.5, "required_car_parking_spaces": 0, "total_of_special_requests": 1,
+}
+
+
+@pytest.fixture(params=["direct", "microbatch"])
+def booking_path(request, app_main, monkeypatch):
+    batcher = None
+    if request.param == "microbatch":
+        batcher = MicroBatcher(
+            lambda predictor, bookings: app_main.run_inference(
+                predictor, bookings, "/api/predict/booking", "microbatch"),
+            window_ms=1.0,
+        )
+    monkeypatch.setattr(app_main, "micro_batcher", batcher)
+    predictor = app_main.snapshots.current.model_predictor
+    predictor.prediction_cache.clear()
+    return batcher, predictor
+
+
+def test_repeated_booking_hits_prediction_cache(client, booking_path):
+    batcher, predictor = booking_path
+    before = predictor.cache_stats()
+
+    first = client.post("/api/predict/booking", json=BOOKING)
+    second = client.post("/api/predict/booking", json=BOOKING)
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+
+    stats = client.get("/api/predict/cache/stats").json()
+    assert stats["hits"] - before["hits"] == 1
+    assert stats["misses"] - before["misses"] == 1
+    if batcher is not None:
+        # 두 번째 요청은 배치 예측까지 가지 않음
+        assert batcher.requests == 1
+
+
+def test_direct_path_runs_inference_on_executor(client, app_main, monkeypatch):
+    monkeypatch.setattr(app_main, "micro_batcher", None)
+    app_main.snapshots.current.model_predictor.prediction_cache.clear()
+    calls = []
+    run_model = app_main.executor.run_model
+
+    async def spy(predictor, method, *args):
+        calls.append(method)
+        return await run_model(predictor, method, *args)
+
+    monkeypatch.setattr(app_main.executor, "run_model", spy)
+    response = client.post("/api/predict/booking", json=BOOKING)
+    assert response.status_code == 200
+    # 이벤트 루프에서 바로 추론하지 않고 실행기 (스레드/모델 프로세스 풀) 로 보냄
+    assert calls == ["predict_row"]
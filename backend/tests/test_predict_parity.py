@@ -0,0 +1,66 @@
+"""predict_single (온라인 경로) 와 predict_batch (전처리 파이프라인) 결과 일치"""
+import math
+
+import numpy as np
+import pandas as pd
+
+# float32 특징 벡터 + 트리 누적 합 계산 순서 차이까지 허용하는 확률 오차
+TOLERANCE = 1e-9
+
+BOOKING_FIELDS = [
+    'hotel', 'lead_time', 'stays_in_weekend_nights', 'stays_in_week_nights', 'adults', 'children', 'babies',
+    'meal', 'country', 'market_segment', 'distribution_channel', 'is_repeated_guest', 'previous_cancellations',
+    'previous_bookings_not_canceled', 'reserved_room_type', 'assigned_room_type', 'booking_changes',
+    'deposit_type', 'days_in_waiting_list', 'customer_type', 'adr', 'required_car_parking_spaces',
+    'total_of_special_requests',
+]
+
+
+def sampled_bookings(df: pd.DataFrame, n: int = 300, seed: int = 0) -> list:
+    rows = df.sample(n, random_state=seed)[BOOKING_FIELDS]
+    return rows.to_dict(orient='records')
+
+
+def edge_case_bookings(base: dict) -> list:
+    """학습에 없던 범주, 구간 밖 lead_time, children 결측"""
+    cases = []
+    for field, value in [('country', 'ZZZ'), ('meal', 'Undefined'), ('hotel', 'Airport Hotel'),
+                         ('market_segment', 'Aviation'), ('customer_type', None)]:
+        cases.append({**base, field: value})
+    for lead_time in [-5, 0, 7, 8, 365, 366, 1000, 1001, 5000]:
+        cases.append({**base, 'lead_time': lead_time})
+    for children in [None, float('nan')]:
+        cases.append({**base, 'children': children})
+    cases.append({**base, 'adr': 9999.0, 'children': float('nan'), 'country': 'ZZZ', 'lead_time': 2000})
+    return cases
+
+
+def assert_parity(predictor, bookings: list):
+    batch = predictor.predict_batch(pd.DataFrame(bookings))
+    single = np.array([predictor.predict_single(booking) for booking in bookings])
+    np.testing.assert_allclose(single, batch, rtol=0, atol=TOLERANCE)
+
+
+def test_sampled_rows_match_batch(trained_predictor, synthetic_bookings):
+    assert_parity(trained_predictor, sampled_bookings(synthetic_bookings))
+
+
+def test_edge_cases_match_batch(trained_predictor, synthetic_bookings):
+    base = sampled_bookings(synthetic_bookings, n=1, seed=1)[0]
+    assert_parity(trained_predictor, edge_case_bookings(base))
+
+
+def test_missing_fields_match_batch(trained_predictor, synthetic_bookings):
+    """BookingFeatures 처럼 일부 필드만 있는 요청 (없는 수치는 0, 범주는 'Unknown')"""
+    partial = [{k: v for k, v in booking.items() if k not in ('hotel', 'reserved_room_type', 'assigned_room_type',
+                                                             'stays_in_weekend_nights', 'stays_in_week_nights')}
+               for booking in sampled_bookings(synthetic_bookings, n=50, seed=2)]
+    assert_parity(trained_predictor, partial)
+
+
+def test_cached_result_matches_uncached(trained_predictor, synthetic_bookings):
+    booking = sampled_bookings(synthetic_bookings, n=1, seed=3)[0]
+    first = trained_predictor.predict_single(booking)
+    second = trained_predictor.predict_single(dict(reversed(list(booking.items()))))
+    assert first == second
+    assert math.isclose(first, trained_predictor.predict_batch(pd.DataFrame([booking]))[0], abs_tol=TOLERANCE)